@@ -0,0 +1,78 @@
+"""Memory use of a fleet of simulated Pax fans.
+
+Runs update cycles of many PaxUpdateCoordinators against simulated fans and
+reports resident memory and the allocations made and kept per cycle:
+
+    python -m benchmarks.fleet_memory --fans 200 --cycles 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import resource
+import tempfile
+import tracemalloc
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+
+from custom_components.pax_levante.pax_fake import FakePaxFan
+from custom_components.pax_levante.pax_update_coordinator import PaxUpdateCoordinator
+
+
+def _rss_kib() -> int:
+    with open("/proc/self/statm") as statm:
+        pages = int(statm.read().split()[1])
+    return pages * resource.getpagesize() // 1024
+
+
+async def async_run(fans: int, cycles: int) -> list[tuple[int, int, int]]:
+    """Return (rss KiB, allocated bytes, retained bytes) per update cycle."""
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        await dr.async_load(hass)
+
+        coordinators = []
+        for index in range(fans):
+            address = f"AA:BB:CC:DD:{index // 256:02X}:{index % 256:02X}"
+            coordinator = PaxUpdateCoordinator(hass, address, 0)
+            coordinator.backend = FakePaxFan(address)
+            coordinators.append(coordinator)
+
+        # The first cycle fetches device info and fills the caches
+        await asyncio.gather(*(c.async_refresh() for c in coordinators))
+
+        results = []
+        tracemalloc.start()
+        for _ in range(cycles):
+            gc.collect()
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            await asyncio.gather(*(c.async_refresh() for c in coordinators))
+            gc.collect()
+            after, peak = tracemalloc.get_traced_memory()
+            results.append((_rss_kib(), peak - before, after - before))
+        tracemalloc.stop()
+
+        for coordinator in coordinators:
+            await coordinator.async_shutdown()
+        await hass.async_stop(force=True)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fans", type=int, default=200)
+    parser.add_argument("--cycles", type=int, default=20)
+    args = parser.parse_args()
+
+    results = asyncio.run(async_run(args.fans, args.cycles))
+    print(f"{'cycle':>5} {'rss KiB':>10} {'peak B/fan':>11} {'kept B/fan':>11}")
+    for cycle, (rss, peak, kept) in enumerate(results, 1):
+        print(f"{cycle:>5} {rss:>10} {peak // args.fans:>11} {kept // args.fans:>11}")
+
+
+if __name__ == "__main__":
+    main()
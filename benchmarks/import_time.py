@@ -0,0 +1,73 @@
+"""Cold import time of the integration modules.
+
+Imports the package and each platform in a fresh interpreter, with the Home
+Assistant modules it has already loaded by then preloaded, and reports the
+fastest of several runs against the budgets in import_budget.json:
+
+    python -m benchmarks.import_time --runs 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+BUDGET_FILE = os.path.join(os.path.dirname(__file__), "import_budget.json")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules Home Assistant has already imported by the time it loads the
+# integration, so they are not charged to it.
+PRELOADED = [
+    "homeassistant.core",
+    "homeassistant.config_entries",
+    "homeassistant.components.binary_sensor",
+    "homeassistant.components.bluetooth",
+    "homeassistant.components.number",
+    "homeassistant.components.sensor",
+    "homeassistant.components.switch",
+    "homeassistant.helpers.entity_platform",
+    "homeassistant.helpers.update_coordinator",
+]
+
+SCRIPT = """
+import sys, time
+for module in {preloaded!r}:
+    __import__(module)
+start = time.perf_counter()
+__import__({module!r})
+print(time.perf_counter() - start)
+"""
+
+
+def cold_import_seconds(module: str) -> float:
+    result = subprocess.run(
+        [sys.executable, "-c", SCRIPT.format(preloaded=PRELOADED, module=module)],
+        capture_output=True,
+        check=True,
+        cwd=ROOT,
+        text=True,
+    )
+    return float(result.stdout.splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    with open(BUDGET_FILE) as budget_file:
+        budget = json.load(budget_file)
+    over = False
+    print(f"{'module':<45} {'ms':>7} {'budget':>7}")
+    for module in sorted(budget):
+        seconds = min(cold_import_seconds(module) for _ in range(args.runs))
+        over |= seconds > budget[module]
+        print(f"{module:<45} {seconds * 1000:>7.1f} {budget[module] * 1000:>7.1f}")
+    sys.exit(1 if over else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,43 +1,148 @@
-"""The Pax Levante fan integration."""
+"""The Pax Levante fan integration.
+
+The cli and pax_client live in this package, so importing them runs this
+module first. Everything that needs Home Assistant is therefore imported
+inside the setup functions, which keeps the command line usable without
+Home Assistant installed.
+"""
 
 from __future__ import annotations
 
 import logging
+from typing import TYPE_CHECKING
+
+import voluptuous as vol
 
-import async_timeout
-from homeassistant.components import bluetooth
-from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_ADDRESS
-from homeassistant.core import HomeAssistant, callback
-from homeassistant.exceptions import ConfigEntryNotReady
+from .const import (
+    CONF_AIRTIME_BUDGET,
+    CONF_PIN,
+    DATA_ANALYTICS,
+    DOMAIN,
+    SIGNAL_ANALYTICS_UPDATED,
+)
 
-from .const import DOMAIN
-from .pax_client import PaxClient
-from .pax_update_coordinator import PaxUpdateCoordinator
+if TYPE_CHECKING:
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.typing import ConfigType
+
+    from .pax_update_coordinator import PaxUpdateCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
-PLATFORMS: list[str] = ["sensor", "number", "switch"]
+PLATFORMS: list[str] = ["sensor", "number", "switch", "binary_sensor"]
+
+CONFIG_SCHEMA = vol.Schema(
+    {
+        vol.Optional(DOMAIN): vol.Schema(
+            {
+                vol.Optional(CONF_AIRTIME_BUDGET): vol.All(
+                    vol.Coerce(float), vol.Range(min=1)
+                )
+            }
+        )
+    },
+    extra=vol.ALLOW_EXTRA,
+)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    # Deferred, see the module docstring
+    from homeassistant.const import Platform
+    from homeassistant.core import callback
+    from homeassistant.helpers.discovery import async_load_platform
+    from homeassistant.helpers.dispatcher import async_dispatcher_send
+    from homeassistant.helpers.event import async_track_time_interval
+
+    from .pax_analytics import ANALYSIS_INTERVAL, FleetAnalytics
+    from .pax_metrics import PaxMetricsView
+    from .services import async_setup_services
+
+    async_setup_services(hass)
+    hass.http.register_view(PaxMetricsView)
+
+    analytics = hass.data[DATA_ANALYTICS] = FleetAnalytics()
+
+    @callback
+    def _async_analyze(_now) -> None:
+        analytics.analyze()
+        async_dispatcher_send(hass, SIGNAL_ANALYTICS_UPDATED)
+
+    async_track_time_interval(
+        hass, _async_analyze, ANALYSIS_INTERVAL, name=f"{DOMAIN} fleet analytics"
+    )
+    # The fleet summary sensor belongs to no fan
+    hass.async_create_task(
+        async_load_platform(hass, Platform.SENSOR, DOMAIN, {}, config)
+    )
+
+    seconds_per_hour = config.get(DOMAIN, {}).get(CONF_AIRTIME_BUDGET)
+    if seconds_per_hour is not None:
+        from .pax_airtime import REBALANCE_INTERVAL, AirtimeBudget
+
+        budget = AirtimeBudget(seconds_per_hour)
+
+        @callback
+        def _async_rebalance(_now) -> None:
+            budget.rebalance(hass.data.get(DOMAIN, {}).values())
+
+        async_track_time_interval(
+            hass,
+            _async_rebalance,
+            REBALANCE_INTERVAL,
+            name=f"{DOMAIN} airtime budget",
+        )
+    return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    # Deferred, see the module docstring
+    from homeassistant.components import bluetooth
+    from homeassistant.const import CONF_ADDRESS
+
+    from .pax_update_coordinator import PaxUpdateCoordinator
+
     hass.data.setdefault(DOMAIN, {})
 
     address = entry.data[CONF_ADDRESS]
 
     _LOGGER.debug("In setup Entry: %s, Address: %s", entry, address)
 
-    ble_device = bluetooth.async_ble_device_from_address(hass, address)
-    if not ble_device:
-        raise ConfigEntryNotReady(f"Could not find Pax device with address {address}")
-
-    _LOGGER.info("Found device: %s", ble_device)
-
-    coordinator = PaxUpdateCoordinator(hass, address, entry.data["pin"])
-    await coordinator.async_config_entry_first_refresh()
-
+    coordinator = PaxUpdateCoordinator(
+        hass, address, entry.data[CONF_PIN], entry.options
+    )
     hass.data[DOMAIN][entry.entry_id] = coordinator
+    entry.async_on_unload(hass.data[DATA_ANALYTICS].async_track(coordinator))
+
+    # Setup does not wait for the fan. If it has not been seen yet the first
+    # refresh starts when it advertises, instead of on the retry schedule.
+    ble_device = bluetooth.async_ble_device_from_address(
+        hass, address, connectable=True
+    )
+    if ble_device:
+        _LOGGER.info("Found device: %s", ble_device)
+        await coordinator.async_refresh()
+    else:
+        _LOGGER.info("Waiting for %s to advertise", address)
+        coordinator.async_refresh_when_seen()
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
+
     return True
+
+
+async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    if unload_ok:
+        coordinator: PaxUpdateCoordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        await coordinator.async_shutdown()
+
+    return unload_ok
+
+
+async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply changed options without reloading the entry."""
+    coordinator: PaxUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    coordinator.async_apply_options(entry.options)
@@ -0,0 +1,92 @@
+"""The Pax Levante fan integration."""
+
+from __future__ import annotations
+
+import logging
+
+from homeassistant.components.binary_sensor import (
+    BinarySensorDeviceClass,
+    BinarySensorEntity,
+    BinarySensorEntityDescription,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import DOMAIN
+from .entity import PaxEntity, PaxHealthEntity
+
+_LOGGER = logging.getLogger(__name__)
+
+ENTITIES = [
+    BinarySensorEntityDescription(
+        key="expected_humidity_trigger",
+        translation_key="expected_humidity_trigger",
+        icon="mdi:water-alert",
+        has_entity_name=True,
+        entity_registry_enabled_default=False,
+    ),
+]
+
+HEALTH_PROBLEM = BinarySensorEntityDescription(
+    key="health_problem",
+    translation_key="health_problem",
+    device_class=BinarySensorDeviceClass.PROBLEM,
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
+) -> bool:
+    address = entry.unique_id
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+
+    _LOGGER.debug(
+        "In setup binary sensor: %s, Address: %s, Coordinator: %s",
+        entry,
+        address,
+        coordinator,
+    )
+
+    async_add_entities(
+        [
+            *(
+                PaxExpectedHumidityTriggerEntity(coordinator, entity)
+                for entity in ENTITIES
+            ),
+            PaxHealthProblemEntity(coordinator, HEALTH_PROBLEM),
+        ]
+    )
+    return True
+
+
+class PaxExpectedHumidityTriggerEntity(PaxEntity, BinarySensorEntity):
+    @property
+    def available(self) -> bool:
+        return (
+            super().available and self.coordinator.humidity_trigger_expected is not None
+        )
+
+    @property
+    def is_on(self) -> bool | None:
+        return self.coordinator.humidity_trigger_expected
+
+    @property
+    def extra_state_attributes(self):
+        return {
+            **(self._stale_attributes() or {}),
+            "humidity_rise_rate": self.coordinator.humidity_rise_rate,
+            "threshold": self.coordinator.rise_rate_threshold,
+        }
+
+
+class PaxHealthProblemEntity(PaxHealthEntity, BinarySensorEntity):
+    """Fan speed short of its target or humidity not recovering, see pax_analytics."""
+
+    @property
+    def is_on(self) -> bool | None:
+        return bool(self._health.problems)
+
+    @property
+    def extra_state_attributes(self):
+        return {"problems": list(self._health.problems)}
@@ -0,0 +1,247 @@
+"""Command line access to Pax fans without Home Assistant.
+
+    python -m custom_components.pax_levante scan
+    python -m custom_components.pax_levante read --parallel 8
+    python -m custom_components.pax_levante benchmark --pin 1234 --rounds 5
+    python -m custom_components.pax_levante apply --pin 1234 snapshot.json
+
+Commands taking fans work on every fan found by a scan unless addresses are
+given with ``--address``. With ``--fake N`` they run against N simulated
+fans instead of bleak.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Awaitable, Callable
+import json
+import logging
+import statistics
+import sys
+import time
+from typing import Any
+
+from .pax_client import PaxClient
+from .pax_fake import FakePaxFan
+
+# Advertised local name of the fans, see manifest.json
+PAX_LOCAL_NAME = "Pax Levante"
+
+
+class BleakBackend:
+    """Finds and connects to fans with bleak."""
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+
+    async def async_scan(self) -> list[tuple[str, str | None, int | None]]:
+        from bleak import BleakScanner
+
+        found = await BleakScanner.discover(timeout=self.timeout, return_adv=True)
+        return [
+            (device.address, adv.local_name, adv.rssi)
+            for device, adv in found.values()
+            if (adv.local_name or "").startswith(PAX_LOCAL_NAME)
+        ]
+
+    async def async_client(self, address: str) -> PaxClient:
+        from bleak import BleakScanner
+
+        device = await BleakScanner.find_device_by_address(
+            address, timeout=self.timeout
+        )
+        if device is None:
+            raise LookupError(f"Could not find {address}")
+        return PaxClient(device)
+
+
+class FakeBackend:
+    """Simulated fans, see pax_fake.FakePaxFan."""
+
+    def __init__(self, fans: int, pin: int, latency: float):
+        self.fans = {}
+        for index in range(fans):
+            address = f"FA:CE:00:00:{index // 256:02X}:{index % 256:02X}"
+            self.fans[address] = FakePaxFan(address, pin, latency)
+
+    async def async_scan(self) -> list[tuple[str, str | None, int | None]]:
+        return [(address, fan.name, None) for address, fan in self.fans.items()]
+
+    async def async_client(self, address: str) -> PaxClient:
+        if address not in self.fans:
+            raise LookupError(f"Could not find {address}")
+        return PaxClient(None, backend=self.fans[address])
+
+
+async def async_for_each(
+    addresses: list[str],
+    parallel: int,
+    func: Callable[[str], Awaitable[Any]],
+) -> dict[str, Any]:
+    """Run func for every address, at most ``parallel`` at a time.
+
+    Returns the result or the exception raised for every address.
+    """
+    semaphore = asyncio.Semaphore(parallel)
+
+    async def run(address: str):
+        async with semaphore:
+            return await func(address)
+
+    results = await asyncio.gather(
+        *(run(address) for address in addresses), return_exceptions=True
+    )
+    return dict(zip(addresses, results))
+
+
+async def _async_authenticate(client: PaxClient, pin: int) -> None:
+    if not await client.async_set_pin(pin):
+        raise PermissionError("Wrong pin")
+
+
+async def async_read(backend, address: str) -> dict[str, Any]:
+    async with await backend.async_client(address) as client:
+        sensors = await client.async_get_sensors()
+        targets = await client.async_get_fan_speed_targets()
+    return {
+        "humidity": sensors.humidity,
+        "temperature": sensors.temperature,
+        "light": sensors.light,
+        "fan_speed": sensors.fan_speed,
+        "current_trigger": sensors.current_trigger.name.lower(),
+        "fan_speed_targets": [targets.humidity, targets.light, targets.base],
+    }
+
+
+async def async_benchmark(
+    backend, address: str, rounds: int, pin: int | None
+) -> dict[str, list[float]]:
+    """Return seconds per connect, sensor read and, with a pin, write."""
+    timings: dict[str, list[float]] = {"connect": [], "read": [], "write": []}
+    for _ in range(rounds):
+        client = await backend.async_client(address)
+        start = time.perf_counter()
+        await client.async_connect()
+        timings["connect"].append(time.perf_counter() - start)
+        try:
+            start = time.perf_counter()
+            await client.async_get_sensors()
+            timings["read"].append(time.perf_counter() - start)
+
+            if pin is not None:
+                await _async_authenticate(client, pin)
+                targets = await client.async_get_fan_speed_targets()
+                start = time.perf_counter()
+                await client.async_set_fan_speed_targets(targets)
+                timings["write"].append(time.perf_counter() - start)
+        finally:
+            await client.async_disconnect()
+    return timings
+
+
+async def async_apply(backend, address: str, pin: int, config) -> list[str]:
+    async with await backend.async_client(address) as client:
+        return await client.async_apply_config(config, pin=pin, verify=True)
+
+
+def _format_timings(timings: dict[str, list[float]]) -> str:
+    parts = []
+    for operation, seconds in timings.items():
+        if not seconds:
+            continue
+        ms = [value * 1000 for value in seconds]
+        parts.append(
+            f"{operation} {min(ms):.1f}/{statistics.fmean(ms):.1f}/{max(ms):.1f} ms"
+        )
+    return ", ".join(parts)
+
+
+async def async_main(args: argparse.Namespace) -> int:
+    if args.fake:
+        backend = FakeBackend(
+            args.fake, getattr(args, "pin", None) or 0, args.fake_latency
+        )
+    else:
+        backend = BleakBackend(args.timeout)
+
+    if args.command == "scan":
+        for address, name, rssi in await backend.async_scan():
+            print(f"{address}  {name}  {'' if rssi is None else rssi}")
+        return 0
+
+    addresses = args.address or [
+        address for address, _, _ in await backend.async_scan()
+    ]
+    if not addresses:
+        print("No fans found", file=sys.stderr)
+        return 1
+
+    if args.command == "read":
+        results = await async_for_each(
+            addresses, args.parallel, lambda a: async_read(backend, a)
+        )
+        formatter = json.dumps
+    elif args.command == "benchmark":
+        results = await async_for_each(
+            addresses,
+            args.parallel,
+            lambda a: async_benchmark(backend, a, args.rounds, args.pin),
+        )
+        formatter = _format_timings
+    else:
+        from .pax_snapshot import snapshot_to_config
+
+        if args.pin is None:
+            print("apply needs --pin", file=sys.stderr)
+            return 2
+        with open(args.snapshot, encoding="utf-8") as snapshot:
+            config = snapshot_to_config(json.load(snapshot))
+        results = await async_for_each(
+            addresses,
+            args.parallel,
+            lambda a: async_apply(backend, a, args.pin, config),
+        )
+        formatter = lambda written: ", ".join(written) or "unchanged"  # noqa: E731
+
+    failed = 0
+    for address, result in results.items():
+        if isinstance(result, BaseException):
+            failed += 1
+            print(f"{address}  error: {result!r}")
+        else:
+            print(f"{address}  {formatter(result)}")
+    return 1 if failed else 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m custom_components.pax_levante",
+        description="Scan, read, benchmark and configure Pax fans",
+    )
+    parser.add_argument("--timeout", type=float, default=10.0, help="scan seconds")
+    parser.add_argument(
+        "--fake", type=int, metavar="N", help="use N simulated fans instead of bleak"
+    )
+    parser.add_argument(
+        "--fake-latency", type=float, default=0.0, help="seconds per simulated op"
+    )
+    parser.add_argument("--verbose", "-v", action="store_true")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("scan", help="list fans in range")
+    fan_commands = [
+        commands.add_parser("read", help="read sensors and fan speed targets"),
+        commands.add_parser("benchmark", help="time connect, read and write"),
+        commands.add_parser("apply", help="write a configuration snapshot"),
+    ]
+    for command in fan_commands:
+        command.add_argument("--address", action="append", help="fan to use")
+        command.add_argument("--parallel", type=int, default=4)
+        command.add_argument("--pin", type=int)
+    fan_commands[1].add_argument("--rounds", type=int, default=3)
+    fan_commands[2].add_argument("snapshot", help="JSON file from the snapshot service")
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING)
+    return asyncio.run(async_main(args))
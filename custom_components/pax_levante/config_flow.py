@@ -1,14 +1,47 @@
+from __future__ import annotations
+
 import logging
+from typing import TYPE_CHECKING
 
 from homeassistant import config_entries
-from homeassistant.components.bluetooth import BluetoothServiceInfo
-from homeassistant.config_entries import ConfigFlow
+from homeassistant.config_entries import ConfigEntry, OptionsFlow
 from homeassistant.const import CONF_ADDRESS
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
+from homeassistant.helpers import selector
 import voluptuous as vol
 
-from .const import DOMAIN
-from .pax_client import CurrentTrigger, PaxClient
+from .const import (
+    CONF_CAPTURE,
+    CONF_CONNECT_ATTEMPTS,
+    CONF_CONNECTION_MODE,
+    CONF_POLL_INTERVAL,
+    CONF_RECOVERY_POLLS,
+    CONF_RISE_RATE_THRESHOLD,
+    CONF_RISE_RATE_WINDOW,
+    CONF_SAMPLE_INTERVAL,
+    CONF_SAMPLE_STATISTICS,
+    CONF_STALE_POLLS,
+    CONF_STALE_SECONDS,
+    CONF_UPDATE_TIMEOUT,
+    CONF_WRITE_TIMEOUT,
+    CONNECTION_MODES,
+    DEFAULT_CONNECT_ATTEMPTS,
+    DEFAULT_CONNECTION_MODE,
+    DEFAULT_POLL_INTERVAL,
+    DEFAULT_RECOVERY_POLLS,
+    DEFAULT_RISE_RATE_THRESHOLD,
+    DEFAULT_RISE_RATE_WINDOW,
+    DEFAULT_SAMPLE_INTERVAL,
+    DEFAULT_STALE_POLLS,
+    DEFAULT_STALE_SECONDS,
+    DEFAULT_UPDATE_TIMEOUT,
+    DEFAULT_WRITE_TIMEOUT,
+    DOMAIN,
+)
+
+if TYPE_CHECKING:
+    from homeassistant.components.bluetooth import BluetoothServiceInfo
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -20,6 +53,11 @@ class PaxConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     MINOR_VERSION = 1
     discovery_info = None
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlow:
+        return PaxOptionsFlow(config_entry)
+
     async def async_step_bluetooth(self, discovery_info: BluetoothServiceInfo):
         """Handle the bluetooth discovery step."""
         _LOGGER.debug(
@@ -49,6 +87,8 @@ class PaxConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 data={CONF_ADDRESS: user_input["mac"], "pin": user_input["pin"]},
             )
 
+        from .pax_client import PaxClient
+
         async with PaxClient(self.discovery_info.device) as client:
             pin = await client.async_get_pin()
 
@@ -62,3 +102,82 @@ class PaxConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             return self.async_show_form(
                 step_id="add_device", data_schema=data_schema, errors=errors
             )
+
+
+class PaxOptionsFlow(OptionsFlow):
+    def __init__(self, config_entry: ConfigEntry):
+        self.config_entry = config_entry
+
+    async def async_step_init(self, user_input=None) -> FlowResult:
+        """Manage the polling and connection options."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self.config_entry.options
+        data_schema = vol.Schema(
+            {
+                vol.Required(
+                    CONF_POLL_INTERVAL,
+                    default=options.get(CONF_POLL_INTERVAL, DEFAULT_POLL_INTERVAL),
+                ): vol.All(vol.Coerce(int), vol.Range(min=5, max=3600)),
+                vol.Required(
+                    CONF_SAMPLE_INTERVAL,
+                    default=options.get(CONF_SAMPLE_INTERVAL, DEFAULT_SAMPLE_INTERVAL),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3600)),
+                vol.Required(
+                    CONF_SAMPLE_STATISTICS,
+                    default=options.get(CONF_SAMPLE_STATISTICS, False),
+                ): bool,
+                vol.Required(
+                    CONF_RISE_RATE_WINDOW,
+                    default=options.get(
+                        CONF_RISE_RATE_WINDOW, DEFAULT_RISE_RATE_WINDOW
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=30, max=3600)),
+                vol.Required(
+                    CONF_RISE_RATE_THRESHOLD,
+                    default=options.get(
+                        CONF_RISE_RATE_THRESHOLD, DEFAULT_RISE_RATE_THRESHOLD
+                    ),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0.1, max=50)),
+                vol.Required(
+                    CONF_STALE_POLLS,
+                    default=options.get(CONF_STALE_POLLS, DEFAULT_STALE_POLLS),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=100)),
+                vol.Required(
+                    CONF_STALE_SECONDS,
+                    default=options.get(CONF_STALE_SECONDS, DEFAULT_STALE_SECONDS),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=86400)),
+                vol.Required(
+                    CONF_RECOVERY_POLLS,
+                    default=options.get(CONF_RECOVERY_POLLS, DEFAULT_RECOVERY_POLLS),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=100)),
+                vol.Required(
+                    CONF_UPDATE_TIMEOUT,
+                    default=options.get(CONF_UPDATE_TIMEOUT, DEFAULT_UPDATE_TIMEOUT),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=120)),
+                vol.Required(
+                    CONF_WRITE_TIMEOUT,
+                    default=options.get(CONF_WRITE_TIMEOUT, DEFAULT_WRITE_TIMEOUT),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=120)),
+                vol.Required(
+                    CONF_CONNECTION_MODE,
+                    default=options.get(CONF_CONNECTION_MODE, DEFAULT_CONNECTION_MODE),
+                ): selector.SelectSelector(
+                    selector.SelectSelectorConfig(
+                        options=CONNECTION_MODES,
+                        translation_key=CONF_CONNECTION_MODE,
+                    )
+                ),
+                vol.Required(
+                    CONF_CONNECT_ATTEMPTS,
+                    default=options.get(
+                        CONF_CONNECT_ATTEMPTS, DEFAULT_CONNECT_ATTEMPTS
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=10)),
+                vol.Required(
+                    CONF_CAPTURE, default=options.get(CONF_CAPTURE, False)
+                ): bool,
+            }
+        )
+        return self.async_show_form(step_id="init", data_schema=data_schema)
@@ -1 +1,53 @@
 DOMAIN = "pax_levante"
+
+EVENT_TRIGGER_CHANGED = f"{DOMAIN}_trigger_changed"
+
+# pax_analytics.FleetAnalytics in hass.data, and the signal sent after each
+# analysis
+DATA_ANALYTICS = f"{DOMAIN}_analytics"
+SIGNAL_ANALYTICS_UPDATED = f"{DOMAIN}_analytics_updated"
+
+CONF_PIN = "pin"
+CONF_POLL_INTERVAL = "poll_interval"
+CONF_UPDATE_TIMEOUT = "update_timeout"
+CONF_WRITE_TIMEOUT = "write_timeout"
+CONF_CONNECTION_MODE = "connection_mode"
+CONF_CONNECT_ATTEMPTS = "connect_attempts"
+CONF_CAPTURE = "capture"
+CONF_SAMPLE_INTERVAL = "sample_interval"
+CONF_SAMPLE_STATISTICS = "sample_statistics"
+CONF_RISE_RATE_WINDOW = "rise_rate_window"
+CONF_RISE_RATE_THRESHOLD = "rise_rate_threshold"
+CONF_STALE_POLLS = "stale_polls"
+CONF_STALE_SECONDS = "stale_seconds"
+CONF_RECOVERY_POLLS = "recovery_polls"
+# Domain level YAML, connection seconds per hour shared by all fans
+CONF_AIRTIME_BUDGET = "airtime_budget"
+
+CONNECTION_MODE_PER_OPERATION = "per_operation"
+CONNECTION_MODE_PERSISTENT = "persistent"
+CONNECTION_MODES = [CONNECTION_MODE_PER_OPERATION, CONNECTION_MODE_PERSISTENT]
+
+# Range of the fan speed targets in rpm
+MIN_FAN_SPEED = 950
+MAX_FAN_SPEED = 2400
+
+DEFAULT_POLL_INTERVAL = 65
+DEFAULT_UPDATE_TIMEOUT = 10
+DEFAULT_WRITE_TIMEOUT = 10
+DEFAULT_CONNECTION_MODE = CONNECTION_MODE_PER_OPERATION
+DEFAULT_CONNECT_ATTEMPTS = 4
+# 0 disables sampling between polls
+DEFAULT_SAMPLE_INTERVAL = 0
+DEFAULT_RISE_RATE_WINDOW = 300
+# Humidity rise in %/min above which a humidity trigger is expected
+DEFAULT_RISE_RATE_THRESHOLD = 1.0
+# Failed polls and seconds the last good data is served for, 0 disables
+DEFAULT_STALE_POLLS = 0
+DEFAULT_STALE_SECONDS = 0
+# Successful polls needed before an unavailable fan is available again
+DEFAULT_RECOVERY_POLLS = 1
+# Deadline of a sensors-only refresh, and seconds a reading is fresh enough
+# to answer another refresh without reading again
+REFRESH_SENSORS_TIMEOUT = 5
+REFRESH_SENSORS_WINDOW = 2
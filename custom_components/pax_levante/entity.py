@@ -0,0 +1,79 @@
+"""Base entity for the Pax Levante fan integration."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import callback
+from homeassistant.helpers.device_registry import format_mac
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.entity import EntityDescription
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DATA_ANALYTICS, SIGNAL_ANALYTICS_UPDATED
+
+if TYPE_CHECKING:
+    from .pax_analytics import FanHealth
+    from .pax_update_coordinator import PaxUpdateCoordinator
+
+
+class PaxEntity(CoordinatorEntity):
+    _attr_has_entity_name = True
+
+    def __init__(
+        self,
+        coordinator: PaxUpdateCoordinator,
+        entity_description: EntityDescription,
+    ):
+        super().__init__(coordinator)
+
+        self.entity_description = entity_description
+        self._attr_unique_id = (
+            f"{format_mac(coordinator.address)}_{entity_description.key}"
+        )
+        self._attr_device_info = coordinator.entity_device_info
+
+    @property
+    def available(self) -> bool:
+        # No data until the first successful poll of a fan not seen at setup
+        return super().available and self.coordinator.data is not None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        return self._stale_attributes()
+
+    def _stale_attributes(self) -> dict[str, Any] | None:
+        """Mark the state as the last good reading while polls fail."""
+        if self.coordinator.stale_since is None:
+            return None
+        return {"stale_since": self.coordinator.stale_since.isoformat()}
+
+
+class PaxHealthEntity(PaxEntity):
+    """Health of the fan from pax_analytics.
+
+    Updated after every fleet analysis instead of on every poll, and
+    available once the fan has been analyzed.
+    """
+
+    _attr_should_poll = False
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass, SIGNAL_ANALYTICS_UPDATED, self.async_write_ha_state
+            )
+        )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Polls do not change the health, only the fleet analysis does."""
+
+    @property
+    def _health(self) -> FanHealth | None:
+        return self.hass.data[DATA_ANALYTICS].health.get(self.coordinator.address)
+
+    @property
+    def available(self) -> bool:
+        return self._health is not None
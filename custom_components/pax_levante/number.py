@@ -2,42 +2,21 @@
 
 from __future__ import annotations
 
-from collections import namedtuple
-from dataclasses import asdict, dataclass
-from datetime import timedelta
+from dataclasses import dataclass
 import logging
+from typing import TYPE_CHECKING
 
-# import SensorEntityDescription
-import async_timeout
-from homeassistant.components import bluetooth
 from homeassistant.components.number import NumberEntity, NumberEntityDescription
-from homeassistant.components.sensor import (
-    SensorDeviceClass,
-    SensorEntity,
-    SensorEntityDescription,
-    SensorStateClass,
-)
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import REVOLUTIONS_PER_MINUTE
-from homeassistant.core import HomeAssistant, callback
-from homeassistant.exceptions import ConfigEntryNotReady
-from homeassistant.helpers.device_registry import (
-    CONNECTION_BLUETOOTH,
-    DeviceInfo,
-    format_mac,
-)
-from homeassistant.helpers.entity import EntityCategory
+from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.typing import StateType
-from homeassistant.helpers.update_coordinator import (
-    CoordinatorEntity,
-    DataUpdateCoordinator,
-    UpdateFailed,
-)
 
-from .const import DOMAIN
-from .pax_client import CurrentTrigger, PaxClient
-from .pax_update_coordinator import PaxUpdateCoordinator
+from .const import DOMAIN, MAX_FAN_SPEED, MIN_FAN_SPEED
+from .entity import PaxEntity
+
+if TYPE_CHECKING:
+    from .pax_update_coordinator import PaxUpdateCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -49,8 +28,8 @@ class PaxFanSpeedEntityDescription(NumberEntityDescription):
     has_entity_name: bool = True
     icon: str = "mdi:engine"
     mode: str = "auto"
-    native_min_value: int = 950
-    native_max_value: int = 2400
+    native_min_value: int = MIN_FAN_SPEED
+    native_max_value: int = MAX_FAN_SPEED
     native_step: int = 25
     native_unit_of_measurement: str = REVOLUTIONS_PER_MINUTE
 
@@ -88,32 +67,16 @@ async def async_setup_entry(
     return True
 
 
-class PaxFanSpeedEntity(CoordinatorEntity, NumberEntity):
+class PaxFanSpeedEntity(PaxEntity, NumberEntity):
     def __init__(
         self,
         coordinator: PaxUpdateCoordinator,
         entity_description: PaxFanSpeedEntityDescription,
     ):
-        super().__init__(coordinator)
+        super().__init__(coordinator, entity_description)
 
         _LOGGER.info(f"Creating PaxFanSpeedEntity: {entity_description}")
 
-        self.entity_description = entity_description
-        self._attr_unique_id = (
-            f"{format_mac(coordinator.address)}_{entity_description.key}"
-        )
-
-        device_info = coordinator.device_info
-
-        self._attr_device_info = DeviceInfo(
-            connections={(CONNECTION_BLUETOOTH, coordinator.address)},
-            manufacturer=device_info.manufacturer,
-            model=f"{device_info.name} {device_info.model_number}",
-            name=device_info.name,
-            sw_version=device_info.sw_version,
-            hw_version=device_info.hw_version,
-        )
-
     @property
     def native_value(self) -> float | None:
         """Return number value."""
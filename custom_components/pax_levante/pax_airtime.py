@@ -0,0 +1,168 @@
+"""Bluetooth airtime used by each fan and the budget shared by all of them.
+
+Bluetooth proxies have few connection slots, shared with the locks and
+sensors of other integrations. Every session with a fan is metered, and
+with an ``airtime_budget`` configured the poll intervals of the least
+active fans are stretched until the projected connection time of all fans
+fits within it. Writes are never held back.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Hashable, Iterable
+from dataclasses import dataclass
+from datetime import timedelta
+import logging
+import math
+import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .pax_update_coordinator import PaxUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+WINDOW_SECONDS = 3600
+# Poll intervals are stretched at most this many times
+MAX_STRETCH = 10.0
+REBALANCE_INTERVAL = timedelta(minutes=5)
+# Stretches are rounded up to steps of this size, and only lowered when they
+# drop by more than a step, so that small changes in use do not move polls
+STRETCH_STEP = 0.25
+
+
+@dataclass(frozen=True, slots=True)
+class AirtimeUsage:
+    sessions: int
+    seconds: float
+    operations: int
+    trigger_changes: int
+
+
+class AirtimeMeter:
+    """Connection time and GATT operations of one fan over the last hour."""
+
+    def __init__(self):
+        # (monotonic end, connected seconds, GATT operations) per session
+        self._sessions: deque[tuple[float, float, int]] = deque()
+        self._trigger_changes: deque[float] = deque()
+
+    def add_session(
+        self, seconds: float, operations: int, now: float | None = None
+    ) -> None:
+        now = time.monotonic() if now is None else now
+        self._sessions.append((now, seconds, operations))
+        self._prune(now)
+
+    def add_trigger_change(self, now: float | None = None) -> None:
+        now = time.monotonic() if now is None else now
+        self._trigger_changes.append(now)
+        self._prune(now)
+
+    def usage(self, now: float | None = None) -> AirtimeUsage:
+        self._prune(time.monotonic() if now is None else now)
+        return AirtimeUsage(
+            len(self._sessions),
+            sum(seconds for _, seconds, _ in self._sessions),
+            sum(operations for _, _, operations in self._sessions),
+            len(self._trigger_changes),
+        )
+
+    def _prune(self, now: float) -> None:
+        start = now - WINDOW_SECONDS
+        while self._sessions and self._sessions[0][0] < start:
+            self._sessions.popleft()
+        while self._trigger_changes and self._trigger_changes[0] < start:
+            self._trigger_changes.popleft()
+
+
+@dataclass(frozen=True, slots=True)
+class FanDemand:
+    key: Hashable
+    # Sorts the least active fans first
+    activity: tuple
+    # Projected connection seconds per hour at the configured poll and sample
+    # intervals
+    seconds_per_hour: float
+    # Part of it spent sampling, which stops once polls are stretched
+    sample_seconds_per_hour: float = 0.0
+
+
+def stretch_factors(demands: Iterable[FanDemand], budget: float) -> dict:
+    """Stretch of every fan's poll interval that keeps airtime within budget.
+
+    The least active fans are stretched first, each only as far as needed
+    and at most MAX_STRETCH times.
+    """
+    demands = sorted(demands, key=lambda demand: demand.activity)
+    factors = {demand.key: 1.0 for demand in demands}
+    excess = sum(demand.seconds_per_hour for demand in demands) - budget
+    for demand in demands:
+        if excess <= 0:
+            break
+        projected = demand.seconds_per_hour
+        if projected <= 0:
+            continue
+        samples = demand.sample_seconds_per_hour
+        polls = projected - samples
+        # Polling ``factor`` times less often saves the samples and
+        # polls - polls / factor
+        if projected - polls / MAX_STRETCH <= excess:
+            factor = MAX_STRETCH
+        elif samples >= excess:
+            factor = 1 + STRETCH_STEP
+        else:
+            factor = polls / (projected - excess)
+        factors[demand.key] = factor
+        excess -= projected - polls / factor
+    if excess > 0:
+        _LOGGER.debug("Airtime budget exceeded by %.0f s/h at maximum stretch", excess)
+    return factors
+
+
+class AirtimeBudget:
+    """Connection seconds per hour shared by all fans."""
+
+    def __init__(self, seconds_per_hour: float):
+        self.seconds_per_hour = seconds_per_hour
+
+    def rebalance(self, coordinators: Iterable[PaxUpdateCoordinator]) -> None:
+        """Stretch poll intervals to fit the airtime used in the last hour."""
+        coordinators = list(coordinators)
+        demands = []
+        for coordinator in coordinators:
+            usage = coordinator.airtime.usage()
+            if not usage.sessions:
+                continue
+            seconds_per_session = usage.seconds / usage.sessions
+            # Writes and refreshes are metered but not projected
+            polls = (
+                seconds_per_session * 3600 / coordinator.poll_interval.total_seconds()
+            )
+            samples = 0.0
+            if coordinator.sample_interval is not None:
+                samples = (
+                    seconds_per_session
+                    * 3600
+                    / coordinator.sample_interval.total_seconds()
+                )
+            demands.append(
+                FanDemand(
+                    coordinator,
+                    (coordinator.triggered, usage.trigger_changes),
+                    max(usage.seconds, polls + samples),
+                    samples,
+                )
+            )
+        factors = stretch_factors(demands, self.seconds_per_hour)
+        for coordinator in coordinators:
+            coordinator.async_set_airtime_stretch(
+                _quantize(coordinator.airtime_stretch, factors.get(coordinator, 1.0))
+            )
+
+
+def _quantize(current: float, stretch: float) -> float:
+    if current - STRETCH_STEP < stretch <= current:
+        return current
+    return min(MAX_STRETCH, math.ceil(stretch / STRETCH_STEP) * STRETCH_STEP)
@@ -0,0 +1,264 @@
+"""Health of every fan from its recent samples, computed for the fleet at once.
+
+A fan is flagged when its measured fan speed stays short of the target of
+the trigger it runs for, e.g. a clogged duct or a failing motor, or when a
+humidity trigger does not end, i.e. humidity does not recover.
+
+The samples of all fans are kept in one ring buffer array per column, a
+row per fan, and analyze() computes the statistics of all rows in one
+vectorized pass.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import timedelta
+import time
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from .const import DEFAULT_POLL_INTERVAL
+from .pax_client import CurrentTrigger, FanSpeedTarget, PaxSensors
+
+if TYPE_CHECKING:
+    from .pax_update_coordinator import PaxUpdateCoordinator
+
+ANALYSIS_INTERVAL = timedelta(minutes=5)
+# 13 hours of samples at the default poll interval
+CAPACITY = 720
+# Samples that are needed before a fan's tracking error is judged
+MIN_SAMPLES = 10
+# Mean shortfall of the fan speed from its target that is flagged
+TRACKING_ERROR_THRESHOLD = 15.0
+# Seconds a humidity trigger may last before humidity is not recovering
+RECOVERY_THRESHOLD = 2 * 3600
+# Poll intervals between two samples counted as humid at most, so that an
+# outage during a humidity trigger is not taken for a slow recovery
+MAX_GAP_POLLS = 3
+
+# Triggers that run the fan at one of its FanSpeedTarget values
+_TARGETS = {
+    CurrentTrigger.HUMIDITY.value: "humidity",
+    CurrentTrigger.LIGHT.value: "light",
+    CurrentTrigger.BASE.value: "base",
+}
+
+
+@dataclass(frozen=True, slots=True)
+class FanHealth:
+    samples: int
+    # Mean shortfall of the fan speed from its target in percent
+    tracking_error: float | None
+    # Mean duration of the humidity triggers that ended
+    recovery_seconds: float | None
+    # Duration of the humidity trigger running now, 0 when there is none
+    humidity_trigger_seconds: float
+    problems: tuple[str, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class FleetSummary:
+    fans: int
+    problem_fans: tuple[str, ...]
+    median_tracking_error: float | None
+    worst_tracking: str | None
+
+
+def _optional(value) -> float | None:
+    return None if np.isnan(value) else round(float(value), 1)
+
+
+class FleetAnalytics:
+    def __init__(self, capacity: int = CAPACITY):
+        self._capacity = capacity
+        self._rows: dict[str, int] = {}
+        self._free: list[int] = []
+        self._time = np.empty((0, capacity), np.float64)
+        self._fan_speed = np.empty((0, capacity), np.float32)
+        self._target = np.empty((0, capacity), np.float32)
+        self._trigger = np.empty((0, capacity), np.int8)
+        # Poll interval of the fan when the sample was taken
+        self._interval = np.empty((0, capacity), np.float32)
+        # Next column written per row
+        self._position = np.empty(0, np.intp)
+        self.health: dict[str, FanHealth] = {}
+        self.summary = FleetSummary(0, (), None, None)
+
+    def add(
+        self,
+        address: str,
+        sensors: PaxSensors,
+        targets: FanSpeedTarget | None,
+        now: float | None = None,
+        interval: float = DEFAULT_POLL_INTERVAL,
+    ) -> None:
+        row = self._rows.get(address)
+        if row is None:
+            row = self._rows[address] = self._new_row()
+        column = self._position[row]
+        name = _TARGETS.get(sensors.current_trigger.value)
+        self._time[row, column] = time.monotonic() if now is None else now
+        self._fan_speed[row, column] = sensors.fan_speed
+        self._target[row, column] = (
+            np.nan if name is None or targets is None else getattr(targets, name)
+        )
+        self._trigger[row, column] = sensors.current_trigger.value
+        self._interval[row, column] = interval
+        self._position[row] = (column + 1) % self._capacity
+
+    def remove(self, address: str) -> None:
+        row = self._rows.pop(address, None)
+        if row is not None:
+            self._time[row] = np.nan
+            self._free.append(row)
+            self.health.pop(address, None)
+
+    def _new_row(self) -> int:
+        if self._free:
+            return self._free.pop()
+        self._time = np.vstack([self._time, np.full(self._capacity, np.nan)])
+        self._fan_speed = np.vstack(
+            [self._fan_speed, np.zeros(self._capacity, self._fan_speed.dtype)]
+        )
+        self._target = np.vstack(
+            [self._target, np.zeros(self._capacity, self._target.dtype)]
+        )
+        self._trigger = np.vstack(
+            [self._trigger, np.zeros(self._capacity, self._trigger.dtype)]
+        )
+        self._interval = np.vstack(
+            [self._interval, np.zeros(self._capacity, self._interval.dtype)]
+        )
+        self._position = np.append(self._position, 0)
+        return len(self._position) - 1
+
+    def async_track(self, coordinator: PaxUpdateCoordinator) -> Callable[[], None]:
+        """Add the readings of the coordinator until the returned remover is called."""
+        last = None
+
+        def _add() -> None:
+            nonlocal last
+            sensors = coordinator.sensors
+            if sensors is None or sensors is last or coordinator.stale_since:
+                return
+            last = sensors
+            self.add(
+                coordinator.address,
+                sensors,
+                coordinator.fan_speed_targets,
+                interval=coordinator.update_interval.total_seconds(),
+            )
+
+        unsub = coordinator.async_add_listener(_add)
+
+        def _remove() -> None:
+            unsub()
+            self.remove(coordinator.address)
+
+        return _remove
+
+    def analyze(self) -> None:
+        """Update the health of every fan and the fleet summary."""
+        addresses = list(self._rows)
+        if not addresses:
+            self.health = {}
+            self.summary = FleetSummary(0, (), None, None)
+            return
+        rows = np.fromiter(self._rows.values(), np.intp, len(addresses))
+
+        # Oldest sample first, unwritten columns (NaN time) come first
+        order = (
+            self._position[rows, None] + np.arange(self._capacity)
+        ) % self._capacity
+        t = np.take_along_axis(self._time[rows], order, axis=1)
+        fan_speed = np.take_along_axis(self._fan_speed[rows], order, axis=1)
+        target = np.take_along_axis(self._target[rows], order, axis=1)
+        trigger = np.take_along_axis(self._trigger[rows], order, axis=1)
+        interval = np.take_along_axis(self._interval[rows], order, axis=1)
+        valid = ~np.isnan(t)
+
+        # Samples whose trigger held since the previous sample, so the fan
+        # had a poll interval to reach the target
+        settled = (
+            valid[:, 1:]
+            & valid[:, :-1]
+            & (trigger[:, 1:] == trigger[:, :-1])
+            & (np.nan_to_num(target[:, 1:]) > 0)
+        )
+        shortfall = np.divide(
+            target[:, 1:] - fan_speed[:, 1:],
+            target[:, 1:],
+            out=np.zeros(settled.shape, np.float32),
+            where=settled,
+        )
+        settled_count = settled.sum(axis=1)
+        tracking_error = np.divide(
+            shortfall.sum(axis=1) * 100,
+            settled_count,
+            out=np.full(len(rows), np.nan),
+            where=settled_count > 0,
+        )
+
+        humid = valid & (trigger == CurrentTrigger.HUMIDITY.value)
+        previous = np.zeros_like(humid)
+        previous[:, 1:] = humid[:, :-1]
+        starts = humid & ~previous
+        ended = (valid & ~humid & previous).sum(axis=1)
+        # Humid seconds up to every sample
+        humid_elapsed = np.zeros_like(t)
+        humid_elapsed[:, 1:] = np.cumsum(
+            np.where(
+                humid[:, :-1] & valid[:, 1:],
+                np.minimum(np.diff(t, axis=1), MAX_GAP_POLLS * interval[:, 1:]),
+                0,
+            ),
+            axis=1,
+        )
+        humid_seconds = humid_elapsed[:, -1]
+        last_start = self._capacity - 1 - np.argmax(starts[:, ::-1], axis=1)
+        ongoing = np.where(
+            humid[:, -1],
+            humid_seconds - humid_elapsed[np.arange(len(rows)), last_start],
+            0,
+        )
+        recovery = np.divide(
+            humid_seconds - ongoing,
+            ended,
+            out=np.full(len(rows), np.nan),
+            where=ended > 0,
+        )
+
+        tracking_problem = (settled_count >= MIN_SAMPLES) & (
+            tracking_error > TRACKING_ERROR_THRESHOLD
+        )
+        recovery_problem = (ongoing > RECOVERY_THRESHOLD) | (
+            np.nan_to_num(recovery) > RECOVERY_THRESHOLD
+        )
+
+        samples = valid.sum(axis=1)
+        self.health = {
+            address: FanHealth(
+                int(samples[index]),
+                _optional(tracking_error[index]),
+                _optional(recovery[index]),
+                round(float(ongoing[index]), 1),
+                tuple(
+                    problem
+                    for problem, flagged in (
+                        ("tracking", tracking_problem[index]),
+                        ("recovery", recovery_problem[index]),
+                    )
+                    if flagged
+                ),
+            )
+            for index, address in enumerate(addresses)
+        }
+        judged = ~np.isnan(tracking_error)
+        self.summary = FleetSummary(
+            len(addresses),
+            tuple(address for address, h in self.health.items() if h.problems),
+            _optional(np.median(tracking_error[judged])) if judged.any() else None,
+            (addresses[int(np.nanargmax(tracking_error))] if judged.any() else None),
+        )
@@ -0,0 +1,249 @@
+"""Capture and replay of raw GATT traffic to and from a Pax fan.
+
+A capture file starts with ``MAGIC`` followed by records of a fixed
+``RECORD`` header and the raw characteristic value:
+
+    timestamp (float64) | op (uint8) | characteristic (16 byte UUID) | length (uint16)
+
+A connect record marks the start of each session with the fan. Capture
+files are rotated like log files: once a flush would grow one past
+``MAX_BYTES`` it is renamed to ``<path>.1``, shifting older ones up to
+``<path>.<BACKUPS>``, and a new file is started.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict, deque
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+import logging
+import os
+import struct
+import time
+import uuid
+
+from .pax_client import CODECS
+
+_LOGGER = logging.getLogger(__name__)
+
+MAGIC = b"PAXCAP\x01\n"
+RECORD = struct.Struct("<dB16sH")
+
+OP_CONNECT = 0
+OP_READ = 1
+OP_WRITE = 2
+
+_NO_CHARACTERISTIC = bytes(16)
+
+MAX_BYTES = 10 * 1024 * 1024
+BACKUPS = 3
+
+
+@dataclass(frozen=True, slots=True)
+class CaptureRecord:
+    timestamp: float
+    op: int
+    uuid: str | None
+    data: bytes
+
+
+class PaxCaptureWriter:
+    """Collect GATT traffic in memory and append it to a capture file.
+
+    The ``record_*`` methods are cheap and safe to call from the event loop,
+    ``flush`` does the file I/O and belongs in an executor.
+    """
+
+    def __init__(self, path: str, max_bytes: int = MAX_BYTES, backups: int = BACKUPS):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._buffer = bytearray()
+
+    def record_connect(self) -> None:
+        self._append(OP_CONNECT, None, b"")
+
+    def record_read(self, uuid: str, data: bytes) -> None:
+        self._append(OP_READ, uuid, data)
+
+    def record_write(self, uuid: str, data: bytes) -> None:
+        self._append(OP_WRITE, uuid, data)
+
+    def flush(self) -> None:
+        if not self._buffer:
+            return
+        buffer, self._buffer = self._buffer, bytearray()
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        # Whole sessions are flushed at once, so no session spans two files
+        try:
+            size = os.path.getsize(self.path)
+        except FileNotFoundError:
+            size = 0
+        if size and size + len(buffer) > self.max_bytes:
+            self._rotate()
+        with open(self.path, "ab") as capture:
+            if capture.tell() == 0:
+                capture.write(MAGIC)
+            capture.write(buffer)
+
+    def _rotate(self) -> None:
+        if self.backups <= 0:
+            os.remove(self.path)
+            return
+        for index in range(self.backups - 1, 0, -1):
+            source = f"{self.path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+    def _append(self, op: int, characteristic: str | None, data: bytes) -> None:
+        self._buffer += RECORD.pack(
+            time.time(),
+            op,
+            (
+                _NO_CHARACTERISTIC
+                if characteristic is None
+                else uuid.UUID(characteristic).bytes
+            ),
+            len(data),
+        )
+        self._buffer += data
+
+
+def read_capture(path: str) -> Iterator[CaptureRecord]:
+    with open(path, "rb") as capture:
+        content = capture.read()
+    if not content.startswith(MAGIC):
+        raise ValueError(f"{path} is not a Pax capture file")
+
+    view = memoryview(content)
+    offset = len(MAGIC)
+    while offset < len(view):
+        timestamp, op, characteristic, length = RECORD.unpack_from(view, offset)
+        offset += RECORD.size
+        yield CaptureRecord(
+            timestamp,
+            op,
+            None if op == OP_CONNECT else str(uuid.UUID(bytes=characteristic)),
+            bytes(view[offset : offset + length]),
+        )
+        offset += length
+
+
+def split_sessions(records: Iterable[CaptureRecord]) -> list[list[CaptureRecord]]:
+    sessions: list[list[CaptureRecord]] = []
+    for record in records:
+        if record.op == OP_CONNECT or not sessions:
+            sessions.append([])
+        sessions[-1].append(record)
+    return sessions
+
+
+class PaxReplayBackend:
+    """Stand-in for BleakClient that answers reads from one captured session."""
+
+    def __init__(self, session: Iterable[CaptureRecord]):
+        self._reads: dict[str, deque[bytes]] = defaultdict(deque)
+        for record in session:
+            if record.op == OP_READ:
+                self._reads[record.uuid].append(record.data)
+        self.writes: list[tuple[str, bytes]] = []
+        self.is_connected = False
+        self.services = []
+
+    async def connect(self) -> None:
+        self.is_connected = True
+
+    async def disconnect(self) -> None:
+        self.is_connected = False
+
+    async def read_gatt_char(self, uuid: str) -> bytes:
+        reads = self._reads.get(uuid)
+        if not reads:
+            raise KeyError(f"No captured read of {uuid} left in session")
+        return reads.popleft()
+
+    async def write_gatt_char(self, uuid: str, data: bytes, response=None) -> None:
+        self.writes.append((uuid, bytes(data)))
+
+
+@dataclass
+class ReplayStats:
+    sessions: int = 0
+    reads: int = 0
+    failures: int = 0
+    elapsed: float = 0.0
+
+
+async def async_replay(
+    records: Iterable[CaptureRecord], coordinator=None, realtime: bool = False
+) -> ReplayStats:
+    """Feed captured sessions through the client parsers or a coordinator.
+
+    With a coordinator each session answers one refresh of it. Without one,
+    every captured read is decoded with the codec of its characteristic. With
+    ``realtime`` sessions are spaced as they were captured, otherwise they
+    run back to back.
+    """
+    stats = ReplayStats()
+    started = time.perf_counter()
+    first_timestamp: float | None = None
+
+    for session in split_sessions(records):
+        if realtime:
+            if first_timestamp is None:
+                first_timestamp = session[0].timestamp
+            delay = session[0].timestamp - first_timestamp
+            delay -= time.perf_counter() - started
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+        backend = PaxReplayBackend(session)
+        stats.sessions += 1
+        stats.reads += sum(1 for record in session if record.op == OP_READ)
+
+        if coordinator is not None:
+            coordinator.backend = backend
+            try:
+                await coordinator.async_refresh()
+            finally:
+                coordinator.backend = None
+            if not coordinator.last_update_success:
+                stats.failures += 1
+            continue
+
+        for record in session:
+            if record.op != OP_READ or record.uuid not in CODECS:
+                continue
+            try:
+                CODECS[record.uuid].decode(record.data)
+            except ValueError as err:
+                _LOGGER.debug("Failed to decode %s: %s", record.uuid, err)
+                stats.failures += 1
+
+    stats.elapsed = time.perf_counter() - started
+    return stats
+
+
+def main() -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Replay a Pax capture file through the characteristic codecs"
+    )
+    parser.add_argument("path")
+    parser.add_argument(
+        "--realtime", action="store_true", help="space sessions as captured"
+    )
+    args = parser.parse_args()
+
+    stats = asyncio.run(async_replay(read_capture(args.path), realtime=args.realtime))
+    print(
+        f"{stats.sessions} sessions, {stats.reads} reads, "
+        f"{stats.failures} failures in {stats.elapsed:.3f} s"
+    )
+
+
+if __name__ == "__main__":
+    main()
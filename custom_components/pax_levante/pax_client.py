@@ -1,9 +1,10 @@
-from bleak import BleakClient, BleakError
-from bleak_retry_connector import establish_connection
-from dataclasses import dataclass
+from collections.abc import Mapping
+from contextlib import nullcontext
+from dataclasses import dataclass, field, replace
 import logging
 import struct
 from enum import Enum
+from typing import Any
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -29,14 +30,20 @@ TRIGGER_VALUE_MASK = 0xF  # Mask to extract the current trigger value
 
 
 class CurrentTrigger(Enum):
+    # Reported for trigger values this integration does not know about yet
+    UNKNOWN = 0
     BASE = 1
     LIGHT = 2
     HUMIDITY = 3
     AUTOMATIC_VENTILATION = 7
     BOOST = 17
 
+    @classmethod
+    def _missing_(cls, value):
+        return cls.UNKNOWN
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class FanSpeedTarget:
     humidity: int
     light: int
@@ -48,22 +55,36 @@ class FanSensitivity(Enum):
     LOW = 1
     MEDIUM = 2
     HIGH = 3
+    UNKNOWN = 0xFF
+
+    @classmethod
+    def _missing_(cls, value):
+        return cls.UNKNOWN
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class FanSensitivitySetting:
     humidity: FanSensitivity
     light: FanSensitivity
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Boost:
     active: bool
     fan_speed_target: int
     timeleft_seconds: int
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
+class PaxConfig:
+    """The writable configuration of a fan."""
+
+    fan_speed_targets: FanSpeedTarget
+    fan_sensitivity: FanSensitivitySetting
+    boost: Boost
+
+
+@dataclass(frozen=True, slots=True)
 class PaxDevice:
     manufacturer: str | None
     model_number: str | None
@@ -72,7 +93,7 @@ class PaxDevice:
     hw_version: str | None
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class PaxSensors:
     humidity: int
     temperature: int
@@ -81,40 +102,271 @@ class PaxSensors:
     current_trigger: CurrentTrigger
     boost: bool
     unknown: int
-    raw: str
+    # The frame as read, hex is only computed when asked for
+    raw: bytes = field(repr=False, compare=False)
+
+    @property
+    def raw_hex(self) -> str:
+        return self.raw.hex()
+
+
+class PaxDecodeError(ValueError):
+    """A characteristic value is too short to be decoded."""
+
+
+class StructCodec:
+    """Precompiled encoder and decoder of one fixed layout characteristic.
+
+    ``decode`` accepts any buffer, including a memoryview into a larger
+    frame, and unpacks it in place.
+    """
+
+    __slots__ = ("uuid", "_struct", "_decode", "_encode")
+
+    def __init__(self, uuid: str, layout: str, decode, encode):
+        self.uuid = uuid
+        self._struct = struct.Struct(layout)
+        self._decode = decode
+        self._encode = encode
+
+    @property
+    def size(self) -> int:
+        return self._struct.size
+
+    def decode(self, data):
+        try:
+            values = self._struct.unpack_from(data)
+        except struct.error as err:
+            raise PaxDecodeError(
+                f"Expected {self._struct.size} bytes from {self.uuid}, got {len(data)}"
+            ) from err
+        return self._decode(data, values)
+
+    def encode(self, value) -> bytes:
+        return self._struct.pack(*self._encode(value))
+
+
+class StringCodec:
+    """NUL terminated UTF-8 string characteristic."""
+
+    __slots__ = ("uuid",)
+
+    def __init__(self, uuid: str):
+        self.uuid = uuid
+
+    def decode(self, data) -> str:
+        return str(data, "utf-8", "replace").split("\x00")[0]
+
+    def encode(self, value: str) -> bytes:
+        return value.encode("utf-8")
+
+
+def _decode_sensors(data, values) -> PaxSensors:
+    humidity, temperature, light, fan_speed, trigger, unknown = values
+    boost = trigger >> BOOST_BIT_POSITION == 1
+    return PaxSensors(
+        humidity,
+        temperature,
+        light,
+        fan_speed,
+        CurrentTrigger.BOOST if boost else CurrentTrigger(trigger & TRIGGER_VALUE_MASK),
+        boost,
+        unknown,
+        bytes(data),
+    )
+
+
+def _encode_sensors(sensors: PaxSensors) -> tuple:
+    return (
+        sensors.humidity,
+        sensors.temperature,
+        sensors.light,
+        sensors.fan_speed,
+        sensors.current_trigger.value,
+        sensors.unknown,
+    )
+
+
+def _decode_sensitivity(data, values) -> FanSensitivitySetting:
+    humidity_active, humidity, light_active, light = values
+    return FanSensitivitySetting(
+        FanSensitivity(humidity if humidity_active else 0),
+        FanSensitivity(light if light_active else 0),
+    )
+
+
+def _encode_sensitivity(setting: FanSensitivitySetting) -> tuple:
+    return (
+        setting.humidity != FanSensitivity.DISABLED,
+        setting.humidity.value,
+        setting.light != FanSensitivity.DISABLED,
+        setting.light.value,
+    )
+
+
+SENSORS_CODEC = StructCodec(SENSORS_UUID, "<HHHHHH", _decode_sensors, _encode_sensors)
+FAN_SPEED_TARGETS_CODEC = StructCodec(
+    FAN_SPEED_TARGETS_UUID,
+    "<HHH",
+    lambda data, values: FanSpeedTarget(*values),
+    lambda targets: (targets.humidity, targets.light, targets.base),
+)
+FAN_SENSITIVITY_CODEC = StructCodec(
+    FAN_SENSITIVITY_UUID, "<BBBB", _decode_sensitivity, _encode_sensitivity
+)
+BOOST_CODEC = StructCodec(
+    BOOST_UUID,
+    "<BHH",
+    lambda data, values: Boost(bool(values[0]), values[1], values[2]),
+    lambda boost: (boost.active, boost.fan_speed_target, boost.timeleft_seconds),
+)
+PIN_CODEC = StructCodec(
+    PIN_READ_WRITE_UUID, ">I", lambda data, values: values[0], lambda pin: (pin,)
+)
+PIN_CHECK_CODEC = StructCodec(
+    PIN_CHECK_UUID,
+    "B",
+    lambda data, values: values[0] == 1,
+    lambda valid: (valid,),
+)
+
+# Codec of every characteristic the client reads or writes, by UUID
+CODECS = {
+    codec.uuid: codec
+    for codec in (
+        SENSORS_CODEC,
+        FAN_SPEED_TARGETS_CODEC,
+        FAN_SENSITIVITY_CODEC,
+        BOOST_CODEC,
+        PIN_CODEC,
+        PIN_CHECK_CODEC,
+        StringCodec(MODEL_NUMBER_UUID),
+        StringCodec(HARDWARE_REVISION_UUID),
+        StringCodec(SOFTWARE_REVISION_UUID),
+        StringCodec(MANUFACTURER_NAME_UUID),
+        StringCodec(DEVICE_NAME_UUID),
+    )
+}
+
+# Writable characteristics by PaxConfig field, in the order a transaction
+# writes them. Boost goes last so that a failed transaction never leaves the
+# fan boosting on a configuration that was not written.
+WRITE_ORDER = {
+    "fan_speed_targets": FAN_SPEED_TARGETS_UUID,
+    "fan_sensitivity": FAN_SENSITIVITY_UUID,
+    "boost": BOOST_UUID,
+}
+
+
+class PaxTransactionError(Exception):
+    """A write transaction that stopped part way.
+
+    ``written`` lists the changes that landed, ``failed`` the one that did
+    not, if any.
+    """
+
+    def __init__(self, message: str, written: list[str], failed: str | None = None):
+        super().__init__(message)
+        self.written = written
+        self.failed = failed
+
+
+def boost_request(
+    active: bool,
+    fan_speed_target: int | None = None,
+    timeleft_seconds: int | None = None,
+) -> Boost:
+    """Boost to write, by default 2400 rpm for 15 minutes when active."""
+    return Boost(
+        active,
+        fan_speed_target or (2400 if active else 0),
+        timeleft_seconds or (900 if active else 0),
+    )
+
+
+def _landed(expected, actual) -> bool:
+    if isinstance(expected, Boost):
+        # The fan counts timeleft_seconds down from the moment it is written
+        if not expected.active:
+            return not actual.active
+        return actual.active and actual.fan_speed_target == expected.fan_speed_target
+    return actual == expected
 
 
 class PaxClient:
-    def __init__(self, device, use_services_cache=True):
+    def __init__(
+        self,
+        device,
+        use_services_cache=True,
+        max_attempts=4,
+        recorder=None,
+        backend=None,
+        profiled=nullcontext,
+    ):
         self._device = device
         self._client = None
         self._use_services_cache = use_services_cache
+        self._max_attempts = max_attempts
+        # Optional sink for raw GATT traffic, see pax_capture.PaxCaptureWriter
+        self._recorder = recorder
+        # Optional stand-in for BleakClient, e.g. pax_capture.PaxReplayBackend
+        self._backend = backend
+        # Context manager factory wrapped around decoding, see pax_profiler
+        self._profiled = profiled
+        # Last value read or written per characteristic on this connection
+        self._values: dict[str, Any] = {}
+        self._authenticated = False
+        # Reads and writes made through this client, see pax_airtime
+        self.gatt_operations = 0
 
     async def __aenter__(self):
+        await self.async_connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.async_disconnect()
+
+    @property
+    def is_connected(self) -> bool:
+        return self._client is not None and self._client.is_connected
+
+    async def async_connect(self):
+        self._values.clear()
+        self._authenticated = False
+        if self._recorder is not None:
+            self._recorder.record_connect()
+        if self._backend is not None:
+            await self._backend.connect()
+            self._client = self._backend
+            return
+
+        # bleak is only needed once a connection is made, keep it out of the
+        # import path of the platforms and the config flow.
+        from bleak import BleakClient
+        from bleak_retry_connector import establish_connection
+
         self._client = await establish_connection(
             BleakClient,
             self._device,
             self._device.name or "Pax Levante",
+            max_attempts=self._max_attempts,
             use_services_cache=self._use_services_cache,
         )
-        return self
 
-    async def __aexit__(self, exc_type, exc_val, exc_tb):
-        await self._client.disconnect()
-        self._client = None
+    async def async_disconnect(self):
+        if self._client is None:
+            return
+        client, self._client = self._client, None
+        self._values.clear()
+        self._authenticated = False
+        await client.disconnect()
 
     async def async_get_device_info(self) -> PaxDevice:
-        model_number = await self._read_string(self._client, MODEL_NUMBER_UUID)
-        hardware_revision = await self._read_string(
-            self._client, HARDWARE_REVISION_UUID
-        )
-        software_revision = await self._read_string(
-            self._client, SOFTWARE_REVISION_UUID
-        )
-        manufacturer_name = await self._read_string(
-            self._client, MANUFACTURER_NAME_UUID
-        )
-        name = await self._read_string(self._client, DEVICE_NAME_UUID)
+        model_number = await self._read_string(MODEL_NUMBER_UUID)
+        hardware_revision = await self._read_string(HARDWARE_REVISION_UUID)
+        software_revision = await self._read_string(SOFTWARE_REVISION_UUID)
+        manufacturer_name = await self._read_string(MANUFACTURER_NAME_UUID)
+        name = await self._read_string(DEVICE_NAME_UUID)
 
         return PaxDevice(
             manufacturer_name,
@@ -125,54 +377,141 @@ class PaxClient:
         )
 
     async def async_get_sensors(self) -> PaxSensors:
-        raw_sensors = await self._client.read_gatt_char(SENSORS_UUID)
-        return self._parse_sensors_response(raw_sensors)
+        return await self._read(SENSORS_UUID)
 
     async def async_get_pin(self) -> int:
-        return int.from_bytes(
-            await self._client.read_gatt_char(PIN_READ_WRITE_UUID), "big"
-        )
+        return await self._read(PIN_READ_WRITE_UUID)
 
     async def async_set_pin(self, pin) -> bool:
-        await self._client.write_gatt_char(
-            PIN_READ_WRITE_UUID, pin.to_bytes(4, byteorder="big")
-        )
-        return await self.async_check_pin()
+        await self._write(PIN_READ_WRITE_UUID, pin)
+        self._authenticated = await self.async_check_pin()
+        return self._authenticated
 
     async def async_check_pin(self) -> bool:
-        return (
-            int.from_bytes(await self._client.read_gatt_char(PIN_CHECK_UUID), "big")
-            == 1
-        )
+        return await self._read(PIN_CHECK_UUID)
 
     async def async_get_fan_speed_targets(self) -> FanSpeedTarget:
-        response = await self._client.read_gatt_char(FAN_SPEED_TARGETS_UUID)
-        return FanSpeedTarget(*struct.unpack("<HHH", response))
+        return await self._read(FAN_SPEED_TARGETS_UUID)
 
     async def async_set_fan_speed_targets(self, targets: FanSpeedTarget) -> bool:
-        return await self._client.write_gatt_char(
-            FAN_SPEED_TARGETS_UUID,
-            bytearray(
-                struct.pack("<HHH", targets.humidity, targets.light, targets.base)
-            ),
-        )
+        return await self._write(FAN_SPEED_TARGETS_UUID, targets)
 
     async def async_get_fan_sensitivity(self) -> FanSensitivitySetting:
-        response = await self._client.read_gatt_char(FAN_SENSITIVITY_UUID)
-        (
-            humidity_active,
-            humidity_sensitivity,
-            prescense_active,
-            prescense_sensitivity,
-        ) = struct.unpack("<BBBB", response)
-        return FanSensitivitySetting(
-            0 if humidity_active == 0 else humidity_sensitivity,
-            0 if prescense_active == 0 else prescense_sensitivity,
+        return await self._read(FAN_SENSITIVITY_UUID)
+
+    async def async_set_fan_sensitivity(self, setting: FanSensitivitySetting) -> bool:
+        return await self._write(FAN_SENSITIVITY_UUID, setting)
+
+    async def async_get_boost(self) -> Boost:
+        return await self._read(BOOST_UUID)
+
+    async def async_get_config(self) -> PaxConfig:
+        return PaxConfig(
+            await self.async_get_fan_speed_targets(),
+            await self.async_get_fan_sensitivity(),
+            await self.async_get_boost(),
         )
 
-    async def async_get_boost(self) -> bool:
-        response = await self._client.read_gatt_char(BOOST_UUID)
-        return Boost(*struct.unpack("<BHH", response))
+    async def async_apply_config(
+        self,
+        config: PaxConfig,
+        current: PaxConfig | None = None,
+        pin: int | None = None,
+        verify: bool = False,
+    ) -> list[str]:
+        """Write the parts of config that differ from the fan in one transaction.
+
+        Of boost only the fan speed target is written.
+
+        ``current`` is the configuration as last read from the fan, it is read
+        when not given. See async_write_transaction for ``pin`` and ``verify``.
+        """
+        if current is None:
+            current = await self.async_get_config()
+        else:
+            for name, uuid in WRITE_ORDER.items():
+                self._values[uuid] = getattr(current, name)
+        changes = {
+            "fan_speed_targets": config.fan_speed_targets,
+            "fan_sensitivity": config.fan_sensitivity,
+        }
+        # Only the boost fan speed is configuration, a running boost and the
+        # time it has left are kept
+        if config.boost.fan_speed_target != current.boost.fan_speed_target:
+            changes["boost"] = replace(
+                current.boost, fan_speed_target=config.boost.fan_speed_target
+            )
+        return await self.async_write_transaction(changes, pin, verify)
+
+    async def async_write_transaction(
+        self,
+        changes: Mapping[str, Any],
+        pin: int | None = None,
+        verify: bool = False,
+    ) -> list[str]:
+        """Write several characteristics as one unit.
+
+        ``changes`` maps PaxConfig field names to values. They are written in
+        WRITE_ORDER with write-with-response, skipping values equal to the
+        last one read or written on this connection. Boost is always written,
+        the fan changes it on its own when the boost runs out. With ``pin`` the
+        connection is authenticated once before the first write, with
+        ``verify`` every written value is read back after the last write.
+
+        Returns the names written. Raises PaxTransactionError with the writes
+        that landed when a step fails.
+        """
+        unknown = changes.keys() - WRITE_ORDER.keys()
+        if unknown:
+            raise ValueError(f"Not writable: {', '.join(sorted(unknown))}")
+        pending = [
+            (name, uuid, changes[name])
+            for name, uuid in WRITE_ORDER.items()
+            if name in changes
+            and (uuid == BOOST_UUID or self._values.get(uuid) != changes[name])
+        ]
+        if not pending:
+            return []
+
+        if pin is not None and not self._authenticated:
+            try:
+                authenticated = await self.async_set_pin(pin)
+            except Exception as err:
+                raise PaxTransactionError(f"Unable to set pin: {err}", []) from err
+            if not authenticated:
+                raise PaxTransactionError("Unable to set pin", [])
+
+        written = []
+        for name, uuid, value in pending:
+            try:
+                await self._write(uuid, value, response=True)
+            except Exception as err:
+                raise PaxTransactionError(
+                    f"Writing {name} failed after writing {written}: {err}",
+                    written,
+                    name,
+                ) from err
+            written.append(name)
+        if not verify:
+            return written
+
+        try:
+            actual = [await self._read(uuid) for _, uuid, _ in pending]
+        except Exception as err:
+            raise PaxTransactionError(
+                f"Unable to verify {written}: {err}", written
+            ) from err
+        landed = [
+            name
+            for (name, _, value), read in zip(pending, actual)
+            if _landed(value, read)
+        ]
+        if landed != written:
+            failed = next(name for name in written if name not in landed)
+            raise PaxTransactionError(
+                f"{failed} did not take effect, {landed} did", landed, failed
+            )
+        return written
 
     async def async_set_boost(
         self,
@@ -180,23 +519,13 @@ class PaxClient:
         fan_speed_target: int | None = None,
         timeleft_seconds: int | None = None,
     ) -> bool:
-        return await self._client.write_gatt_char(
-            BOOST_UUID,
-            bytearray(
-                struct.pack(
-                    "<BHH",
-                    active,
-                    fan_speed_target or (2400 if active else 0),
-                    timeleft_seconds or (900 if active else 0),
-                )
-            ),
+        return await self._write(
+            BOOST_UUID, boost_request(active, fan_speed_target, timeleft_seconds)
         )
 
     async def async_log_services(self):
         for service in self._client.services:
-            _LOGGER.debug(
-                "Service: %s (%s)", service.uuid, service.description
-            )
+            _LOGGER.debug("Service: %s (%s)", service.uuid, service.description)
             for char in service.characteristics:
                 _LOGGER.debug(
                     "  Characteristic: %s (%s) | Properties: %s",
@@ -205,35 +534,38 @@ class PaxClient:
                     ", ".join(char.properties),
                 )
 
-    async def _read_string(self, client, handle) -> str:
-        response = await client.read_gatt_char(handle)
-        return self._parse_string(response)
+    async def _read_string(self, uuid: str) -> str:
+        return await self._read(uuid)
+
+    async def _read(self, uuid: str):
+        data = await self._read_char(uuid)
+        with self._profiled():
+            value = CODECS[uuid].decode(data)
+        self._values[uuid] = value
+        return value
+
+    async def _write(self, uuid: str, value, response: bool | None = None):
+        result = await self._write_char(uuid, CODECS[uuid].encode(value), response)
+        self._values[uuid] = value
+        return result
+
+    async def _read_char(self, uuid: str) -> bytes:
+        self.gatt_operations += 1
+        data = await self._client.read_gatt_char(uuid)
+        if self._recorder is not None:
+            self._recorder.record_read(uuid, data)
+        return data
+
+    async def _write_char(self, uuid: str, data: bytes, response: bool | None = None):
+        self.gatt_operations += 1
+        if self._recorder is not None:
+            self._recorder.record_write(uuid, data)
+        return await self._client.write_gatt_char(uuid, data, response=response)
 
     @staticmethod
     def _parse_string(response: bytes) -> str:
-        return response.decode("utf-8").split("\x00")[0]
+        return CODECS[DEVICE_NAME_UUID].decode(response)
 
     @staticmethod
     def _parse_sensors_response(raw_sensors: bytes) -> PaxSensors:
-        (
-            humidity,
-            temperature,
-            light,
-            fan_speed,
-            current_trigger,
-            unknown,
-        ) = struct.unpack("<HHHHHH", raw_sensors)
-        return PaxSensors(
-            humidity,
-            temperature,
-            light,
-            fan_speed,
-            (
-                CurrentTrigger.BOOST
-                if current_trigger >> BOOST_BIT_POSITION == 1
-                else CurrentTrigger(current_trigger & TRIGGER_VALUE_MASK)
-            ),
-            current_trigger >> BOOST_BIT_POSITION == 1,
-            unknown,
-            raw_sensors.hex(),
-        )
+        return SENSORS_CODEC.decode(raw_sensors)
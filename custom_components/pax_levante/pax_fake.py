@@ -0,0 +1,122 @@
+"""A simulated Pax fan for using PaxClient without hardware."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+
+from .pax_client import (
+    BOOST_UUID,
+    CODECS,
+    DEVICE_NAME_UUID,
+    FAN_SENSITIVITY_UUID,
+    FAN_SPEED_TARGETS_UUID,
+    HARDWARE_REVISION_UUID,
+    MANUFACTURER_NAME_UUID,
+    MODEL_NUMBER_UUID,
+    PIN_CHECK_UUID,
+    PIN_READ_WRITE_UUID,
+    SENSORS_UUID,
+    SOFTWARE_REVISION_UUID,
+    Boost,
+    CurrentTrigger,
+    FanSensitivity,
+    FanSensitivitySetting,
+    FanSpeedTarget,
+    PaxSensors,
+)
+
+
+class FakePaxFan:
+    """Stand-in for BleakClient that behaves like a Pax fan.
+
+    Humidity drifts a little on every sensor read and the fan runs at the
+    target of the active trigger. Writes other than the pin are ignored
+    until the right pin has been written, like on the real fan.
+    """
+
+    name = "Pax Levante"
+
+    def __init__(self, address: str, pin: int = 0, latency: float = 0.0):
+        self.address = address
+        self.pin = pin
+        self.latency = latency
+        self._random = random.Random(address)
+        self.humidity = self._random.randint(35, 65)
+        self.fan_speed_targets = FanSpeedTarget(2250, 1675, 1000)
+        self.fan_sensitivity = FanSensitivitySetting(
+            FanSensitivity.MEDIUM, FanSensitivity.LOW
+        )
+        self.boost = Boost(False, 0, 0)
+        self.is_connected = False
+        self.services = []
+        self._authenticated = False
+
+    async def connect(self) -> None:
+        await asyncio.sleep(self.latency)
+        self.is_connected = True
+        self._authenticated = False
+
+    async def disconnect(self) -> None:
+        self.is_connected = False
+
+    async def read_gatt_char(self, uuid: str) -> bytes:
+        await asyncio.sleep(self.latency)
+        return CODECS[uuid].encode(self._value(uuid))
+
+    async def write_gatt_char(self, uuid: str, data: bytes, response=None) -> None:
+        await asyncio.sleep(self.latency)
+        value = CODECS[uuid].decode(data)
+        if uuid == PIN_READ_WRITE_UUID:
+            self._authenticated = value == self.pin
+        elif not self._authenticated:
+            return
+        elif uuid == FAN_SPEED_TARGETS_UUID:
+            self.fan_speed_targets = value
+        elif uuid == FAN_SENSITIVITY_UUID:
+            self.fan_sensitivity = value
+        elif uuid == BOOST_UUID:
+            self.boost = value
+
+    def _value(self, uuid: str):
+        if uuid == SENSORS_UUID:
+            return self._sensors()
+        if uuid == FAN_SPEED_TARGETS_UUID:
+            return self.fan_speed_targets
+        if uuid == FAN_SENSITIVITY_UUID:
+            return self.fan_sensitivity
+        if uuid == BOOST_UUID:
+            return self.boost
+        if uuid == PIN_READ_WRITE_UUID:
+            return self.pin
+        if uuid == PIN_CHECK_UUID:
+            return self._authenticated
+        if uuid == MANUFACTURER_NAME_UUID:
+            return "Pax"
+        if uuid in (DEVICE_NAME_UUID, MODEL_NUMBER_UUID):
+            return self.name
+        if uuid in (HARDWARE_REVISION_UUID, SOFTWARE_REVISION_UUID):
+            return "1.0"
+        raise KeyError(uuid)
+
+    def _sensors(self) -> PaxSensors:
+        self.humidity = min(99, max(0, self.humidity + self._random.randint(-2, 2)))
+        if self.boost.active:
+            trigger, fan_speed = CurrentTrigger.BOOST, self.boost.fan_speed_target
+        elif self.humidity > 70:
+            trigger, fan_speed = (
+                CurrentTrigger.HUMIDITY,
+                self.fan_speed_targets.humidity,
+            )
+        else:
+            trigger, fan_speed = CurrentTrigger.BASE, self.fan_speed_targets.base
+        return PaxSensors(
+            self.humidity,
+            215,
+            30,
+            max(0, fan_speed + self._random.randint(-25, 25)),
+            trigger,
+            trigger is CurrentTrigger.BOOST,
+            0,
+            b"",
+        )
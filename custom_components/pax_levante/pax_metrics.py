@@ -0,0 +1,178 @@
+"""In-memory operation counters and an OpenMetrics view of all fans."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+import time
+from typing import TYPE_CHECKING
+
+from aiohttp import web
+from homeassistant.components.http import KEY_HASS, HomeAssistantView
+
+from .const import DOMAIN
+from .pax_client import CurrentTrigger
+
+if TYPE_CHECKING:
+    from .pax_update_coordinator import PaxUpdateCoordinator
+
+OPERATIONS = ("poll", "connect", "write")
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+
+class OperationMetrics:
+    __slots__ = ("count", "failures", "seconds", "seconds_max")
+
+    def __init__(self):
+        self.count = 0
+        self.failures = 0
+        self.seconds = 0.0
+        self.seconds_max = 0.0
+
+
+class FanMetrics:
+    """Counts and latency of the operations on one fan."""
+
+    def __init__(self):
+        self.operations = {operation: OperationMetrics() for operation in OPERATIONS}
+
+    @contextmanager
+    def measure(self, operation: str) -> Iterator[None]:
+        """Count the wrapped operation, as failed if it raises.
+
+        Cancelled operations, e.g. preempted polls, are not counted.
+        """
+        metrics = self.operations[operation]
+        start = time.perf_counter()
+        try:
+            yield
+        except asyncio.CancelledError:
+            raise
+        except BaseException:
+            metrics.failures += 1
+            self._add(metrics, start)
+            raise
+        self._add(metrics, start)
+
+    @staticmethod
+    def _add(metrics: OperationMetrics, start: float) -> None:
+        elapsed = time.perf_counter() - start
+        metrics.count += 1
+        metrics.seconds += elapsed
+        if elapsed > metrics.seconds_max:
+            metrics.seconds_max = elapsed
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: dict[str, str]) -> str:
+    return ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels.items())
+
+
+def render_openmetrics(coordinators: Iterable[PaxUpdateCoordinator]) -> str:
+    """Render the latest readings and operation metrics of every fan."""
+    families: dict[str, tuple[str, str, list[str]]] = {}
+
+    def add(name: str, kind: str, help_text: str, sample: str) -> None:
+        families.setdefault(name, (kind, help_text, []))[2].append(sample)
+
+    for coordinator in coordinators:
+        fan = {"address": coordinator.address}
+        labels = _labels(fan)
+        sensors = coordinator.sensors
+        if sensors is not None:
+            for name, unit, value in (
+                ("humidity", "percent", sensors.humidity),
+                ("temperature", "celsius", sensors.temperature),
+                ("light", "lux", sensors.light),
+                ("fan_speed", "rpm", sensors.fan_speed),
+            ):
+                add(
+                    f"{DOMAIN}_{name}_{unit}",
+                    "gauge",
+                    f"Latest {name.replace('_', ' ')} reading",
+                    f"{DOMAIN}_{name}_{unit}{{{labels}}} {value}",
+                )
+            add(
+                f"{DOMAIN}_boost",
+                "gauge",
+                "Whether boost is active",
+                f"{DOMAIN}_boost{{{labels}}} {int(sensors.boost)}",
+            )
+            for trigger in CurrentTrigger:
+                state = _labels(
+                    {**fan, f"{DOMAIN}_current_trigger": trigger.name.lower()}
+                )
+                add(
+                    f"{DOMAIN}_current_trigger",
+                    "stateset",
+                    "Trigger the fan is running for",
+                    f"{DOMAIN}_current_trigger{{{state}}} "
+                    f"{int(sensors.current_trigger is trigger)}",
+                )
+
+        targets = coordinator.fan_speed_targets
+        if targets is not None:
+            for trigger in ("humidity", "light", "base"):
+                target = _labels({**fan, "trigger": trigger})
+                add(
+                    f"{DOMAIN}_fan_speed_target_rpm",
+                    "gauge",
+                    "Configured fan speed per trigger",
+                    f"{DOMAIN}_fan_speed_target_rpm{{{target}}} "
+                    f"{getattr(targets, trigger)}",
+                )
+
+        for operation, metrics in coordinator.metrics.operations.items():
+            add(
+                f"{DOMAIN}_{operation}s",
+                "counter",
+                f"{operation.capitalize()} attempts",
+                f"{DOMAIN}_{operation}s_total{{{labels}}} {metrics.count}",
+            )
+            add(
+                f"{DOMAIN}_{operation}_failures",
+                "counter",
+                f"Failed {operation} attempts",
+                f"{DOMAIN}_{operation}_failures_total{{{labels}}} {metrics.failures}",
+            )
+            name = f"{DOMAIN}_{operation}_duration_seconds"
+            add(
+                name,
+                "summary",
+                f"Duration of {operation} attempts",
+                f"{name}_count{{{labels}}} {metrics.count}\n"
+                f"{name}_sum{{{labels}}} {metrics.seconds:.6f}",
+            )
+            add(
+                f"{name}_max",
+                "gauge",
+                f"Longest {operation} attempt",
+                f"{name}_max{{{labels}}} {metrics.seconds_max:.6f}",
+            )
+
+    lines = []
+    for name, (kind, help_text, samples) in families.items():
+        lines.append(f"# TYPE {name} {kind}")
+        lines.append(f"# HELP {name} {help_text}")
+        lines.extend(samples)
+    lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+class PaxMetricsView(HomeAssistantView):
+    """Latest readings and operation metrics of all fans for Prometheus."""
+
+    url = f"/api/{DOMAIN}/metrics"
+    name = f"api:{DOMAIN}:metrics"
+
+    async def get(self, request: web.Request) -> web.Response:
+        hass = request.app[KEY_HASS]
+        return web.Response(
+            body=render_openmetrics(hass.data.get(DOMAIN, {}).values()).encode(),
+            headers={"Content-Type": CONTENT_TYPE},
+        )
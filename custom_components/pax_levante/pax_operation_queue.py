@@ -0,0 +1,176 @@
+"""Serialized per-device operation queue for the Pax Levante integration."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+import heapq
+import itertools
+import logging
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+# Lower value runs first
+PRIORITY_WRITE = 0
+PRIORITY_REFRESH = 5
+PRIORITY_POLL = 10
+
+
+@dataclass(order=True)
+class _Operation:
+    priority: int
+    sequence: int
+    func: Callable[[], Awaitable[Any]] = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+    preemptible: bool = field(default=False, compare=False)
+    collapse_key: str | None = field(default=None, compare=False)
+    preempted: bool = field(default=False, compare=False)
+
+
+class PaxOperationQueue:
+    """Run operations against one device strictly one at a time.
+
+    Operations are ordered by priority, then by submission order. Queued
+    operations that share a ``collapse_key`` are merged into the one already
+    waiting. A running preemptible operation is cancelled when an operation
+    with a higher priority is submitted; it is then queued again and its
+    waiters get the result of the re-run.
+    """
+
+    def __init__(self, name: str = "pax"):
+        self._name = name
+        self._pending: list[_Operation] = []
+        self._sequence = itertools.count()
+        self._current: _Operation | None = None
+        self._current_task: asyncio.Task | None = None
+        self._worker: asyncio.Task | None = None
+
+    @property
+    def busy(self) -> bool:
+        return self._current is not None or bool(self._pending)
+
+    async def async_run(
+        self,
+        func: Callable[[], Awaitable[Any]],
+        *,
+        priority: int,
+        preemptible: bool = False,
+        collapse_key: str | None = None,
+    ) -> Any:
+        """Queue ``func`` and wait for its result."""
+        if collapse_key is not None:
+            for queued in self._pending:
+                if queued.collapse_key == collapse_key:
+                    _LOGGER.debug(
+                        "%s: collapsing %s into queued operation",
+                        self._name,
+                        collapse_key,
+                    )
+                    return await asyncio.shield(queued.future)
+
+        operation = _Operation(
+            priority,
+            next(self._sequence),
+            func,
+            asyncio.get_running_loop().create_future(),
+            preemptible,
+            collapse_key,
+        )
+        heapq.heappush(self._pending, operation)
+        self._preempt_for(operation)
+        self._ensure_worker()
+        return await asyncio.shield(operation.future)
+
+    async def async_shutdown(self) -> None:
+        """Cancel the running operation and everything still queued."""
+        pending, self._pending = self._pending, []
+        for operation in pending:
+            operation.future.cancel()
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    def _preempt_for(self, operation: _Operation) -> None:
+        current = self._current
+        if (
+            current is None
+            or not current.preemptible
+            or current.preempted
+            or current.priority <= operation.priority
+        ):
+            return
+        _LOGGER.debug(
+            "%s: preempting %s for higher priority operation",
+            self._name,
+            current.collapse_key,
+        )
+        current.preempted = True
+        self._current_task.cancel()
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.get_running_loop().create_task(
+                self._async_work(), name=f"{self._name} operation queue"
+            )
+
+    async def _async_work(self) -> None:
+        try:
+            while self._pending:
+                operation = heapq.heappop(self._pending)
+                if operation.future.done():
+                    continue
+                await self._async_execute(operation)
+        finally:
+            if self._current_task is not None and not self._current_task.done():
+                self._current_task.cancel()
+            if self._current is not None and not self._current.future.done():
+                self._current.future.cancel()
+            self._current = None
+            self._current_task = None
+
+    async def _async_execute(self, operation: _Operation) -> None:
+        self._current = operation
+        self._current_task = task = asyncio.get_running_loop().create_task(
+            operation.func()
+        )
+        await asyncio.wait([task])
+        self._current = None
+        self._current_task = None
+
+        if task.cancelled():
+            if operation.preempted:
+                operation.preempted = False
+                self._requeue(operation)
+            else:
+                operation.future.cancel()
+        elif (err := task.exception()) is not None:
+            operation.future.set_exception(err)
+        else:
+            operation.future.set_result(task.result())
+
+    def _requeue(self, operation: _Operation) -> None:
+        if operation.collapse_key is not None:
+            for queued in self._pending:
+                if queued.collapse_key == operation.collapse_key:
+                    queued.future.add_done_callback(
+                        lambda done, target=operation.future: _chain(done, target)
+                    )
+                    return
+        heapq.heappush(self._pending, operation)
+
+
+def _chain(source: asyncio.Future, target: asyncio.Future) -> None:
+    if target.done():
+        return
+    if source.cancelled():
+        target.cancel()
+    elif (err := source.exception()) is not None:
+        target.set_exception(err)
+    else:
+        target.set_result(source.result())
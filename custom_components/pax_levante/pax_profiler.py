@@ -0,0 +1,136 @@
+"""Profiling of coordinator update cycles."""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import contextmanager
+import cProfile
+import io
+import pstats
+import statistics
+import time
+
+# How often the event loop lag is probed while profiling
+LAG_PROBE_INTERVAL = 0.05
+
+
+class UpdateProfiler:
+    """Wall clock per phase of the next ``cycles`` update cycles.
+
+    Phases are laps: ``lap`` records the time since the cycle started or
+    the previous lap. With ``use_cprofile`` the ``profiled`` sections are
+    run under cProfile, they must not await.
+    """
+
+    def __init__(self, cycles: int, use_cprofile: bool = False):
+        self.cycles = cycles
+        self.results: list[dict[str, float]] = []
+        self.lags: list[float] = []
+        self.started = time.time()
+        self._profile = cProfile.Profile() if use_cprofile else None
+        self._current: dict[str, float] | None = None
+        self._last = 0.0
+        self._probe: asyncio.TimerHandle | None = None
+
+    @property
+    def done(self) -> bool:
+        return len(self.results) >= self.cycles
+
+    def start_lag_probe(self, loop: asyncio.AbstractEventLoop) -> None:
+        def probe(expected: float) -> None:
+            self.lags.append(max(0.0, loop.time() - expected))
+            self._schedule_probe(loop, probe)
+
+        self._schedule_probe(loop, probe)
+
+    def _schedule_probe(self, loop: asyncio.AbstractEventLoop, probe) -> None:
+        expected = loop.time() + LAG_PROBE_INTERVAL
+        self._probe = loop.call_at(expected, probe, expected)
+
+    def stop_lag_probe(self) -> None:
+        if self._probe is not None:
+            self._probe.cancel()
+            self._probe = None
+
+    def start_cycle(self) -> None:
+        self._current = {}
+        self._last = time.perf_counter()
+
+    def lap(self, phase: str) -> None:
+        if self._current is None:
+            return
+        now = time.perf_counter()
+        self._current[phase] = self._current.get(phase, 0.0) + now - self._last
+        self._last = now
+
+    def end_cycle(self) -> None:
+        if self._current is None:
+            return
+        self.lap("other")
+        self.results.append(self._current)
+        self._current = None
+
+    @contextmanager
+    def profiled(self):
+        if self._profile is None or self._current is None:
+            yield
+            return
+        self._profile.enable()
+        try:
+            yield
+        finally:
+            self._profile.disable()
+
+    def _phase_stats(self) -> dict[str, tuple[float, float, float]]:
+        """Return min, mean and max milliseconds of every phase."""
+        phases: dict[str, list[float]] = {}
+        for result in self.results:
+            for phase, seconds in result.items():
+                phases.setdefault(phase, []).append(seconds * 1000)
+        return {
+            phase: (min(values), statistics.fmean(values), max(values))
+            for phase, values in phases.items()
+        }
+
+    def summary(self) -> str:
+        lines = [f"{len(self.results)} update cycles"]
+        for phase, (_, mean, maximum) in self._phase_stats().items():
+            lines.append(f"- {phase}: mean {mean:.1f} ms, max {maximum:.1f} ms")
+        if self.lags:
+            lines.append(f"- event loop lag: max {max(self.lags) * 1000:.1f} ms")
+        return "\n".join(lines)
+
+    def report(self, title: str) -> str:
+        phase_stats = self._phase_stats()
+        out = io.StringIO()
+        out.write(f"{title}\n")
+        out.write(f"Started {time.ctime(self.started)}\n\n")
+        out.write(f"{'phase':<24} {'min ms':>9} {'mean ms':>9} {'max ms':>9}\n")
+        for phase, (minimum, mean, maximum) in phase_stats.items():
+            out.write(f"{phase:<24} {minimum:>9.2f} {mean:>9.2f} {maximum:>9.2f}\n")
+
+        out.write("\ncycle " + " ".join(f"{p:>12}" for p in phase_stats))
+        for cycle, result in enumerate(self.results, 1):
+            out.write(f"\n{cycle:>5} ")
+            out.write(
+                " ".join(
+                    f"{result.get(phase, 0.0) * 1000:>12.2f}" for phase in phase_stats
+                )
+            )
+        out.write("\n")
+
+        if self.lags:
+            lags = sorted(lag * 1000 for lag in self.lags)
+            out.write(
+                f"\nEvent loop lag over {len(lags)} probes: "
+                f"median {statistics.median(lags):.2f} ms, "
+                f"p95 {lags[int(0.95 * (len(lags) - 1))]:.2f} ms, "
+                f"max {lags[-1]:.2f} ms\n"
+            )
+
+        if self._profile is not None:
+            out.write("\ncProfile of decoding, sensor processing and entity updates\n")
+            pstats.Stats(self._profile, stream=out).sort_stats(
+                pstats.SortKey.CUMULATIVE
+            ).print_stats(30)
+        return out.getvalue()
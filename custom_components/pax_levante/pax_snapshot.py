@@ -0,0 +1,104 @@
+"""Versioned, JSON friendly snapshots of a fan's configuration."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import voluptuous as vol
+
+from .const import MAX_FAN_SPEED, MIN_FAN_SPEED
+from .pax_client import (
+    Boost,
+    FanSensitivity,
+    FanSensitivitySetting,
+    FanSpeedTarget,
+    PaxConfig,
+    PaxDevice,
+)
+
+SNAPSHOT_VERSION = 1
+
+_FAN_SPEED = vol.All(vol.Coerce(int), vol.Range(min=MIN_FAN_SPEED, max=MAX_FAN_SPEED))
+_SENSITIVITY = vol.All(
+    str,
+    vol.Lower,
+    vol.In(
+        [
+            sensitivity.name.lower()
+            for sensitivity in FanSensitivity
+            if sensitivity is not FanSensitivity.UNKNOWN
+        ]
+    ),
+)
+
+# The same limits as the entities, so that a hand-edited snapshot can not
+# write what the UI would refuse
+SNAPSHOT_SCHEMA = vol.Schema(
+    {
+        vol.Required("version"): SNAPSHOT_VERSION,
+        vol.Required("fan_speed_targets"): {
+            vol.Required("humidity"): _FAN_SPEED,
+            vol.Required("light"): _FAN_SPEED,
+            vol.Required("base"): _FAN_SPEED,
+        },
+        vol.Required("fan_sensitivity"): {
+            vol.Required("humidity"): _SENSITIVITY,
+            vol.Required("light"): _SENSITIVITY,
+        },
+        # 0 when the fan has no boost fan speed set
+        vol.Required("boost"): {
+            vol.Required("fan_speed_target"): vol.Any(0, _FAN_SPEED),
+        },
+        vol.Optional("device"): dict,
+    }
+)
+
+
+def config_to_snapshot(
+    config: PaxConfig, device: PaxDevice | None = None
+) -> dict[str, Any]:
+    snapshot: dict[str, Any] = {
+        "version": SNAPSHOT_VERSION,
+        "fan_speed_targets": {
+            "humidity": config.fan_speed_targets.humidity,
+            "light": config.fan_speed_targets.light,
+            "base": config.fan_speed_targets.base,
+        },
+        "fan_sensitivity": {
+            "humidity": config.fan_sensitivity.humidity.name.lower(),
+            "light": config.fan_sensitivity.light.name.lower(),
+        },
+        # Whether a boost runs is state, not configuration
+        "boost": {"fan_speed_target": config.boost.fan_speed_target},
+    }
+    if device is not None:
+        snapshot["device"] = {
+            "model_number": device.model_number,
+            "sw_version": device.sw_version,
+        }
+    return snapshot
+
+
+def snapshot_to_config(snapshot: dict[str, Any]) -> PaxConfig:
+    """Parse a snapshot, raising ValueError if it can not be used.
+
+    Only the fan speed target of the returned boost is meant to be applied.
+    """
+    version = snapshot.get("version")
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version: {version}")
+
+    try:
+        snapshot = SNAPSHOT_SCHEMA(snapshot)
+    except vol.Invalid as err:
+        raise ValueError(f"Invalid snapshot: {err}") from err
+    targets = snapshot["fan_speed_targets"]
+    sensitivity = snapshot["fan_sensitivity"]
+    return PaxConfig(
+        FanSpeedTarget(targets["humidity"], targets["light"], targets["base"]),
+        FanSensitivitySetting(
+            FanSensitivity[sensitivity["humidity"].upper()],
+            FanSensitivity[sensitivity["light"].upper()],
+        ),
+        Boost(False, snapshot["boost"]["fan_speed_target"], 0),
+    )
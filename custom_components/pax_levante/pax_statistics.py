@@ -0,0 +1,129 @@
+"""Streaming statistics over Pax sensor samples."""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+import math
+
+# PaxSensors fields that are aggregated between publications
+SAMPLED_FIELDS = ("humidity", "temperature", "light", "fan_speed")
+
+
+@dataclass(frozen=True, slots=True)
+class WindowStatistics:
+    minimum: float
+    mean: float
+    maximum: float
+    samples: int
+
+
+class SampleWindow:
+    """Running min/mean/max of the values added since the last reset."""
+
+    __slots__ = ("count", "total", "minimum", "maximum")
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        if value < self.minimum:
+            self.minimum = value
+        if value > self.maximum:
+            self.maximum = value
+
+    def statistics(self) -> WindowStatistics | None:
+        if not self.count:
+            return None
+        return WindowStatistics(
+            self.minimum, round(self.total / self.count, 1), self.maximum, self.count
+        )
+
+
+class SensorWindows:
+    """One SampleWindow per sampled PaxSensors field."""
+
+    def __init__(self):
+        self._windows = {key: SampleWindow() for key in SAMPLED_FIELDS}
+
+    def add(self, sensors) -> None:
+        for key, window in self._windows.items():
+            window.add(getattr(sensors, key))
+
+    def collect(self) -> dict[str, WindowStatistics]:
+        """Return the statistics of every window and start new ones."""
+        collected = {}
+        for key, window in self._windows.items():
+            if (statistics := window.statistics()) is not None:
+                collected[key] = statistics
+            window.reset()
+        return collected
+
+
+class RateEstimator:
+    """Least squares slope of the samples in a sliding time window.
+
+    Running sums are kept for the samples in the window, so adding a sample
+    and reading the slope are O(1) apart from evicting expired samples.
+    Times are kept relative to an origin that is moved forward now and then
+    so the sums do not lose precision as time grows.
+    """
+
+    def __init__(self, window_seconds: float):
+        self.window_seconds = window_seconds
+        self._samples: deque[tuple[float, float]] = deque()
+        self._origin: float | None = None
+        self._sum_t = 0.0
+        self._sum_y = 0.0
+        self._sum_tt = 0.0
+        self._sum_ty = 0.0
+
+    def add(self, timestamp: float, value: float) -> None:
+        if self._origin is None:
+            self._origin = timestamp
+        t = timestamp - self._origin
+        self._samples.append((t, value))
+        self._sum_t += t
+        self._sum_y += value
+        self._sum_tt += t * t
+        self._sum_ty += t * value
+
+        while self._samples and t - self._samples[0][0] > self.window_seconds:
+            old_t, old_value = self._samples.popleft()
+            self._sum_t -= old_t
+            self._sum_y -= old_value
+            self._sum_tt -= old_t * old_t
+            self._sum_ty -= old_t * old_value
+
+        if self._samples[0][0] > 4 * self.window_seconds:
+            self._rebase()
+
+    def _rebase(self) -> None:
+        shift = self._samples[0][0]
+        self._origin += shift
+        self._samples = deque((t - shift, value) for t, value in self._samples)
+        self._sum_t = sum(t for t, _ in self._samples)
+        self._sum_y = sum(value for _, value in self._samples)
+        self._sum_tt = sum(t * t for t, _ in self._samples)
+        self._sum_ty = sum(t * value for t, value in self._samples)
+
+    @property
+    def rate(self) -> float | None:
+        """Change per second, or None until the samples span a tenth of the window."""
+        count = len(self._samples)
+        if count < 2:
+            return None
+        if self._samples[-1][0] - self._samples[0][0] < self.window_seconds / 10:
+            return None
+        denominator = count * self._sum_tt - self._sum_t * self._sum_t
+        if denominator <= 0:
+            return None
+        return (count * self._sum_ty - self._sum_t * self._sum_y) / denominator
@@ -1,115 +1,856 @@
-import copy
-from datetime import timedelta
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Mapping
+from contextlib import asynccontextmanager, nullcontext
+import dataclasses
+from datetime import datetime, timedelta
 import logging
+import os
+import time
+from typing import Any, TypeVar
 
 import async_timeout
-from homeassistant.components import bluetooth
+from homeassistant.components import bluetooth, persistent_notification
+from homeassistant.core import callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.device_registry import (
+    CONNECTION_BLUETOOTH,
+    DeviceInfo,
+    format_mac,
+)
+from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN
-from .pax_client import FanSpeedTarget, PaxClient, PaxDevice, PaxSensors
+from .const import (
+    CONF_CAPTURE,
+    CONF_CONNECT_ATTEMPTS,
+    CONF_CONNECTION_MODE,
+    CONF_POLL_INTERVAL,
+    CONF_RECOVERY_POLLS,
+    CONF_RISE_RATE_THRESHOLD,
+    CONF_RISE_RATE_WINDOW,
+    CONF_SAMPLE_INTERVAL,
+    CONF_SAMPLE_STATISTICS,
+    CONF_STALE_POLLS,
+    CONF_STALE_SECONDS,
+    CONF_UPDATE_TIMEOUT,
+    CONF_WRITE_TIMEOUT,
+    CONNECTION_MODE_PERSISTENT,
+    DEFAULT_CONNECT_ATTEMPTS,
+    DEFAULT_CONNECTION_MODE,
+    DEFAULT_POLL_INTERVAL,
+    DEFAULT_RECOVERY_POLLS,
+    DEFAULT_RISE_RATE_THRESHOLD,
+    DEFAULT_RISE_RATE_WINDOW,
+    DEFAULT_SAMPLE_INTERVAL,
+    DEFAULT_STALE_POLLS,
+    DEFAULT_STALE_SECONDS,
+    DEFAULT_UPDATE_TIMEOUT,
+    DEFAULT_WRITE_TIMEOUT,
+    DOMAIN,
+    EVENT_TRIGGER_CHANGED,
+    REFRESH_SENSORS_TIMEOUT,
+    REFRESH_SENSORS_WINDOW,
+)
+from .pax_airtime import AirtimeMeter
+from .pax_capture import PaxCaptureWriter
+from .pax_client import (
+    CurrentTrigger,
+    FanSpeedTarget,
+    PaxClient,
+    PaxConfig,
+    PaxDecodeError,
+    PaxDevice,
+    PaxSensors,
+    PaxTransactionError,
+    boost_request,
+)
+from .pax_metrics import FanMetrics
+from .pax_operation_queue import (
+    PRIORITY_POLL,
+    PRIORITY_REFRESH,
+    PRIORITY_WRITE,
+    PaxOperationQueue,
+)
+from .pax_profiler import UpdateProfiler
+from .pax_statistics import (
+    SAMPLED_FIELDS,
+    RateEstimator,
+    SensorWindows,
+    WindowStatistics,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+
+
+def _write_report(path: str, report: str) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(report)
+
 
 class PaxUpdateCoordinator(DataUpdateCoordinator):
-    def __init__(self, hass, address, pin):
+    def __init__(self, hass, address, pin, options: Mapping[str, Any] | None = None):
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(seconds=65),
+            update_interval=timedelta(seconds=DEFAULT_POLL_INTERVAL),
         )
         self.address = address
+        # Configured poll interval, update_interval is stretched from it to
+        # stay within the airtime budget (see pax_airtime)
+        self.poll_interval = timedelta(seconds=DEFAULT_POLL_INTERVAL)
+        self.airtime_stretch = 1.0
+        self.airtime = AirtimeMeter()
         self.device_info: PaxDevice | None = None
         self.sensors: PaxSensors | None = None
+        # time.monotonic() of the last sensor reading
+        self._sensors_read_at: float | None = None
+        self._sensors_refresh: asyncio.Task | None = None
         self.fan_speed_targets: FanSpeedTarget | None = None
         self.pin = pin
+        self.update_timeout = DEFAULT_UPDATE_TIMEOUT
+        self.write_timeout = DEFAULT_WRITE_TIMEOUT
+        self.connection_mode = DEFAULT_CONNECTION_MODE
+        self.connect_attempts = DEFAULT_CONNECT_ATTEMPTS
+        self.sample_interval: timedelta | None = None
+        self.sample_statistics = False
+        # Aggregates of the samples taken in the last publish interval
+        self.statistics: dict[str, WindowStatistics] = {}
+        self._windows = SensorWindows()
+        self._humidity_rate = RateEstimator(DEFAULT_RISE_RATE_WINDOW)
+        self.rise_rate_threshold = DEFAULT_RISE_RATE_THRESHOLD
+        self._unsub_sample = None
         self._last_update_failed = False
+        self.stale_polls = DEFAULT_STALE_POLLS
+        self.stale_seconds = DEFAULT_STALE_SECONDS
+        self.recovery_polls = DEFAULT_RECOVERY_POLLS
+        # Set while the last good data is served in place of failed polls
+        self.stale_since: datetime | None = None
+        self._failed_polls = 0
+        self._successful_polls = 0
+        self._last_good_poll: datetime | None = None
+        self._queue = PaxOperationQueue(f"{DOMAIN} {address}")
+        self._client: PaxClient | None = None
+        self._capture: PaxCaptureWriter | None = None
+        # Stand-in for BleakClient used instead of connecting to the fan, set
+        # when replaying a capture (see pax_capture.async_replay)
+        self.backend = None
+        self._entity_device_info: DeviceInfo | None = None
+        self._unsub_advertisement = None
+        # Operation counters exported by pax_metrics.PaxMetricsView
+        self.metrics = FanMetrics()
+        self._profiler: UpdateProfiler | None = None
+        self.async_apply_options(options or {})
+
+    def async_apply_options(self, options: Mapping[str, Any]) -> None:
+        """Apply entry options to the running coordinator."""
+        self.update_timeout = options.get(CONF_UPDATE_TIMEOUT, DEFAULT_UPDATE_TIMEOUT)
+        self.write_timeout = options.get(CONF_WRITE_TIMEOUT, DEFAULT_WRITE_TIMEOUT)
+        self.connection_mode = options.get(
+            CONF_CONNECTION_MODE, DEFAULT_CONNECTION_MODE
+        )
+        self.connect_attempts = options.get(
+            CONF_CONNECT_ATTEMPTS, DEFAULT_CONNECT_ATTEMPTS
+        )
+        self.stale_polls = options.get(CONF_STALE_POLLS, DEFAULT_STALE_POLLS)
+        self.stale_seconds = options.get(CONF_STALE_SECONDS, DEFAULT_STALE_SECONDS)
+        self.recovery_polls = options.get(CONF_RECOVERY_POLLS, DEFAULT_RECOVERY_POLLS)
+
+        self.poll_interval = timedelta(
+            seconds=options.get(CONF_POLL_INTERVAL, DEFAULT_POLL_INTERVAL)
+        )
+        self._async_set_update_interval()
+
+        self.sample_statistics = options.get(CONF_SAMPLE_STATISTICS, False)
+        self._humidity_rate.window_seconds = options.get(
+            CONF_RISE_RATE_WINDOW, DEFAULT_RISE_RATE_WINDOW
+        )
+        self.rise_rate_threshold = options.get(
+            CONF_RISE_RATE_THRESHOLD, DEFAULT_RISE_RATE_THRESHOLD
+        )
+        sample_seconds = options.get(CONF_SAMPLE_INTERVAL, DEFAULT_SAMPLE_INTERVAL)
+        sample_interval = (
+            timedelta(seconds=sample_seconds)
+            if 0 < sample_seconds < self.poll_interval.total_seconds()
+            else None
+        )
+        if sample_interval != self.sample_interval:
+            self.sample_interval = sample_interval
+            self._async_unsub_sample()
+            if sample_interval is not None:
+                self._unsub_sample = async_track_time_interval(
+                    self.hass,
+                    self._async_handle_sample_interval,
+                    sample_interval,
+                    name=f"{DOMAIN} {self.address} sample",
+                )
+
+        if options.get(CONF_CAPTURE, False):
+            if self._capture is None:
+                self._capture = PaxCaptureWriter(self.capture_path)
+                _LOGGER.info("Capturing GATT traffic to %s", self.capture_path)
+        else:
+            self._capture = None
+
+        if self.connection_mode != CONNECTION_MODE_PERSISTENT and self._client:
+            self.hass.async_create_task(
+                self._queue.async_run(self._async_close_client, priority=PRIORITY_WRITE)
+            )
+
+        _LOGGER.debug(
+            "Options for %s: interval=%s, sample=%s, timeouts=%s/%s, mode=%s, "
+            "attempts=%s",
+            self.address,
+            self.update_interval,
+            self.sample_interval,
+            self.update_timeout,
+            self.write_timeout,
+            self.connection_mode,
+            self.connect_attempts,
+        )
+
+    @callback
+    def async_set_airtime_stretch(self, stretch: float) -> None:
+        """Poll ``stretch`` times less often than configured."""
+        if stretch == self.airtime_stretch:
+            return
+        _LOGGER.info(
+            "Stretching poll interval of %s %.1f times to stay within the airtime "
+            "budget",
+            self.address,
+            stretch,
+        )
+        self.airtime_stretch = stretch
+        self._async_set_update_interval()
+
+    @callback
+    def _async_set_update_interval(self) -> None:
+        update_interval = timedelta(
+            seconds=round(self.poll_interval.total_seconds() * self.airtime_stretch)
+        )
+        if update_interval == self.update_interval:
+            return
+        self.update_interval = update_interval
+        if self._unsub_refresh is not None:
+            self._schedule_refresh()
+
+    @property
+    def sampling(self) -> bool:
+        """Whether sensors are sampled between polls."""
+        # Polls stretched to save airtime are not sampled in between
+        return self.sample_interval is not None and self.airtime_stretch <= 1
+
+    @property
+    def triggered(self) -> bool:
+        """Whether the fan runs for humidity, light or boost."""
+        return self.sensors is not None and self.sensors.current_trigger in (
+            CurrentTrigger.HUMIDITY,
+            CurrentTrigger.LIGHT,
+            CurrentTrigger.BOOST,
+        )
+
+    @property
+    def entity_device_info(self) -> DeviceInfo:
+        """DeviceInfo shared by all entities of this fan."""
+        if self._entity_device_info is None:
+            device_info = self.device_info
+            if device_info is None:
+                # Not connected yet, see _async_update_device_registry
+                self._entity_device_info = DeviceInfo(
+                    connections={(CONNECTION_BLUETOOTH, self.address)},
+                    name="Pax Levante",
+                )
+                return self._entity_device_info
+            self._entity_device_info = DeviceInfo(
+                connections={(CONNECTION_BLUETOOTH, self.address)},
+                manufacturer=device_info.manufacturer,
+                model=f"{device_info.name} {device_info.model_number}",
+                name=device_info.name,
+                sw_version=device_info.sw_version,
+                hw_version=device_info.hw_version,
+            )
+        return self._entity_device_info
+
+    @callback
+    def _async_update_device_registry(self) -> None:
+        """Fill in a device registered before the device info was read."""
+        self._entity_device_info = None
+        device_info = self.entity_device_info
+        registry = dr.async_get(self.hass)
+        device = registry.async_get_device(
+            connections={(CONNECTION_BLUETOOTH, self.address)}
+        )
+        if device is not None:
+            registry.async_update_device(
+                device.id,
+                manufacturer=device_info["manufacturer"],
+                model=device_info["model"],
+                sw_version=device_info["sw_version"],
+                hw_version=device_info["hw_version"],
+            )
+
+    @callback
+    def async_refresh_when_seen(self) -> None:
+        """Refresh as soon as the fan sends a connectable advertisement."""
+        self._async_unsub_advertisement()
+        self._unsub_advertisement = bluetooth.async_register_callback(
+            self.hass,
+            self._async_handle_advertisement,
+            bluetooth.BluetoothCallbackMatcher(address=self.address, connectable=True),
+            bluetooth.BluetoothScanningMode.ACTIVE,
+        )
+
+    @callback
+    def _async_handle_advertisement(
+        self,
+        service_info: bluetooth.BluetoothServiceInfoBleak,
+        change: bluetooth.BluetoothChange,
+    ) -> None:
+        _LOGGER.debug("%s advertised, starting first refresh", self.address)
+        self._async_unsub_advertisement()
+        self.hass.async_create_task(self._async_first_refresh())
+
+    async def _async_first_refresh(self) -> None:
+        await self.async_refresh()
+        if self.data is None and not self._shutdown_requested:
+            self.async_refresh_when_seen()
+
+    @callback
+    def _async_unsub_advertisement(self) -> None:
+        if self._unsub_advertisement is not None:
+            self._unsub_advertisement()
+            self._unsub_advertisement = None
+
+    @property
+    def capture_path(self) -> str:
+        mac = format_mac(self.address).replace(":", "")
+        return self.hass.config.path(DOMAIN, f"{mac}.paxcap")
+
+    async def async_shutdown(self) -> None:
+        """Cancel timers and queued operations and disconnect from the fan."""
+        await super().async_shutdown()
+        self._async_unsub_sample()
+        self._async_unsub_advertisement()
+        if self._profiler is not None:
+            self._profiler.stop_lag_probe()
+            self._profiler = None
+        await self._queue.async_shutdown()
+        await self._async_close_client()
+
+    @asynccontextmanager
+    async def _async_session(self) -> AsyncIterator[PaxClient]:
+        """Yield a connected client, metering the airtime it takes."""
+        start = time.monotonic()
+        client: PaxClient | None = None
+        operations = 0
+        try:
+            async with self._async_client_session() as client:
+                operations = client.gatt_operations
+                yield client
+        finally:
+            # Time spent on failed connects holds a proxy slot as well. An
+            # idle persistent connection is not metered.
+            self.airtime.add_session(
+                time.monotonic() - start,
+                0 if client is None else client.gatt_operations - operations,
+            )
+
+    @asynccontextmanager
+    async def _async_client_session(self) -> AsyncIterator[PaxClient]:
+        """Yield a connected client, reusing the open one in persistent mode."""
+        client = self._client
+        if self.backend is not None:
+            client = PaxClient(None, backend=self.backend, profiled=self._profiled)
+            with self.metrics.measure("connect"):
+                await client.async_connect()
+        elif client is None or not client.is_connected:
+            self._client = None
+            ble_device = bluetooth.async_ble_device_from_address(
+                self.hass, self.address
+            )
+            if not ble_device:
+                raise UpdateFailed(f"Could not find device {self.address}")
+            use_cache = not self._last_update_failed
+            if not use_cache:
+                _LOGGER.debug("Previous update failed, disabling services cache")
+            client = PaxClient(
+                ble_device,
+                use_services_cache=use_cache,
+                max_attempts=self.connect_attempts,
+                recorder=self._capture,
+                profiled=self._profiled,
+            )
+            with self.metrics.measure("connect"):
+                await client.async_connect()
+            _LOGGER.debug("Connected to device")
+
+        try:
+            try:
+                yield client
+            except BaseException:
+                self._client = None
+                await client.async_disconnect()
+                raise
+
+            if (
+                self.connection_mode == CONNECTION_MODE_PERSISTENT
+                and self.backend is None
+            ):
+                self._client = client
+            else:
+                self._client = None
+                await client.async_disconnect()
+        finally:
+            if self._capture is not None:
+                await self.hass.async_add_executor_job(self._capture.flush)
+
+    @callback
+    def _async_unsub_sample(self) -> None:
+        if self._unsub_sample is not None:
+            self._unsub_sample()
+            self._unsub_sample = None
+
+    @callback
+    def _async_handle_sample_interval(self, _now) -> None:
+        if not self.sampling:
+            return
+        self.hass.async_create_background_task(
+            self._queue.async_run(
+                self._async_sample,
+                priority=PRIORITY_POLL,
+                preemptible=True,
+                collapse_key="sample",
+            ),
+            f"{DOMAIN} {self.address} sample",
+        )
+
+    async def _async_sample(self) -> None:
+        try:
+            async with async_timeout.timeout(self.update_timeout):
+                async with self._async_session() as client:
+                    sensors = await client.async_get_sensors()
+        except asyncio.CancelledError:
+            raise
+        except Exception as err:  # noqa: BLE001
+            # The next poll reports failures, a missed sample only thins out
+            # the window.
+            _LOGGER.debug("Sampling %s failed: %s", self.address, err)
+            return
+        # Added once the session is over, a preempted sample is taken again
+        self.async_add_sample(sensors)
+
+    async def async_refresh_sensors(self) -> PaxSensors:
+        """Read and publish only the sensors, ahead of queued polls.
+
+        The reading is only published once a poll has succeeded, and does not
+        postpone the next poll. Calls made while a refresh is in flight, or within
+        REFRESH_SENSORS_WINDOW seconds of the last reading, share that reading.
+        """
+        if self._sensors_refresh is None:
+            if (
+                self.sensors is not None
+                and self._sensors_read_at is not None
+                and time.monotonic() - self._sensors_read_at < REFRESH_SENSORS_WINDOW
+            ):
+                return self.sensors
+            self._sensors_refresh = self.hass.async_create_task(
+                self._queue.async_run(
+                    self._async_read_sensors,
+                    priority=PRIORITY_REFRESH,
+                    collapse_key="refresh_sensors",
+                ),
+                f"{DOMAIN} {self.address} refresh sensors",
+            )
+            self._sensors_refresh.add_done_callback(self._async_refresh_done)
+        return await asyncio.shield(self._sensors_refresh)
+
+    @callback
+    def _async_refresh_done(self, task: asyncio.Task) -> None:
+        if self._sensors_refresh is task:
+            self._sensors_refresh = None
+
+    async def _async_read_sensors(self) -> PaxSensors:
+        try:
+            async with async_timeout.timeout(REFRESH_SENSORS_TIMEOUT):
+                async with self._async_session() as client:
+                    sensors = await client.async_get_sensors()
+        except asyncio.CancelledError:
+            raise
+        except Exception as err:
+            _LOGGER.debug("Refreshing sensors of %s failed: %s", self.address, err)
+            failed = UpdateFailed(f"Unable to read sensors: {err}")
+            # Counted like a failed poll, so that a refresh neither hides an
+            # outage nor ends the grace period early
+            if self.data is not None:
+                if self._count_failure():
+                    self.async_update_listeners()
+                else:
+                    self.async_set_update_error(failed)
+            raise failed from err
+        self.async_add_sample(sensors)
+        # Nothing is published before a poll has read the fan speed targets
+        # and device info, and while the fan recovers the reading is returned
+        # to the caller alone
+        if self.data is not None and self._count_success():
+            self.last_update_success = True
+            self._async_publish()
+        return sensors
+
+    @callback
+    def _async_publish(self) -> None:
+        """Publish the sensor window between polls.
+
+        Unlike async_set_updated_data this keeps the next poll due. Nothing is
+        published before a poll has read the fan speed targets and device info.
+        """
+        if self.data is not None:
+            self.data = self._publish_sensors()
+        self.async_update_listeners()
+
+    @callback
+    def async_add_sample(self, sensors: PaxSensors) -> None:
+        """Add a sensor reading to the current publish window."""
+        previous, self.sensors = self.sensors, sensors
+        self._sensors_read_at = time.monotonic()
+        if previous is not None and previous.current_trigger != sensors.current_trigger:
+            self.airtime.add_trigger_change()
+            self._async_fire_trigger_changed(previous, sensors)
+        self._windows.add(sensors)
+        self._humidity_rate.add(time.monotonic(), sensors.humidity)
+
+    @callback
+    def _async_fire_trigger_changed(
+        self, previous: PaxSensors, sensors: PaxSensors
+    ) -> None:
+        device = dr.async_get(self.hass).async_get_device(
+            connections={(CONNECTION_BLUETOOTH, self.address)}
+        )
+        _LOGGER.debug(
+            "Trigger of %s changed from %s to %s",
+            self.address,
+            previous.current_trigger,
+            sensors.current_trigger,
+        )
+        self.hass.bus.async_fire(
+            EVENT_TRIGGER_CHANGED,
+            {
+                "device_id": device.id if device else None,
+                "address": self.address,
+                "old_trigger": previous.current_trigger.name.lower(),
+                "new_trigger": sensors.current_trigger.name.lower(),
+                "old_boost": previous.boost,
+                "new_boost": sensors.boost,
+                "timestamp": dt_util.utcnow().isoformat(),
+            },
+        )
+
+    @property
+    def humidity_rise_rate(self) -> float | None:
+        """Humidity change in %/min over the rise rate window."""
+        rate = self._humidity_rate.rate
+        return None if rate is None else round(rate * 60, 2)
+
+    @property
+    def humidity_trigger_expected(self) -> bool | None:
+        """Whether humidity rises fast enough that a humidity trigger is near."""
+        rate = self.humidity_rise_rate
+        if rate is None or self.sensors is None:
+            return None
+        return (
+            rate >= self.rise_rate_threshold
+            and self.sensors.current_trigger
+            not in (
+                CurrentTrigger.HUMIDITY,
+                CurrentTrigger.BOOST,
+            )
+        )
+
+    def _publish_sensors(self) -> PaxSensors:
+        """Aggregate the current window into the state to publish."""
+        self.statistics = self._windows.collect()
+        if self.sample_interval is None:
+            return self.sensors
+        return dataclasses.replace(
+            self.sensors,
+            **{
+                key: self.statistics[key].mean
+                for key in SAMPLED_FIELDS
+                if key in self.statistics
+            },
+        )
+
+    async def _async_close_client(self) -> None:
+        client, self._client = self._client, None
+        if client is not None:
+            await client.async_disconnect()
+
+    @property
+    def profiling(self) -> bool:
+        return self._profiler is not None
+
+    @callback
+    def async_start_profile(self, cycles: int, use_cprofile: bool = False) -> None:
+        """Profile the next update cycles, reporting when they are done."""
+        self._profiler = UpdateProfiler(cycles, use_cprofile)
+        self._profiler.start_lag_probe(self.hass.loop)
+
+    def _lap(self, phase: str) -> None:
+        if self._profiler is not None:
+            self._profiler.lap(phase)
+
+    def _profiled(self):
+        if self._profiler is None:
+            return nullcontext()
+        return self._profiler.profiled()
+
+    async def _async_refresh(self, *args, **kwargs) -> None:
+        profiler = self._profiler
+        if profiler is None:
+            await super()._async_refresh(*args, **kwargs)
+            return
+
+        profiler.start_cycle()
+        try:
+            await super()._async_refresh(*args, **kwargs)
+        finally:
+            profiler.end_cycle()
+        if profiler.done and self._profiler is profiler:
+            self._profiler = None
+            profiler.stop_lag_probe()
+            self.hass.async_create_task(self._async_write_profile(profiler))
+
+    @callback
+    def async_update_listeners(self) -> None:
+        self._lap("coordinator")
+        with self._profiled():
+            super().async_update_listeners()
+        self._lap("update_entities")
+
+    async def _async_write_profile(self, profiler: UpdateProfiler) -> None:
+        mac = format_mac(self.address).replace(":", "")
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(profiler.started))
+        path = self.hass.config.path(DOMAIN, f"{mac}-profile-{stamp}.txt")
+        title = f"Pax Levante {self.address} update profile"
+        await self.hass.async_add_executor_job(
+            _write_report, path, profiler.report(title)
+        )
+        _LOGGER.info("Wrote update profile of %s to %s", self.address, path)
+        persistent_notification.async_create(
+            self.hass,
+            f"{profiler.summary()}\n\nFull report: `{path}`",
+            title=title,
+            notification_id=f"{DOMAIN}_profile_{mac}",
+        )
+
+    async def _async_measure(self, operation: str, coro: Awaitable[_T]) -> _T:
+        with self.metrics.measure(operation):
+            return await coro
 
     async def _async_update_data(self):
         try:
-            async with async_timeout.timeout(10):
+            data = await self._queue.async_run(
+                lambda: self._async_measure("poll", self._async_poll()),
+                priority=PRIORITY_POLL,
+                preemptible=True,
+                collapse_key="poll",
+            )
+        except UpdateFailed:
+            if not self._count_failure():
+                raise
+            return self.data
+
+        if not self._count_success():
+            raise UpdateFailed(
+                f"{self._successful_polls} of {self.recovery_polls} polls "
+                "needed to recover succeeded"
+            )
+        return data
+
+    def _count_failure(self) -> bool:
+        """Count a failed read of the fan, polled or refreshed.
+
+        Returns whether the last good data is still served in its place.
+        """
+        self._failed_polls += 1
+        self._successful_polls = 0
+        if not self._serve_stale():
+            self.stale_since = None
+            return False
+        if self.stale_since is None:
+            self.stale_since = self._last_good_poll
+        _LOGGER.debug(
+            "Read %s of %s failed, keeping data from %s",
+            self._failed_polls,
+            self.address,
+            self.stale_since,
+        )
+        return True
+
+    def _count_success(self) -> bool:
+        """Count a good read of the fan, returning whether it is available."""
+        self._successful_polls += 1
+        if (
+            not self.last_update_success
+            and self._successful_polls < self.recovery_polls
+        ):
+            return False
+        self._failed_polls = 0
+        self._last_good_poll = dt_util.utcnow()
+        self.stale_since = None
+        return True
+
+    def _serve_stale(self) -> bool:
+        """Whether a failed poll is still within the grace period."""
+        if self._last_good_poll is None or not self.last_update_success:
+            return False
+        if self.stale_polls and self._failed_polls <= self.stale_polls:
+            return True
+        age = dt_util.utcnow() - self._last_good_poll
+        return bool(self.stale_seconds and age.total_seconds() <= self.stale_seconds)
+
+    async def _async_poll(self):
+        self._lap("queue_wait")
+        try:
+            async with async_timeout.timeout(self.update_timeout):
                 _LOGGER.debug("Updating data for %s", self.address)
-                ble_device = bluetooth.async_ble_device_from_address(
-                    self.hass, self.address
-                )
-                if not ble_device:
-                    raise UpdateFailed(
-                        f"Could not find device {self.address}"
-                    )
-                use_cache = not self._last_update_failed
-                if not use_cache:
-                    _LOGGER.debug(
-                        "Previous update failed, disabling services cache"
-                    )
-                async with PaxClient(
-                    ble_device, use_services_cache=use_cache
-                ) as client:
-                    _LOGGER.debug("Connected to device")
+                async with self._async_session() as client:
+                    self._lap("connect")
                     if self.device_info is None:
                         await client.async_log_services()
                         self.device_info = await client.async_get_device_info()
                         _LOGGER.debug("Fetched device info: %s", self.device_info)
+                        if self._entity_device_info is not None:
+                            self._async_update_device_registry()
+                        self._lap("device_info")
 
-                    self.sensors = await client.async_get_sensors()
-                    _LOGGER.debug("Fetched sensors: %s", self.sensors)
+                    sensors = await client.async_get_sensors()
+                    self._lap("read_sensors")
+                    _LOGGER.debug("Fetched sensors: %s", sensors)
                     self.fan_speed_targets = await client.async_get_fan_speed_targets()
                     _LOGGER.debug(
                         "Fetched fan speed targets: %s", self.fan_speed_targets
                     )
+                    self._lap("read_fan_speed_targets")
                 self._last_update_failed = False
+                self._lap("disconnect")
+        except asyncio.CancelledError:
+            _LOGGER.debug("Update of %s cancelled", self.address)
+            raise
+        except PaxDecodeError as err:
+            # The connection worked, keep using the services cache
+            _LOGGER.warning("Pax sensor update error: %s", err)
+            raise UpdateFailed(f"Unable to decode data: {err}") from err
         except Exception as err:
             self._last_update_failed = True
-            _LOGGER.warn("Pax sensor update error: %s", err)
+            _LOGGER.warning("Pax sensor update error: %s", err)
             raise UpdateFailed(f"Unable to fetch data: {err}") from err
         _LOGGER.debug("Data updated")
-        return self.sensors
+        # Added once the poll completed, so a preempted poll that runs again
+        # adds its reading only once
+        with self._profiled():
+            self.async_add_sample(sensors)
+        self._lap("process_sensors")
+        with self._profiled():
+            data = self._publish_sensors()
+        self._lap("publish")
+        return data
 
     async def async_set_fan_speed_target(self, key: str, value: int):
+        return await self._queue.async_run(
+            lambda: self._async_measure(
+                "write", self._async_write_fan_speed_target(key, value)
+            ),
+            priority=PRIORITY_WRITE,
+        )
+
+    async def _async_write_fan_speed_target(self, key: str, value: int):
         if self.pin == 0:
             raise UpdateFailed(f"Pin not set, unable to update fan speed targets")
-        targets = copy.deepcopy(self.fan_speed_targets)
-        if targets is None:
+        if self.fan_speed_targets is None:
             raise UpdateFailed(
                 f"Unable to set fan speed targets, current target not available"
             )
 
-        setattr(targets, key, value)
-        async with async_timeout.timeout(10):
+        targets = dataclasses.replace(self.fan_speed_targets, **{key: value})
+        async with async_timeout.timeout(self.write_timeout):
             _LOGGER.debug("Setting fan speed targets: %s", targets)
-            ble_device = bluetooth.async_ble_device_from_address(
-                self.hass, self.address
-            )
-            if not ble_device:
-                raise UpdateFailed(f"Could not find device {self.address}")
-            async with PaxClient(
-                ble_device, use_services_cache=not self._last_update_failed
-            ) as client:
-                if not await client.async_set_pin(self.pin):
-                    raise UpdateFailed(f"Unable to set pin.")
-                await client.async_set_fan_speed_targets(targets)
-                self.fan_speed_targets = await client.async_get_fan_speed_targets()
-                self.fan_speed_targets = targets
-                self.async_set_updated_data(self.sensors)
-                return self.sensors
+            async with self._async_session() as client:
+                await self._async_transaction(
+                    client.async_write_transaction(
+                        {"fan_speed_targets": targets}, self.pin, verify=True
+                    )
+                )
+        self.fan_speed_targets = targets
+        self.async_update_listeners()
+        return self.sensors
 
     async def async_set_boost(self, value):
+        return await self._queue.async_run(
+            lambda: self._async_measure("write", self._async_write_boost(value)),
+            priority=PRIORITY_WRITE,
+        )
+
+    async def _async_write_boost(self, value):
         if self.pin == 0:
             raise UpdateFailed(f"Pin not set, unable to update fan speed targets")
-        async with async_timeout.timeout(10):
+        async with async_timeout.timeout(self.write_timeout):
             _LOGGER.debug("Setting boost: %s", value)
-            ble_device = bluetooth.async_ble_device_from_address(
-                self.hass, self.address
-            )
-            if not ble_device:
-                raise UpdateFailed(f"Could not find device {self.address}")
-            async with PaxClient(
-                ble_device, use_services_cache=not self._last_update_failed
-            ) as client:
-                if not await client.async_set_pin(self.pin):
-                    raise UpdateFailed(f"Unable to set pin.")
-                await client.async_set_boost(value)
-                self.sensors = await client.async_get_sensors()
-                self.async_set_updated_data(self.sensors)
-                return self.sensors
+            async with self._async_session() as client:
+                # The sensors read afterwards show whether the boost took
+                await self._async_transaction(
+                    client.async_write_transaction(
+                        {"boost": boost_request(value)}, self.pin
+                    )
+                )
+                sensors = await client.async_get_sensors()
+        self.async_add_sample(sensors)
+        self._async_publish()
+        return self.sensors
+
+    async def _async_transaction(self, transaction: Awaitable[list[str]]) -> list[str]:
+        try:
+            return await transaction
+        except PaxTransactionError as err:
+            _LOGGER.warning("Writing to %s failed: %s", self.address, err)
+            raise UpdateFailed(str(err)) from err
+
+    async def async_get_config(self) -> PaxConfig:
+        """Read the complete configuration of the fan in one connection."""
+        return await self._queue.async_run(
+            self._async_read_config, priority=PRIORITY_WRITE
+        )
+
+    async def _async_read_config(self) -> PaxConfig:
+        async with async_timeout.timeout(self.write_timeout):
+            async with self._async_session() as client:
+                config = await client.async_get_config()
+        self.fan_speed_targets = config.fan_speed_targets
+        return config
+
+    async def async_apply_config(self, config: PaxConfig) -> list[str]:
+        """Write the parts of config that differ, in one authenticated connection."""
+        return await self._queue.async_run(
+            lambda: self._async_measure("write", self._async_write_config(config)),
+            priority=PRIORITY_WRITE,
+        )
+
+    async def _async_write_config(self, config: PaxConfig) -> list[str]:
+        if self.pin == 0:
+            raise UpdateFailed("Pin not set, unable to apply configuration")
+        async with async_timeout.timeout(self.write_timeout):
+            _LOGGER.debug("Applying configuration: %s", config)
+            async with self._async_session() as client:
+                written = await self._async_transaction(
+                    client.async_apply_config(config, pin=self.pin, verify=True)
+                )
+                if not written:
+                    return []
+                self.fan_speed_targets = config.fan_speed_targets
+                sensors = await client.async_get_sensors()
+        self.async_add_sample(sensors)
+        self._async_publish()
+        return written
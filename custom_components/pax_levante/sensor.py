@@ -2,14 +2,9 @@
 
 from __future__ import annotations
 
-from dataclasses import asdict
-from datetime import timedelta
 import logging
+from typing import Any
 
-# import SensorEntityDescription
-import async_timeout
-from homeassistant.components import bluetooth
-from homeassistant.components.fan import FanEntity
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
@@ -17,24 +12,19 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import REVOLUTIONS_PER_MINUTE
-from homeassistant.core import HomeAssistant, callback
-from homeassistant.exceptions import ConfigEntryNotReady
-from homeassistant.helpers.device_registry import (
-    CONNECTION_BLUETOOTH,
-    DeviceInfo,
-    format_mac,
+from homeassistant.const import (
+    REVOLUTIONS_PER_MINUTE,
+    EntityCategory,
+    UnitOfTime,
 )
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.typing import StateType
-from homeassistant.helpers.update_coordinator import (
-    CoordinatorEntity,
-    DataUpdateCoordinator,
-    UpdateFailed,
-)
+from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType, StateType
 
-from .const import DOMAIN
-from .pax_client import CurrentTrigger, PaxClient
+from .const import DATA_ANALYTICS, DOMAIN, SIGNAL_ANALYTICS_UPDATED
+from .entity import PaxEntity, PaxHealthEntity
+from .pax_client import CurrentTrigger
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -77,6 +67,77 @@ SENSOR_MAPPING: dict[str, SensorEntityDescription] = {
     ),
 }
 
+HUMIDITY_RISE_RATE = SensorEntityDescription(
+    key="humidity_rise_rate",
+    translation_key="humidity_rise_rate",
+    icon="mdi:water-percent-alert",
+    native_unit_of_measurement="%/min",
+    state_class=SensorStateClass.MEASUREMENT,
+)
+
+# Bluetooth use over the last hour, see pax_airtime
+AIRTIME_MAPPING: dict[str, SensorEntityDescription] = {
+    "airtime": SensorEntityDescription(
+        key="airtime",
+        translation_key="airtime",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        suggested_display_precision=1,
+    ),
+    "gatt_operations": SensorEntityDescription(
+        key="gatt_operations",
+        translation_key="gatt_operations",
+        icon="mdi:bluetooth-transfer",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+    ),
+    "poll_interval": SensorEntityDescription(
+        key="poll_interval",
+        translation_key="poll_interval",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        entity_category=EntityCategory.DIAGNOSTIC,
+    ),
+}
+
+# Fan health from pax_analytics
+HEALTH_MAPPING: dict[str, SensorEntityDescription] = {
+    "tracking_error": SensorEntityDescription(
+        key="tracking_error",
+        translation_key="tracking_error",
+        icon="mdi:fan-alert",
+        native_unit_of_measurement="%",
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    "humidity_recovery_time": SensorEntityDescription(
+        key="humidity_recovery_time",
+        translation_key="humidity_recovery_time",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+}
+
+FLEET_PROBLEMS = SensorEntityDescription(
+    key="fleet_problems",
+    translation_key="fleet_problems",
+    icon="mdi:fan-alert",
+    state_class=SensorStateClass.MEASUREMENT,
+)
+
+
+async def async_setup_platform(
+    hass: HomeAssistant,
+    config: ConfigType,
+    async_add_entities: AddEntitiesCallback,
+    discovery_info: DiscoveryInfoType | None = None,
+) -> None:
+    """Set up the fleet summary, loaded by async_setup of the integration."""
+    if discovery_info is not None:
+        async_add_entities([PaxFleetSummaryEntity(FLEET_PROBLEMS)])
+
 
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
@@ -89,44 +150,139 @@ async def async_setup_entry(
     )
 
     async_add_entities(
-        PaxSensorEntity(coordinator, SENSOR_MAPPING[key]) for key in SENSOR_MAPPING
+        [
+            *(
+                PaxSensorEntity(coordinator, SENSOR_MAPPING[key])
+                for key in SENSOR_MAPPING
+            ),
+            PaxHumidityRiseRateEntity(coordinator, HUMIDITY_RISE_RATE),
+            *(
+                PaxAirtimeEntity(coordinator, AIRTIME_MAPPING[key])
+                for key in AIRTIME_MAPPING
+            ),
+            *(
+                PaxHealthSensorEntity(coordinator, HEALTH_MAPPING[key])
+                for key in HEALTH_MAPPING
+            ),
+        ]
     )
     return True
 
 
-class PaxSensorEntity(CoordinatorEntity, SensorEntity):
-    def __init__(
-        self,
-        coordinator: DataUpdateCoordinator,
-        entity_description: SensorEntityDescription,
-    ):
-        super().__init__(coordinator)
-
-        self.entity_description = entity_description
-        self._attr_unique_id = (
-            f"{format_mac(coordinator.address)}_{entity_description.key}"
+class PaxSensorEntity(PaxEntity, SensorEntity):
+    @property
+    def available(self) -> bool:
+        return (
+            super().available
+            and self.coordinator.data is not None
+            and hasattr(self.coordinator.data, self.entity_description.key)
         )
 
-        device_info = coordinator.device_info
+    @property
+    def native_value(self) -> StateType:
+        return getattr(self.coordinator.data, self.entity_description.key)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        attributes = self._stale_attributes()
+        if not self.coordinator.sample_statistics:
+            return attributes
+        statistics = self.coordinator.statistics.get(self.entity_description.key)
+        if statistics is None:
+            return attributes
+        return {
+            **(attributes or {}),
+            "min": statistics.minimum,
+            "max": statistics.maximum,
+            "samples": statistics.samples,
+        }
 
-        self._attr_has_entity_name = True
-        self._attr_device_info = DeviceInfo(
-            connections={(CONNECTION_BLUETOOTH, coordinator.address)},
-            manufacturer=device_info.manufacturer,
-            model=f"{device_info.name} {device_info.model_number}",
-            name=device_info.name,
-            sw_version=device_info.sw_version,
-            hw_version=device_info.hw_version,
-        )
 
+class PaxHumidityRiseRateEntity(PaxSensorEntity):
     @property
     def available(self) -> bool:
         return (
-            super().available
-            and self.coordinator.data is not None
-            and self.entity_description.key in asdict(self.coordinator.data)
+            self.coordinator.last_update_success
+            and self.coordinator.humidity_rise_rate is not None
+        )
+
+    @property
+    def native_value(self) -> StateType:
+        return self.coordinator.humidity_rise_rate
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        return self._stale_attributes()
+
+
+class PaxAirtimeEntity(PaxEntity, SensorEntity):
+    @property
+    def available(self) -> bool:
+        # Most useful while the fan cannot be reached
+        return True
+
+    @property
+    def native_value(self) -> StateType:
+        key = self.entity_description.key
+        if key == "poll_interval":
+            return self.coordinator.update_interval.total_seconds()
+        usage = self.coordinator.airtime.usage()
+        if key == "airtime":
+            return round(usage.seconds, 3)
+        return usage.operations
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        return None
+
+
+class PaxHealthSensorEntity(PaxHealthEntity, SensorEntity):
+    """Tracking error or humidity recovery time of the fan."""
+
+    @property
+    def native_value(self) -> StateType:
+        health = self._health
+        if self.entity_description.key == "tracking_error":
+            return health.tracking_error
+        return health.recovery_seconds
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        health = self._health
+        if health is None:
+            return None
+        if self.entity_description.key == "tracking_error":
+            return {"samples": health.samples}
+        return {"humidity_trigger_seconds": health.humidity_trigger_seconds}
+
+
+class PaxFleetSummaryEntity(SensorEntity):
+    """Number of fans with a health problem."""
+
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+    _attr_unique_id = f"{DOMAIN}_fleet_problems"
+
+    def __init__(self, entity_description: SensorEntityDescription):
+        self.entity_description = entity_description
+
+    async def async_added_to_hass(self) -> None:
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass, SIGNAL_ANALYTICS_UPDATED, self.async_write_ha_state
+            )
         )
 
     @property
     def native_value(self) -> StateType:
-        return asdict(self.coordinator.data)[self.entity_description.key]
+        return len(self.hass.data[DATA_ANALYTICS].summary.problem_fans)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        summary = self.hass.data[DATA_ANALYTICS].summary
+        return {
+            "fans": summary.fans,
+            "problem_fans": list(summary.problem_fans),
+            "median_tracking_error": summary.median_tracking_error,
+            "worst_tracking": summary.worst_tracking,
+        }
@@ -0,0 +1,166 @@
+"""Services for the Pax Levante fan integration."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING
+
+from homeassistant.const import ATTR_DEVICE_ID
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv, device_registry as dr
+import voluptuous as vol
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from .pax_update_coordinator import PaxUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_SNAPSHOT = "snapshot"
+SERVICE_APPLY_SNAPSHOT = "apply_snapshot"
+SERVICE_PROFILE = "profile"
+SERVICE_REFRESH_SENSORS = "refresh_sensors"
+
+ATTR_SNAPSHOT = "snapshot"
+ATTR_CYCLES = "cycles"
+ATTR_CPROFILE = "cprofile"
+
+SNAPSHOT_SCHEMA = vol.Schema({vol.Required(ATTR_DEVICE_ID): cv.string})
+
+APPLY_SNAPSHOT_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Required(ATTR_SNAPSHOT): dict,
+    }
+)
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_CYCLES, default=5): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=100)
+        ),
+        vol.Optional(ATTR_CPROFILE, default=False): cv.boolean,
+    }
+)
+
+
+REFRESH_SENSORS_SCHEMA = vol.Schema(
+    {vol.Required(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string])}
+)
+
+
+def _coordinator_for_device(
+    hass: HomeAssistant, device_id: str
+) -> PaxUpdateCoordinator:
+    device = dr.async_get(hass).async_get(device_id)
+    if device is not None:
+        for entry_id in device.config_entries:
+            if coordinator := hass.data.get(DOMAIN, {}).get(entry_id):
+                return coordinator
+    raise HomeAssistantError(f"{device_id} is not a loaded Pax Levante fan")
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    from .pax_snapshot import config_to_snapshot, snapshot_to_config
+
+    async def async_snapshot(call: ServiceCall) -> ServiceResponse:
+        coordinator = _coordinator_for_device(hass, call.data[ATTR_DEVICE_ID])
+        config = await coordinator.async_get_config()
+        return config_to_snapshot(config, coordinator.device_info)
+
+    async def async_apply_snapshot(call: ServiceCall) -> ServiceResponse:
+        try:
+            config = snapshot_to_config(call.data[ATTR_SNAPSHOT])
+        except ValueError as err:
+            raise HomeAssistantError(str(err)) from err
+
+        device_ids = call.data[ATTR_DEVICE_ID]
+        coordinators = [_coordinator_for_device(hass, d) for d in device_ids]
+        results = await asyncio.gather(
+            *(coordinator.async_apply_config(config) for coordinator in coordinators),
+            return_exceptions=True,
+        )
+
+        response = {}
+        for device_id, result in zip(device_ids, results):
+            if isinstance(result, BaseException):
+                _LOGGER.warning("Applying snapshot to %s failed: %s", device_id, result)
+                response[device_id] = {"error": str(result)}
+            else:
+                response[device_id] = {"written": result}
+        return response
+
+    async def async_profile(call: ServiceCall) -> None:
+        coordinators = [
+            _coordinator_for_device(hass, device_id)
+            for device_id in call.data[ATTR_DEVICE_ID]
+        ]
+        for coordinator in coordinators:
+            if coordinator.profiling:
+                raise HomeAssistantError(
+                    f"{coordinator.address} is already being profiled"
+                )
+        for coordinator in coordinators:
+            coordinator.async_start_profile(
+                call.data[ATTR_CYCLES], call.data[ATTR_CPROFILE]
+            )
+
+    async def async_refresh_sensors(call: ServiceCall) -> ServiceResponse:
+        device_ids = call.data[ATTR_DEVICE_ID]
+        coordinators = [_coordinator_for_device(hass, d) for d in device_ids]
+        results = await asyncio.gather(
+            *(coordinator.async_refresh_sensors() for coordinator in coordinators),
+            return_exceptions=True,
+        )
+
+        response = {}
+        for device_id, result in zip(device_ids, results):
+            if isinstance(result, BaseException):
+                _LOGGER.warning(
+                    "Refreshing sensors of %s failed: %s", device_id, result
+                )
+                response[device_id] = {"error": str(result)}
+            else:
+                response[device_id] = {
+                    "humidity": result.humidity,
+                    "temperature": result.temperature,
+                    "light": result.light,
+                    "fan_speed": result.fan_speed,
+                    "current_trigger": result.current_trigger.name.lower(),
+                    "boost": result.boost,
+                }
+        return response
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SNAPSHOT,
+        async_snapshot,
+        schema=SNAPSHOT_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_APPLY_SNAPSHOT,
+        async_apply_snapshot,
+        schema=APPLY_SNAPSHOT_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_PROFILE, async_profile, schema=PROFILE_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_REFRESH_SENSORS,
+        async_refresh_sensors,
+        schema=REFRESH_SENSORS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
@@ -2,43 +2,20 @@
 
 from __future__ import annotations
 
-from collections import namedtuple
-from dataclasses import asdict, dataclass
-from datetime import timedelta
+from dataclasses import dataclass
 import logging
+from typing import TYPE_CHECKING
 
-# import SensorEntityDescription
-import async_timeout
-from homeassistant.components import bluetooth
-from homeassistant.components.number import NumberEntity
-from homeassistant.components.sensor import (
-    SensorDeviceClass,
-    SensorEntity,
-    SensorEntityDescription,
-    SensorStateClass,
-)
 from homeassistant.components.switch import SwitchEntity, SwitchEntityDescription
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import REVOLUTIONS_PER_MINUTE
-from homeassistant.core import HomeAssistant, callback
-from homeassistant.exceptions import ConfigEntryNotReady
-from homeassistant.helpers.device_registry import (
-    CONNECTION_BLUETOOTH,
-    DeviceInfo,
-    format_mac,
-)
-from homeassistant.helpers.entity import EntityCategory
+from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.typing import StateType
-from homeassistant.helpers.update_coordinator import (
-    CoordinatorEntity,
-    DataUpdateCoordinator,
-    UpdateFailed,
-)
 
 from .const import DOMAIN
-from .pax_client import CurrentTrigger, PaxClient
-from .pax_update_coordinator import PaxUpdateCoordinator
+from .entity import PaxEntity
+
+if TYPE_CHECKING:
+    from .pax_update_coordinator import PaxUpdateCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -70,30 +47,16 @@ async def async_setup_entry(
     return True
 
 
-class PaxBoostEntity(CoordinatorEntity, SwitchEntity):
+class PaxBoostEntity(PaxEntity, SwitchEntity):
     def __init__(
         self,
         coordinator: PaxUpdateCoordinator,
         entity_description: PaxFanSpeedBoostDescription,
     ):
-        super().__init__(coordinator)
+        super().__init__(coordinator, entity_description)
 
         _LOGGER.info(f"Creating PaxBoostEntity: {entity_description}")
 
-        self.entity_description = entity_description
-        self._attr_unique_id = (
-            f"{format_mac(coordinator.address)}_{entity_description.key}"
-        )
-
-        self._attr_device_info = DeviceInfo(
-            connections={(CONNECTION_BLUETOOTH, coordinator.address)},
-            manufacturer=coordinator.device_info.manufacturer,
-            model=f"{coordinator.device_info.name} {coordinator.device_info.model_number}",
-            name=coordinator.device_info.name,
-            sw_version=coordinator.device_info.sw_version,
-            hw_version=coordinator.device_info.hw_version,
-        )
-
     @property
     def is_on(self):
         """Return the state of the switch."""
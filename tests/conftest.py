@@ -1,9 +1,22 @@
 """Test configuration."""
+
+import dataclasses
 import os
 
 import pytest
 from homeassistant.util import dt as dt_util
 
+from custom_components.pax_levante.pax_client import (
+    Boost,
+    CurrentTrigger,
+    FanSensitivity,
+    FanSensitivitySetting,
+    FanSpeedTarget,
+    PaxConfig,
+    PaxDevice,
+    PaxSensors,
+)
+
 # Set timezone to a valid IANA timezone
 os.environ.setdefault("TZ", "America/Los_Angeles")
 
@@ -29,3 +42,97 @@ def patch_timezone():
     dt_util.get_time_zone = patched_get_time_zone
     yield
     dt_util.get_time_zone = original_get_time_zone
+
+
+class MockClient:
+    def __init__(self, bleDevice, use_services_cache=True, **kwargs):
+        self.bleDevice = bleDevice
+        self.is_connected = False
+        self.gatt_operations = 0
+
+    device = PaxDevice(
+        manufacturer="Pax",
+        model_number="Levante",
+        name="Pax Levante",
+        sw_version="1.0",
+        hw_version="1.0",
+    )
+
+    sensors = PaxSensors(
+        humidity=0,
+        temperature=98,
+        light=560,
+        fan_speed=2390,
+        current_trigger=CurrentTrigger.BOOST,
+        boost=True,
+        unknown=0,
+        raw=bytes.fromhex("000062003002560917000000"),
+    )
+
+    fan_speed_targets = FanSpeedTarget(humidity=1, light=23, base=23)
+
+    fan_sensitivity = FanSensitivitySetting(
+        humidity=FanSensitivity.MEDIUM, light=FanSensitivity.LOW
+    )
+
+    boost = Boost(active=False, fan_speed_target=0, timeleft_seconds=0)
+
+    async def __aenter__(self):
+        await self.async_connect()
+        return self
+
+    async def __aexit__(self, *args):
+        await self.async_disconnect()
+
+    async def async_connect(self):
+        self.is_connected = True
+
+    async def async_disconnect(self):
+        self.is_connected = False
+
+    async def async_log_services(self):
+        pass
+
+    async def async_get_device_info(self):
+        return self.device
+
+    async def async_get_sensors(self):
+        return self.sensors
+
+    async def async_get_fan_speed_targets(self):
+        return self.fan_speed_targets
+
+    async def async_set_pin(self, pin):
+        return True
+
+    async def async_get_config(self):
+        return PaxConfig(self.fan_speed_targets, self.fan_sensitivity, self.boost)
+
+    async def async_write_transaction(self, changes, pin=None, verify=False):
+        written = [
+            name
+            for name in ("fan_speed_targets", "fan_sensitivity", "boost")
+            if name in changes and changes[name] != getattr(self, name)
+        ]
+        for name in written:
+            setattr(type(self), name, changes[name])
+        return written
+
+    async def async_apply_config(self, config, current=None, pin=None, verify=False):
+        return await self.async_write_transaction(
+            {
+                "fan_speed_targets": config.fan_speed_targets,
+                "fan_sensitivity": config.fan_sensitivity,
+                "boost": dataclasses.replace(
+                    self.boost, fan_speed_target=config.boost.fan_speed_target
+                ),
+            },
+            pin,
+            verify,
+        )
+
+
+@pytest.fixture
+def mock_client():
+    """Return a fresh MockClient class so tests can change its class state."""
+    return type("MockClient", (MockClient,), {})
@@ -0,0 +1,64 @@
+"""Setup of a fan that has not advertised yet."""
+
+from unittest.mock import MagicMock, patch
+
+from homeassistant.components.bluetooth import BluetoothChange
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import CONF_ADDRESS, STATE_UNAVAILABLE
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.pax_levante.const import DOMAIN
+
+ADDRESS = "AA:BB:CC:DD:EE:FF"
+
+
+@pytest.fixture(autouse=True)
+def expected_lingering_timers() -> bool:
+    return True
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    yield
+
+
+async def test_first_refresh_on_advertisement(
+    hass: HomeAssistant, enable_bluetooth, mock_client
+):
+    entry = MockConfigEntry(domain=DOMAIN, data={CONF_ADDRESS: ADDRESS, "pin": 1234})
+    entry.add_to_hass(hass)
+    with patch(
+        "custom_components.pax_levante.pax_update_coordinator.PaxClient",
+        new=mock_client,
+    ), patch(
+        "homeassistant.components.bluetooth.async_register_callback"
+    ) as register_callback:
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+        assert entry.state is ConfigEntryState.LOADED
+        assert hass.states.get("switch.pax_levante_boost").state == STATE_UNAVAILABLE
+        device = dr.async_get(hass).async_get_device(
+            connections={(dr.CONNECTION_BLUETOOTH, ADDRESS)}
+        )
+        assert device.sw_version is None
+
+        ble_device = MagicMock()
+        ble_device.name = "Pax Levante"
+        with patch(
+            "homeassistant.components.bluetooth.async_ble_device_from_address",
+            return_value=ble_device,
+        ):
+            advertisement_callback, matcher = register_callback.call_args.args[1:3]
+            assert matcher == {"address": ADDRESS, "connectable": True}
+            advertisement_callback(MagicMock(), BluetoothChange.ADVERTISEMENT)
+            await hass.async_block_till_done()
+
+    assert hass.states.get("switch.pax_levante_boost").state == "on"
+    device = dr.async_get(hass).async_get_device(
+        connections={(dr.CONNECTION_BLUETOOTH, ADDRESS)}
+    )
+    assert device.sw_version == mock_client.device.sw_version
@@ -0,0 +1,88 @@
+"""Grace period and recovery of the fan's availability."""
+
+from custom_components.pax_levante.const import (
+    CONF_RECOVERY_POLLS,
+    CONF_STALE_POLLS,
+    CONF_STALE_SECONDS,
+)
+from custom_components.pax_levante.pax_fake import FakePaxFan
+from custom_components.pax_levante.pax_update_coordinator import PaxUpdateCoordinator
+
+
+class FlakyFan(FakePaxFan):
+    failing = False
+
+    async def connect(self):
+        if self.failing:
+            raise TimeoutError("Out of range")
+        await super().connect()
+
+
+async def test_stale_polls_and_recovery(hass):
+    coordinator = PaxUpdateCoordinator(
+        hass,
+        "AA:BB:CC:DD:EE:FF",
+        0,
+        {CONF_STALE_POLLS: 2, CONF_RECOVERY_POLLS: 2},
+    )
+    coordinator.backend = fan = FlakyFan("AA:BB:CC:DD:EE:FF")
+
+    await coordinator.async_refresh()
+    good = coordinator.data
+    assert coordinator.last_update_success
+    assert coordinator.stale_since is None
+
+    fan.failing = True
+    for _ in range(2):
+        await coordinator.async_refresh()
+        assert coordinator.last_update_success
+        assert coordinator.data is good
+        assert coordinator.stale_since is not None
+
+    await coordinator.async_refresh()
+    assert not coordinator.last_update_success
+    assert coordinator.stale_since is None
+
+    fan.failing = False
+    await coordinator.async_refresh()
+    assert not coordinator.last_update_success
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+    assert coordinator.data is not good
+
+    await coordinator.async_shutdown()
+
+
+async def test_stale_seconds(hass, freezer):
+    coordinator = PaxUpdateCoordinator(
+        hass, "AA:BB:CC:DD:EE:FF", 0, {CONF_STALE_SECONDS: 120}
+    )
+    coordinator.backend = fan = FlakyFan("AA:BB:CC:DD:EE:FF")
+    await coordinator.async_refresh()
+
+    fan.failing = True
+    freezer.tick(100)
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+
+    freezer.tick(30)
+    await coordinator.async_refresh()
+    assert not coordinator.last_update_success
+
+    await coordinator.async_shutdown()
+
+
+async def test_no_grace_by_default(hass):
+    coordinator = PaxUpdateCoordinator(hass, "AA:BB:CC:DD:EE:FF", 0)
+    coordinator.backend = fan = FlakyFan("AA:BB:CC:DD:EE:FF")
+    await coordinator.async_refresh()
+
+    fan.failing = True
+    await coordinator.async_refresh()
+    assert not coordinator.last_update_success
+
+    fan.failing = False
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+
+    await coordinator.async_shutdown()
@@ -0,0 +1,73 @@
+"""The standalone command line interface and the simulated fan."""
+
+import json
+import os
+import subprocess
+import sys
+
+from custom_components.pax_levante.cli import main
+from custom_components.pax_levante.pax_client import FanSpeedTarget, PaxClient
+from custom_components.pax_levante.pax_fake import FakePaxFan
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+async def test_fake_fan_requires_pin():
+    fan = FakePaxFan("FA:CE:00:00:00:00", pin=1234)
+    async with PaxClient(None, backend=fan) as client:
+        await client.async_set_fan_speed_targets(FanSpeedTarget(1, 2, 3))
+        assert fan.fan_speed_targets == FanSpeedTarget(2250, 1675, 1000)
+
+        assert await client.async_set_pin(1234)
+        await client.async_set_fan_speed_targets(FanSpeedTarget(1, 2, 3))
+        assert await client.async_get_fan_speed_targets() == FanSpeedTarget(1, 2, 3)
+
+
+def test_read(capsys):
+    assert main(["--fake", "3", "read", "--parallel", "2"]) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == 3
+    address, reading = lines[0].split("  ", 1)
+    assert address == "FA:CE:00:00:00:00"
+    assert json.loads(reading)["fan_speed_targets"] == [2250, 1675, 1000]
+
+
+def test_benchmark(capsys):
+    assert main(["--fake", "2", "benchmark", "--rounds", "2", "--pin", "0"]) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == 2
+    assert "connect" in lines[0] and "write" in lines[0]
+
+
+def test_apply(capsys, tmp_path):
+    snapshot = tmp_path / "snapshot.json"
+    snapshot.write_text(
+        json.dumps(
+            {
+                "version": 1,
+                "fan_speed_targets": {"humidity": 2250, "light": 1675, "base": 1200},
+                "fan_sensitivity": {"humidity": "medium", "light": "low"},
+                "boost": {"fan_speed_target": 0},
+            }
+        )
+    )
+    args = ["--fake", "2", "apply", "--pin", "1", str(snapshot)]
+    args += ["--address", "FA:CE:00:00:00:01", "--address", "FA:CE:00:00:00:09"]
+
+    assert main(args) == 1
+    assert capsys.readouterr().out.splitlines() == [
+        "FA:CE:00:00:00:01  fan_speed_targets",
+        "FA:CE:00:00:00:09  error: LookupError('Could not find FA:CE:00:00:00:09')",
+    ]
+
+
+def test_cli_runs_without_home_assistant():
+    script = (
+        "import sys; sys.modules['homeassistant'] = None; "
+        "from custom_components.pax_levante.cli import main; "
+        "sys.exit(main(['--fake', '1', 'read']))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, cwd=ROOT, text=True
+    )
+    assert result.returncode == 0, result.stderr
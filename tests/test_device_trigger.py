@@ -0,0 +1,122 @@
+"""Trigger transition events and device triggers."""
+
+import dataclasses
+from unittest.mock import MagicMock, patch
+
+from homeassistant.components.device_automation import DeviceAutomationType
+from homeassistant.const import CONF_ADDRESS
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+from homeassistant.setup import async_setup_component
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_capture_events,
+    async_get_device_automations,
+)
+
+from custom_components.pax_levante.const import DOMAIN, EVENT_TRIGGER_CHANGED
+from custom_components.pax_levante.pax_client import CurrentTrigger
+
+
+@pytest.fixture(autouse=True)
+def expected_lingering_timers() -> bool:
+    return True
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    yield
+
+
+async def test_trigger_changed(hass: HomeAssistant, enable_bluetooth, mock_client):
+    ble_device = MagicMock()
+    ble_device.name = "Pax Levante"
+    with patch(
+        "homeassistant.components.bluetooth.async_ble_device_from_address",
+        return_value=ble_device,
+    ), patch(
+        "custom_components.pax_levante.pax_update_coordinator.PaxClient",
+        new=mock_client,
+    ):
+        entry = MockConfigEntry(
+            domain=DOMAIN, data={CONF_ADDRESS: "AA:BB:CC:DD:EE:FF", "pin": 1234}
+        )
+        entry.add_to_hass(hass)
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+        device = dr.async_get(hass).async_get_device(
+            connections={(dr.CONNECTION_BLUETOOTH, "AA:BB:CC:DD:EE:FF")}
+        )
+        triggers = await async_get_device_automations(
+            hass, DeviceAutomationType.TRIGGER, device.id
+        )
+        assert {
+            trigger["type"] for trigger in triggers if trigger["domain"] == DOMAIN
+        } == {
+            "base",
+            "light",
+            "humidity",
+            "automatic_ventilation",
+            "boost",
+        }
+
+        assert await async_setup_component(
+            hass,
+            "automation",
+            {
+                "automation": {
+                    "trigger": {
+                        "platform": "device",
+                        "domain": DOMAIN,
+                        "device_id": device.id,
+                        "type": "humidity",
+                    },
+                    "action": {"event": "humidity_trigger_fired"},
+                }
+            },
+        )
+        events = async_capture_events(hass, EVENT_TRIGGER_CHANGED)
+        fired = async_capture_events(hass, "humidity_trigger_fired")
+        coordinator = hass.data[DOMAIN][entry.entry_id]
+
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+        assert events == []
+
+        mock_client.sensors = dataclasses.replace(
+            mock_client.sensors, current_trigger=CurrentTrigger.HUMIDITY, boost=False
+        )
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+        assert len(events) == 1
+        assert events[0].data["device_id"] == device.id
+        assert events[0].data["old_trigger"] == "boost"
+        assert events[0].data["new_trigger"] == "humidity"
+        assert events[0].data["old_boost"] is True
+        assert events[0].data["new_boost"] is False
+        assert len(fired) == 1
+
+        # The fan drops to base and the humidity trigger fires again
+        for trigger in (
+            CurrentTrigger.BASE,
+            CurrentTrigger.BASE,
+            CurrentTrigger.HUMIDITY,
+        ):
+            mock_client.sensors = dataclasses.replace(
+                mock_client.sensors, current_trigger=trigger
+            )
+            await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+        assert [
+            (event.data["old_trigger"], event.data["new_trigger"]) for event in events
+        ] == [
+            ("boost", "humidity"),
+            ("humidity", "base"),
+            ("base", "humidity"),
+        ]
+        assert events[2].data["old_boost"] is False
+        assert len(fired) == 2
@@ -0,0 +1,60 @@
+"""The integration modules defer their heavy imports.
+
+Timings are left to benchmarks/import_time.py, they are too noisy for CI.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Imported once an entry is set up, never by loading the integration
+DEFERRED = [
+    "custom_components.pax_levante.pax_analytics",
+    "custom_components.pax_levante.pax_update_coordinator",
+    "custom_components.pax_levante.services",
+    "numpy",
+]
+
+SCRIPT = """
+import json, sys
+__import__({module!r})
+print(json.dumps(sorted(sys.modules)))
+"""
+
+
+def _modules_after_import(module: str) -> list[str]:
+    result = subprocess.run(
+        [sys.executable, "-c", SCRIPT.format(module=module)],
+        capture_output=True,
+        check=True,
+        cwd=ROOT,
+        text=True,
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        "custom_components.pax_levante",
+        "custom_components.pax_levante.binary_sensor",
+        "custom_components.pax_levante.config_flow",
+        "custom_components.pax_levante.number",
+        "custom_components.pax_levante.sensor",
+        "custom_components.pax_levante.switch",
+    ],
+)
+def test_heavy_imports_are_deferred(module):
+    modules = _modules_after_import(module)
+    assert [deferred for deferred in DEFERRED if deferred in modules] == []
+
+
+def test_package_import_is_lazy():
+    modules = _modules_after_import("custom_components.pax_levante")
+    assert "custom_components.pax_levante.pax_client" not in modules
+    assert "homeassistant.helpers.config_validation" not in modules
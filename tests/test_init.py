@@ -1,9 +1,21 @@
 """Test the setup of the component."""
 
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import CONF_ADDRESS
 from homeassistant.setup import async_setup_component
 import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
 
-from custom_components.pax_levante.const import DOMAIN
+from custom_components.pax_levante.const import (
+    CONF_CONNECTION_MODE,
+    CONF_POLL_INTERVAL,
+    CONF_UPDATE_TIMEOUT,
+    CONNECTION_MODE_PERSISTENT,
+    DOMAIN,
+)
 
 
 @pytest.fixture(autouse=True)
@@ -19,3 +31,50 @@ def auto_enable_custom_integrations(enable_custom_integrations):
 async def test_async_setup(hass, enable_bluetooth):
     """Test the component gets setup."""
     assert await async_setup_component(hass, DOMAIN, {}) is True
+
+
+async def test_unload_and_options(hass, enable_bluetooth, mock_client):
+    """Test options are applied live and unloading disconnects the fan."""
+    ble_device = MagicMock()
+    ble_device.name = "Pax Levante"
+    with patch(
+        "homeassistant.components.bluetooth.async_ble_device_from_address",
+        return_value=ble_device,
+    ), patch(
+        "custom_components.pax_levante.pax_update_coordinator.PaxClient",
+        new=mock_client,
+    ):
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            data={CONF_ADDRESS: "AA:BB:CC:DD:EE:FF", "pin": 1234},
+            options={CONF_CONNECTION_MODE: CONNECTION_MODE_PERSISTENT},
+        )
+        entry.add_to_hass(hass)
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+        coordinator = hass.data[DOMAIN][entry.entry_id]
+        client = coordinator._client
+        assert client.is_connected
+
+        hass.config_entries.async_update_entry(
+            entry,
+            options={
+                CONF_CONNECTION_MODE: CONNECTION_MODE_PERSISTENT,
+                CONF_POLL_INTERVAL: 30,
+                CONF_UPDATE_TIMEOUT: 5,
+            },
+        )
+        await hass.async_block_till_done()
+
+        assert hass.data[DOMAIN][entry.entry_id] is coordinator
+        assert coordinator.update_interval == timedelta(seconds=30)
+        assert coordinator.update_timeout == 5
+        assert coordinator._client is client and client.is_connected
+
+        assert await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_block_till_done()
+
+        assert entry.state is ConfigEntryState.NOT_LOADED
+        assert entry.entry_id not in hass.data[DOMAIN]
+        assert not client.is_connected
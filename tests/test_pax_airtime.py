@@ -0,0 +1,185 @@
+"""Airtime metering and the domain wide airtime budget."""
+
+from datetime import timedelta
+
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+import pytest
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.pax_levante.const import (
+    CONF_POLL_INTERVAL,
+    CONF_SAMPLE_INTERVAL,
+    DOMAIN,
+)
+from custom_components.pax_levante.pax_airtime import (
+    MAX_STRETCH,
+    REBALANCE_INTERVAL,
+    AirtimeBudget,
+    AirtimeMeter,
+    FanDemand,
+    _quantize,
+    stretch_factors,
+)
+from custom_components.pax_levante.pax_fake import FakePaxFan
+from custom_components.pax_levante.pax_update_coordinator import PaxUpdateCoordinator
+
+
+@pytest.fixture(autouse=True)
+def expected_lingering_timers() -> bool:
+    return True
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    yield
+
+
+def test_meter_keeps_last_hour():
+    meter = AirtimeMeter()
+    meter.add_session(2.0, 7, now=0)
+    meter.add_session(1.5, 2, now=1800)
+    meter.add_trigger_change(now=1800)
+
+    usage = meter.usage(now=3000)
+    assert (usage.sessions, usage.seconds, usage.operations) == (2, 3.5, 9)
+    assert usage.trigger_changes == 1
+
+    usage = meter.usage(now=3700)
+    assert (usage.sessions, usage.seconds, usage.operations) == (1, 1.5, 2)
+
+
+def test_stretch_least_active_first():
+    demands = [
+        FanDemand("bathroom", (True, 3), 300),
+        FanDemand("hallway", (False, 0), 200),
+        FanDemand("kitchen", (False, 2), 200),
+    ]
+    assert stretch_factors(demands, 700) == {
+        "hallway": 1.0,
+        "kitchen": 1.0,
+        "bathroom": 1.0,
+    }
+
+    factors = stretch_factors(demands, 600)
+    assert factors["hallway"] == pytest.approx(2.0)
+    assert factors["kitchen"] == factors["bathroom"] == 1.0
+
+    factors = stretch_factors(demands, 400)
+    assert factors["hallway"] == MAX_STRETCH
+    assert 1 < factors["kitchen"] < MAX_STRETCH
+    assert factors["bathroom"] == 1.0
+    projected = sum(d.seconds_per_hour / factors[d.key] for d in demands)
+    assert projected == pytest.approx(400)
+
+
+async def test_budget_stretches_poll_interval(hass):
+    coordinator = PaxUpdateCoordinator(hass, "AA:BB:CC:DD:EE:FF", 0)
+    coordinator.backend = FakePaxFan("AA:BB:CC:DD:EE:FF")
+    await coordinator.async_refresh()
+
+    usage = coordinator.airtime.usage()
+    assert usage.sessions == 1
+    # Five device info reads, the sensors and the fan speed targets
+    assert usage.operations == 7
+
+    coordinator.airtime.add_session(3600 / 65, 0)
+    AirtimeBudget(1).rebalance([coordinator])
+    assert coordinator.airtime_stretch == MAX_STRETCH
+    assert coordinator.update_interval == timedelta(seconds=650)
+
+    AirtimeBudget(3600).rebalance([coordinator])
+    assert coordinator.update_interval == timedelta(seconds=65)
+
+    await coordinator.async_shutdown()
+
+
+async def test_demand_counts_samples(hass):
+    coordinator = PaxUpdateCoordinator(
+        hass,
+        "AA:BB:CC:DD:EE:FF",
+        0,
+        {CONF_POLL_INTERVAL: 60, CONF_SAMPLE_INTERVAL: 10},
+    )
+    # 60 polls and 360 samples per hour of a second each
+    coordinator.airtime.add_session(1.0, 2)
+    AirtimeBudget(420).rebalance([coordinator])
+    assert coordinator.airtime_stretch == 1.0
+    # Stretched polls are not sampled, which alone saves 360 s
+    AirtimeBudget(210).rebalance([coordinator])
+    assert coordinator.airtime_stretch == 1.25
+    assert not coordinator.sampling
+    AirtimeBudget(210).rebalance([coordinator])
+    assert coordinator.airtime_stretch == 1.25
+    # Without samples the polls are stretched as far as needed
+    AirtimeBudget(30).rebalance([coordinator])
+    assert coordinator.airtime_stretch == 2.0
+
+    await coordinator.async_shutdown()
+
+
+async def test_demand_at_least_measured(hass):
+    coordinator = PaxUpdateCoordinator(hass, "AA:BB:CC:DD:EE:FF", 0)
+    # Long writes use more airtime than polls at the mean session length
+    for _ in range(100):
+        coordinator.airtime.add_session(20.0, 4)
+    coordinator.airtime.add_session(0, 0)
+    AirtimeBudget(1800).rebalance([coordinator])
+    assert coordinator.airtime_stretch > 1.0
+
+    await coordinator.async_shutdown()
+
+
+def test_quantize():
+    assert _quantize(1.0, 1.1) == 1.25
+    assert _quantize(1.0, 30) == MAX_STRETCH
+    # Dead-band: kept until the stretch drops by more than a step
+    assert _quantize(2.0, 1.8) == 2.0
+    assert _quantize(2.0, 1.7) == 1.75
+    assert _quantize(2.0, 1.5) == 1.5
+
+
+async def test_stretch_reschedules_poll(hass, freezer):
+    coordinator = PaxUpdateCoordinator(hass, "AA:BB:CC:DD:EE:FF", 0)
+    coordinator.backend = FakePaxFan("AA:BB:CC:DD:EE:FF")
+    unsub = coordinator.async_add_listener(lambda: None)
+    await coordinator.async_refresh()
+    assert coordinator.airtime.usage().sessions == 1
+
+    # The pending poll moves to the stretched interval from now
+    freezer.tick(30)
+    coordinator.async_set_airtime_stretch(2.0)
+    assert coordinator.update_interval == timedelta(seconds=130)
+    freezer.tick(128)
+    async_fire_time_changed(hass, dt_util.utcnow())
+    await hass.async_block_till_done()
+    assert coordinator.airtime.usage().sessions == 1
+    freezer.tick(3)
+    async_fire_time_changed(hass, dt_util.utcnow())
+    await hass.async_block_till_done()
+    assert coordinator.airtime.usage().sessions == 2
+
+    # An unchanged interval leaves the pending poll alone
+    freezer.tick(100)
+    coordinator.async_set_airtime_stretch(2.0)
+    freezer.tick(32)
+    async_fire_time_changed(hass, dt_util.utcnow())
+    await hass.async_block_till_done()
+    assert coordinator.airtime.usage().sessions == 3
+
+    unsub()
+    await coordinator.async_shutdown()
+
+
+async def test_airtime_budget_config(hass, enable_bluetooth):
+    assert await async_setup_component(hass, DOMAIN, {DOMAIN: {"airtime_budget": 600}})
+    coordinator = PaxUpdateCoordinator(hass, "AA:BB:CC:DD:EE:FF", 0)
+    # A minute per poll is far more than 600 s an hour
+    coordinator.airtime.add_session(60.0, 2)
+    hass.data.setdefault(DOMAIN, {})["entry"] = coordinator
+
+    async_fire_time_changed(hass, dt_util.utcnow() + REBALANCE_INTERVAL)
+    await hass.async_block_till_done()
+    assert coordinator.airtime_stretch > 1.0
+
+    await coordinator.async_shutdown()
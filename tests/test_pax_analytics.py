@@ -0,0 +1,155 @@
+"""Fleet analytics of fan speed tracking and humidity recovery."""
+
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+from homeassistant.const import CONF_ADDRESS
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.pax_levante.const import DOMAIN
+from custom_components.pax_levante.pax_analytics import FleetAnalytics
+from custom_components.pax_levante.pax_client import (
+    CurrentTrigger,
+    FanSpeedTarget,
+    PaxSensors,
+)
+
+TARGETS = FanSpeedTarget(humidity=2000, light=1500, base=1000)
+
+
+@pytest.fixture(autouse=True)
+def expected_lingering_timers() -> bool:
+    return True
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    yield
+
+
+def sensors(fan_speed: int, trigger: CurrentTrigger) -> PaxSensors:
+    return PaxSensors(50, 20, 0, fan_speed, trigger, False, 0, b"")
+
+
+def test_tracking_error():
+    analytics = FleetAnalytics()
+    for minute in range(20):
+        now = minute * 60
+        analytics.add("good", sensors(1000, CurrentTrigger.BASE), TARGETS, now)
+        analytics.add("clogged", sensors(700, CurrentTrigger.BASE), TARGETS, now)
+        analytics.add("boosting", sensors(2400, CurrentTrigger.BOOST), TARGETS, now)
+    analytics.analyze()
+
+    assert analytics.health["good"].tracking_error == 0
+    assert analytics.health["good"].problems == ()
+    assert analytics.health["clogged"].tracking_error == pytest.approx(30)
+    assert analytics.health["clogged"].problems == ("tracking",)
+    assert analytics.health["boosting"].tracking_error is None
+    assert analytics.summary.problem_fans == ("clogged",)
+    assert analytics.summary.worst_tracking == "clogged"
+    assert analytics.summary.median_tracking_error == pytest.approx(15)
+
+
+def test_humidity_recovery():
+    analytics = FleetAnalytics()
+    now = 0
+    # A 10 minute humidity trigger, then one that has lasted 3 hours
+    for trigger, minutes in (
+        (CurrentTrigger.BASE, 5),
+        (CurrentTrigger.HUMIDITY, 10),
+        (CurrentTrigger.BASE, 5),
+        (CurrentTrigger.HUMIDITY, 181),
+    ):
+        for _ in range(minutes):
+            analytics.add("bathroom", sensors(2000, trigger), TARGETS, now)
+            now += 60
+    analytics.analyze()
+
+    health = analytics.health["bathroom"]
+    assert health.recovery_seconds == 600
+    assert health.humidity_trigger_seconds == 3 * 3600
+    assert health.problems == ("recovery",)
+
+
+def test_outage_is_not_slow_recovery():
+    analytics = FleetAnalytics()
+    now = 0
+    for _ in range(10):
+        analytics.add("bathroom", sensors(2000, CurrentTrigger.HUMIDITY), TARGETS, now)
+        now += 60
+    # No samples for five hours while the fan was out of range
+    now += 5 * 3600
+    analytics.add("bathroom", sensors(2000, CurrentTrigger.HUMIDITY), TARGETS, now)
+    analytics.add("bathroom", sensors(1000, CurrentTrigger.BASE), TARGETS, now + 60)
+    analytics.analyze()
+
+    health = analytics.health["bathroom"]
+    # The gap counts as three default poll intervals
+    assert health.recovery_seconds == 9 * 60 + 3 * 65 + 60
+    assert health.problems == ()
+
+
+def test_gap_cap_follows_poll_interval():
+    analytics = FleetAnalytics()
+    now = 0
+    # Polled every 10 minutes, e.g. stretched by the airtime budget
+    for _ in range(15):
+        analytics.add(
+            "bathroom", sensors(2000, CurrentTrigger.HUMIDITY), TARGETS, now, 600
+        )
+        now += 600
+    analytics.add("bathroom", sensors(1000, CurrentTrigger.BASE), TARGETS, now, 600)
+    analytics.analyze()
+
+    health = analytics.health["bathroom"]
+    assert health.recovery_seconds == 15 * 600
+    assert health.problems == ("recovery",)
+
+
+def test_ring_buffer_and_remove():
+    analytics = FleetAnalytics(capacity=5)
+    for second in range(8):
+        analytics.add("fan", sensors(1000, CurrentTrigger.BASE), TARGETS, second)
+    analytics.analyze()
+    assert analytics.health["fan"].samples == 5
+
+    analytics.remove("fan")
+    analytics.add("other", sensors(1000, CurrentTrigger.BASE), TARGETS, 0)
+    analytics.analyze()
+    assert list(analytics.health) == ["other"]
+    assert analytics.health["other"].samples == 1
+
+
+async def test_health_entities(hass: HomeAssistant, enable_bluetooth, mock_client):
+    ble_device = MagicMock()
+    ble_device.name = "Pax Levante"
+    with patch(
+        "homeassistant.components.bluetooth.async_ble_device_from_address",
+        return_value=ble_device,
+    ), patch(
+        "custom_components.pax_levante.pax_update_coordinator.PaxClient",
+        new=mock_client,
+    ):
+        entry = MockConfigEntry(
+            domain=DOMAIN, data={CONF_ADDRESS: "AA:BB:CC:DD:EE:FF", "pin": 1234}
+        )
+        entry.add_to_hass(hass)
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        assert hass.states.get("binary_sensor.pax_levante_health_problem").state == (
+            "unavailable"
+        )
+
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(minutes=5))
+        await hass.async_block_till_done()
+
+    assert hass.states.get("binary_sensor.pax_levante_health_problem").state == "off"
+    fleet = hass.states.get("sensor.pax_levante_fans_with_problems")
+    assert fleet.state == "0"
+    assert fleet.attributes["fans"] == 1
@@ -0,0 +1,108 @@
+"""Tests for capturing and replaying GATT traffic."""
+
+from custom_components.pax_levante.pax_capture import (
+    OP_CONNECT,
+    OP_READ,
+    OP_WRITE,
+    PaxCaptureWriter,
+    async_replay,
+    read_capture,
+    split_sessions,
+)
+from custom_components.pax_levante.pax_client import (
+    BOOST_UUID,
+    DEVICE_NAME_UUID,
+    FAN_SPEED_TARGETS_UUID,
+    HARDWARE_REVISION_UUID,
+    MANUFACTURER_NAME_UUID,
+    MODEL_NUMBER_UUID,
+    SENSORS_UUID,
+    SOFTWARE_REVISION_UUID,
+    CurrentTrigger,
+    FanSpeedTarget,
+)
+from custom_components.pax_levante.pax_update_coordinator import PaxUpdateCoordinator
+
+SENSORS = bytes.fromhex("0f00610022003d0907000000")
+TARGETS = bytes(b"`\t\xcc\x06\xb6\x03")
+
+
+def _write_session(writer, sensors=SENSORS, device_info=False):
+    writer.record_connect()
+    if device_info:
+        for uuid in (
+            MODEL_NUMBER_UUID,
+            HARDWARE_REVISION_UUID,
+            SOFTWARE_REVISION_UUID,
+            MANUFACTURER_NAME_UUID,
+            DEVICE_NAME_UUID,
+        ):
+            writer.record_read(uuid, b"Pax Levante\x00")
+    writer.record_read(SENSORS_UUID, sensors)
+    writer.record_read(FAN_SPEED_TARGETS_UUID, TARGETS)
+
+
+def test_capture_round_trip(tmp_path):
+    writer = PaxCaptureWriter(str(tmp_path / "capture" / "fan.paxcap"))
+    writer.record_connect()
+    writer.record_read(SENSORS_UUID, SENSORS)
+    writer.record_write(BOOST_UUID, b"\x01\x60\x09\x84\x03")
+    writer.flush()
+    writer.record_read(SENSORS_UUID, b"")
+    writer.flush()
+
+    records = list(read_capture(writer.path))
+
+    assert [(r.op, r.uuid, r.data) for r in records] == [
+        (OP_CONNECT, None, b""),
+        (OP_READ, SENSORS_UUID, SENSORS),
+        (OP_WRITE, BOOST_UUID, b"\x01\x60\x09\x84\x03"),
+        (OP_READ, SENSORS_UUID, b""),
+    ]
+    assert records[0].timestamp <= records[-1].timestamp
+
+
+def test_capture_rotation(tmp_path):
+    path = tmp_path / "fan.paxcap"
+    writer = PaxCaptureWriter(str(path), max_bytes=200, backups=2)
+    for _ in range(4):
+        _write_session(writer)
+        writer.flush()
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "fan.paxcap",
+        "fan.paxcap.1",
+        "fan.paxcap.2",
+    ]
+    for capture in (path, tmp_path / "fan.paxcap.1", tmp_path / "fan.paxcap.2"):
+        assert len(split_sessions(read_capture(str(capture)))) == 1
+
+
+async def test_replay_through_client(tmp_path):
+    writer = PaxCaptureWriter(str(tmp_path / "fan.paxcap"))
+    _write_session(writer)
+    _write_session(writer, sensors=b"\x00")
+    writer.flush()
+
+    stats = await async_replay(read_capture(writer.path))
+
+    assert stats.sessions == 2
+    assert stats.reads == 4
+    assert stats.failures == 1
+
+
+async def test_replay_through_coordinator(hass, tmp_path):
+    writer = PaxCaptureWriter(str(tmp_path / "fan.paxcap"))
+    _write_session(writer, device_info=True)
+    _write_session(writer, sensors=bytes.fromhex("000062003002560917000000"))
+    writer.flush()
+    coordinator = PaxUpdateCoordinator(hass, "AA:BB:CC:DD:EE:FF", 0)
+
+    stats = await async_replay(read_capture(writer.path), coordinator)
+
+    assert stats.sessions == 2
+    assert stats.failures == 0
+    assert coordinator.device_info.name == "Pax Levante"
+    assert coordinator.data.current_trigger == CurrentTrigger.BOOST
+    assert coordinator.fan_speed_targets == FanSpeedTarget(2400, 1740, 950)
+    await coordinator.async_shutdown()
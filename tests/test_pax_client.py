@@ -5,13 +5,26 @@ from unittest.mock import AsyncMock
 import pytest
 
 from custom_components.pax_levante.pax_client import (
+    BOOST_UUID,
+    CODECS,
+    DEVICE_NAME_UUID,
+    FAN_SENSITIVITY_UUID,
     FAN_SPEED_TARGETS_UUID,
     PIN_CHECK_UUID,
+    PIN_READ_WRITE_UUID,
+    SENSORS_CODEC,
+    SENSORS_UUID,
+    Boost,
     CurrentTrigger,
+    FanSensitivity,
+    FanSensitivitySetting,
     FanSpeedTarget,
     PaxClient,
+    PaxDecodeError,
     PaxSensors,
+    PaxTransactionError,
 )
+from custom_components.pax_levante.pax_fake import FakePaxFan
 
 
 def test_parse_string():
@@ -30,11 +43,17 @@ def test_parse_sensors_response_BOOST():
         current_trigger=CurrentTrigger.BOOST,
         boost=True,
         unknown=0,
-        raw="000062003002560917000000",
+        raw=bytes.fromhex("000062003002560917000000"),
     )
     assert PaxClient._parse_sensors_response(response) == expected_result
 
 
+def test_parse_sensors_response_raw_hex():
+    response = bytearray.fromhex("000062003002560917000000")
+    sensors = PaxClient._parse_sensors_response(response)
+    assert sensors.raw_hex == "000062003002560917000000"
+
+
 def test_parse_sensors_response_AUTOMATIC_VENTILATION():
     response = bytearray.fromhex("0f00610022003d0907000000")
     expected_result = PaxSensors(
@@ -45,11 +64,59 @@ def test_parse_sensors_response_AUTOMATIC_VENTILATION():
         current_trigger=CurrentTrigger.AUTOMATIC_VENTILATION,
         boost=False,
         unknown=0,
-        raw="0f00610022003d0907000000",
+        raw=bytes.fromhex("0f00610022003d0907000000"),
     )
     assert PaxClient._parse_sensors_response(response) == expected_result
 
 
+def test_parse_sensors_response_unknown_trigger():
+    sensors = PaxClient._parse_sensors_response(
+        bytes.fromhex("0f00610022003d0905000000")
+    )
+    assert sensors.current_trigger == CurrentTrigger.UNKNOWN
+    assert not sensors.boost
+
+
+def test_decode_sensors_from_memoryview():
+    frame = memoryview(bytes.fromhex("ffff0f00610022003d0907000000"))[2:]
+    sensors = SENSORS_CODEC.decode(frame)
+    assert sensors.humidity == 15
+    assert sensors.raw == bytes.fromhex("0f00610022003d0907000000")
+
+
+def test_decode_short_frame():
+    with pytest.raises(PaxDecodeError):
+        SENSORS_CODEC.decode(b"\x0f\x00")
+
+
+def test_decode_unknown_sensitivity():
+    setting = CODECS[FAN_SENSITIVITY_UUID].decode(b"\x01\x09\x00\x00")
+    assert setting == FanSensitivitySetting(
+        FanSensitivity.UNKNOWN, FanSensitivity.DISABLED
+    )
+
+
+@pytest.mark.parametrize(
+    ("uuid", "value"),
+    [
+        (FAN_SPEED_TARGETS_UUID, FanSpeedTarget(2400, 1740, 950)),
+        (
+            FAN_SENSITIVITY_UUID,
+            FanSensitivitySetting(FanSensitivity.MEDIUM, FanSensitivity.DISABLED),
+        ),
+        (BOOST_UUID, Boost(True, 2400, 900)),
+        (PIN_READ_WRITE_UUID, 1234),
+        (PIN_CHECK_UUID, True),
+        (DEVICE_NAME_UUID, "Pax Levante"),
+        (SENSORS_UUID, SENSORS_CODEC.decode(bytes.fromhex("000062003002560917000000"))),
+        (SENSORS_UUID, SENSORS_CODEC.decode(bytes.fromhex("0f00610022003d0905000000"))),
+    ],
+)
+def test_codec_round_trip(uuid, value):
+    codec = CODECS[uuid]
+    assert codec.decode(codec.encode(value)) == value
+
+
 @pytest.fixture
 async def pax_client():
     # Setup code for creating a client instance
@@ -76,3 +143,80 @@ async def test_async_get_fan_speed_targets(pax_client):
     )
 
     pax_client._client.read_gatt_char.assert_called_once_with(FAN_SPEED_TARGETS_UUID)
+
+
+class RecordingFan(FakePaxFan):
+    fail_on = None
+
+    def __init__(self):
+        super().__init__("AA:BB:CC:DD:EE:FF", pin=1234)
+        self.writes = []
+
+    async def write_gatt_char(self, uuid, data, response=None):
+        if uuid == self.fail_on:
+            raise TimeoutError("Write timed out")
+        self.writes.append((uuid, response))
+        await super().write_gatt_char(uuid, data, response)
+
+
+async def test_write_transaction():
+    fan = RecordingFan()
+    changes = {
+        "boost": Boost(True, 2000, 600),
+        "fan_sensitivity": fan.fan_sensitivity,
+        "fan_speed_targets": FanSpeedTarget(2000, 1500, 900),
+    }
+    async with PaxClient(None, backend=fan) as client:
+        await client.async_get_config()
+        written = await client.async_write_transaction(changes, 1234, verify=True)
+        assert written == ["fan_speed_targets", "boost"]
+        assert fan.writes == [
+            (PIN_READ_WRITE_UUID, None),
+            (FAN_SPEED_TARGETS_UUID, True),
+            (BOOST_UUID, True),
+        ]
+
+        assert await client.async_write_transaction(changes, 1234) == ["boost"]
+        assert fan.writes[3:] == [(BOOST_UUID, True)]
+
+    with pytest.raises(ValueError):
+        await client.async_write_transaction({"pin": 1})
+
+
+async def test_write_transaction_partial_failure():
+    fan = RecordingFan()
+    fan.fail_on = BOOST_UUID
+    async with PaxClient(None, backend=fan) as client:
+        with pytest.raises(PaxTransactionError) as err:
+            await client.async_write_transaction(
+                {
+                    "fan_speed_targets": FanSpeedTarget(2000, 1500, 900),
+                    "boost": Boost(True, 2000, 600),
+                },
+                1234,
+            )
+    assert err.value.written == ["fan_speed_targets"]
+    assert err.value.failed == "boost"
+    assert fan.fan_speed_targets == FanSpeedTarget(2000, 1500, 900)
+
+
+async def test_write_transaction_verify():
+    # Without the pin the fan acknowledges writes but ignores them
+    async with PaxClient(None, backend=RecordingFan()) as client:
+        with pytest.raises(PaxTransactionError) as err:
+            await client.async_write_transaction(
+                {"fan_speed_targets": FanSpeedTarget(2000, 1500, 900)}, verify=True
+            )
+    assert err.value.written == []
+    assert err.value.failed == "fan_speed_targets"
+
+
+async def test_write_transaction_boost_after_expiry():
+    fan = RecordingFan()
+    boost = {"boost": Boost(True, 2400, 900)}
+    async with PaxClient(None, backend=fan) as client:
+        assert await client.async_write_transaction(boost, 1234) == ["boost"]
+        # The boost runs out on the fan while the connection stays open
+        fan.boost = Boost(False, 0, 0)
+        assert await client.async_write_transaction(boost, 1234) == ["boost"]
+    assert fan.boost.active
@@ -0,0 +1,74 @@
+"""Operation counters and the OpenMetrics view."""
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+from aiohttp.test_utils import make_mocked_request
+
+from homeassistant.const import CONF_ADDRESS
+from homeassistant.core import HomeAssistant
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.pax_levante.const import DOMAIN
+from custom_components.pax_levante.pax_metrics import FanMetrics, PaxMetricsView
+
+
+@pytest.fixture(autouse=True)
+def expected_lingering_timers() -> bool:
+    return True
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    yield
+
+
+def test_measure_counts_failures():
+    metrics = FanMetrics()
+    with metrics.measure("write"):
+        pass
+    with pytest.raises(TimeoutError), metrics.measure("write"):
+        raise TimeoutError
+    with pytest.raises(asyncio.CancelledError), metrics.measure("write"):
+        raise asyncio.CancelledError
+
+    write = metrics.operations["write"]
+    assert (write.count, write.failures) == (2, 1)
+    assert write.seconds >= write.seconds_max >= 0
+
+
+async def test_metrics_view(hass: HomeAssistant, enable_bluetooth, mock_client):
+    ble_device = MagicMock()
+    ble_device.name = "Pax Levante"
+    with patch(
+        "homeassistant.components.bluetooth.async_ble_device_from_address",
+        return_value=ble_device,
+    ), patch(
+        "custom_components.pax_levante.pax_update_coordinator.PaxClient",
+        new=mock_client,
+    ):
+        entry = MockConfigEntry(
+            domain=DOMAIN, data={CONF_ADDRESS: "AA:BB:CC:DD:EE:FF", "pin": 1234}
+        )
+        entry.add_to_hass(hass)
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    request = make_mocked_request("GET", PaxMetricsView.url, app={"hass": hass})
+    response = await PaxMetricsView().get(request)
+    assert response.status == 200
+    assert response.content_type == "application/openmetrics-text"
+
+    lines = response.body.decode().splitlines()
+    fan = 'address="AA:BB:CC:DD:EE:FF"'
+    assert f"pax_levante_fan_speed_rpm{{{fan}}} 2390" in lines
+    assert (
+        f'pax_levante_current_trigger{{{fan},pax_levante_current_trigger="boost"}} 1'
+        in lines
+    )
+    assert f'pax_levante_fan_speed_target_rpm{{{fan},trigger="light"}} 23' in lines
+    assert f"pax_levante_polls_total{{{fan}}} 1" in lines
+    assert f"pax_levante_connects_total{{{fan}}} 1" in lines
+    assert "# TYPE pax_levante_poll_duration_seconds summary" in lines
+    assert lines[-1] == "# EOF"
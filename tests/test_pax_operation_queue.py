@@ -0,0 +1,130 @@
+"""Tests for the PaxOperationQueue class."""
+
+import asyncio
+
+import pytest
+
+from custom_components.pax_levante.pax_operation_queue import (
+    PRIORITY_POLL,
+    PRIORITY_WRITE,
+    PaxOperationQueue,
+)
+
+
+async def test_operations_run_one_at_a_time():
+    queue = PaxOperationQueue()
+    running = 0
+    max_running = 0
+
+    async def operation():
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0)
+        running -= 1
+
+    await asyncio.gather(
+        *(queue.async_run(operation, priority=PRIORITY_POLL) for _ in range(5))
+    )
+
+    assert max_running == 1
+
+
+async def test_writes_jump_ahead_of_queued_polls():
+    queue = PaxOperationQueue()
+    order = []
+    blocker = asyncio.Event()
+
+    async def block():
+        await blocker.wait()
+
+    def record(name):
+        async def operation():
+            order.append(name)
+
+        return operation
+
+    first = asyncio.create_task(queue.async_run(block, priority=PRIORITY_WRITE))
+    await asyncio.sleep(0)
+    poll = asyncio.create_task(queue.async_run(record("poll"), priority=PRIORITY_POLL))
+    write = asyncio.create_task(
+        queue.async_run(record("write"), priority=PRIORITY_WRITE)
+    )
+    await asyncio.sleep(0)
+    blocker.set()
+    await asyncio.gather(first, poll, write)
+
+    assert order == ["write", "poll"]
+
+
+async def test_queued_polls_are_collapsed():
+    queue = PaxOperationQueue()
+    calls = 0
+    blocker = asyncio.Event()
+
+    async def block():
+        await blocker.wait()
+
+    async def poll():
+        nonlocal calls
+        calls += 1
+        return calls
+
+    first = asyncio.create_task(queue.async_run(block, priority=PRIORITY_WRITE))
+    await asyncio.sleep(0)
+    polls = [
+        asyncio.create_task(
+            queue.async_run(poll, priority=PRIORITY_POLL, collapse_key="poll")
+        )
+        for _ in range(3)
+    ]
+    await asyncio.sleep(0)
+    blocker.set()
+    await first
+
+    assert await asyncio.gather(*polls) == [1, 1, 1]
+    assert calls == 1
+
+
+async def test_write_preempts_running_poll():
+    queue = PaxOperationQueue()
+    order = []
+    poll_started = asyncio.Event()
+    cancelled = 0
+
+    async def poll():
+        nonlocal cancelled
+        order.append("poll")
+        poll_started.set()
+        try:
+            await asyncio.sleep(0 if cancelled else 10)
+        except asyncio.CancelledError:
+            cancelled += 1
+            raise
+        return "polled"
+
+    async def write():
+        order.append("write")
+        return "written"
+
+    poll_task = asyncio.create_task(
+        queue.async_run(
+            poll, priority=PRIORITY_POLL, preemptible=True, collapse_key="poll"
+        )
+    )
+    await poll_started.wait()
+
+    assert await queue.async_run(write, priority=PRIORITY_WRITE) == "written"
+    assert await poll_task == "polled"
+    assert cancelled == 1
+    assert order == ["poll", "write", "poll"]
+
+
+async def test_exceptions_are_propagated():
+    queue = PaxOperationQueue()
+
+    async def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError, match="boom"):
+        await queue.async_run(fail, priority=PRIORITY_WRITE)
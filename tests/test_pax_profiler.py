@@ -0,0 +1,107 @@
+"""Profiling of update cycles and the profile service."""
+
+import os
+from unittest.mock import MagicMock, patch
+
+from homeassistant.components import persistent_notification
+from homeassistant.const import CONF_ADDRESS
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.pax_levante.const import DOMAIN
+from custom_components.pax_levante.pax_fake import FakePaxFan
+from custom_components.pax_levante.pax_profiler import UpdateProfiler
+from custom_components.pax_levante.pax_update_coordinator import PaxUpdateCoordinator
+
+
+@pytest.fixture(autouse=True)
+def expected_lingering_timers() -> bool:
+    return True
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    yield
+
+
+def test_profiler_laps():
+    profiler = UpdateProfiler(2, use_cprofile=True)
+    for _ in range(2):
+        profiler.start_cycle()
+        profiler.lap("connect")
+        with profiler.profiled():
+            sum(range(100))
+        profiler.lap("process_sensors")
+        profiler.end_cycle()
+
+    assert profiler.done
+    assert [list(result) for result in profiler.results] == [
+        ["connect", "process_sensors", "other"]
+    ] * 2
+    report = profiler.report("Profile")
+    assert "process_sensors" in report
+    assert "cProfile" in report
+
+
+async def test_profile_covers_decoding(hass: HomeAssistant, tmp_path):
+    hass.config.config_dir = str(tmp_path)
+    coordinator = PaxUpdateCoordinator(hass, "AA:BB:CC:DD:EE:FF", 0)
+    coordinator.backend = FakePaxFan("AA:BB:CC:DD:EE:FF")
+    coordinator.async_start_profile(1, use_cprofile=True)
+    profiler = coordinator._profiler
+
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert profiler.done
+    assert "_decode_sensors" in profiler.report("Profile")
+    await coordinator.async_shutdown()
+
+
+async def test_profile_service(
+    hass: HomeAssistant, enable_bluetooth, mock_client, tmp_path
+):
+    hass.config.config_dir = str(tmp_path)
+    ble_device = MagicMock()
+    ble_device.name = "Pax Levante"
+    with patch(
+        "homeassistant.components.bluetooth.async_ble_device_from_address",
+        return_value=ble_device,
+    ), patch(
+        "custom_components.pax_levante.pax_update_coordinator.PaxClient",
+        new=mock_client,
+    ):
+        entry = MockConfigEntry(
+            domain=DOMAIN, data={CONF_ADDRESS: "AA:BB:CC:DD:EE:FF", "pin": 1234}
+        )
+        entry.add_to_hass(hass)
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        device = dr.async_get(hass).async_get_device(
+            connections={(dr.CONNECTION_BLUETOOTH, "AA:BB:CC:DD:EE:FF")}
+        )
+        coordinator = hass.data[DOMAIN][entry.entry_id]
+
+        await hass.services.async_call(
+            DOMAIN,
+            "profile",
+            {"device_id": device.id, "cycles": 2, "cprofile": True},
+            blocking=True,
+        )
+        assert coordinator.profiling
+
+        await coordinator.async_refresh()
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+    assert not coordinator.profiling
+    reports = os.listdir(tmp_path / DOMAIN)
+    assert len(reports) == 1
+    report = (tmp_path / DOMAIN / reports[0]).read_text()
+    assert "read_sensors" in report
+    assert "update_entities" in report
+
+    notifications = persistent_notification._async_get_or_create_notifications(hass)
+    assert f"{DOMAIN}_profile_aabbccddeeff" in notifications
@@ -0,0 +1,179 @@
+"""Configuration snapshots and the snapshot services."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from homeassistant.const import CONF_ADDRESS
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import device_registry as dr
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.pax_levante.const import DOMAIN
+from custom_components.pax_levante.pax_client import (
+    BOOST_UUID,
+    FAN_SENSITIVITY_UUID,
+    FAN_SPEED_TARGETS_UUID,
+    Boost,
+    FanSensitivity,
+    FanSensitivitySetting,
+    FanSpeedTarget,
+    PaxClient,
+    PaxConfig,
+)
+from custom_components.pax_levante.pax_snapshot import (
+    config_to_snapshot,
+    snapshot_to_config,
+)
+
+CONFIG = PaxConfig(
+    FanSpeedTarget(2250, 1675, 1000),
+    FanSensitivitySetting(FanSensitivity.MEDIUM, FanSensitivity.DISABLED),
+    Boost(False, 0, 0),
+)
+
+
+@pytest.fixture(autouse=True)
+def expected_lingering_timers() -> bool:
+    return True
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    yield
+
+
+def test_snapshot_round_trip():
+    snapshot = config_to_snapshot(CONFIG)
+    assert snapshot["version"] == 1
+    assert snapshot["fan_sensitivity"] == {"humidity": "medium", "light": "disabled"}
+    assert snapshot["boost"] == {"fan_speed_target": 0}
+    assert snapshot_to_config(snapshot) == CONFIG
+
+
+@pytest.mark.parametrize(
+    "path, value",
+    [
+        (("fan_speed_targets", "base"), -100),
+        (("fan_speed_targets", "humidity"), 5000),
+        (("fan_sensitivity", "light"), "unknown"),
+        (("boost", "fan_speed_target"), 500),
+        (("boost", "active"), True),
+    ],
+)
+def test_snapshot_is_validated(path, value):
+    snapshot = config_to_snapshot(CONFIG)
+    snapshot[path[0]][path[1]] = value
+    with pytest.raises(ValueError):
+        snapshot_to_config(snapshot)
+
+
+def test_snapshot_version_is_checked():
+    snapshot = config_to_snapshot(CONFIG)
+    snapshot["version"] = 99
+    with pytest.raises(ValueError):
+        snapshot_to_config(snapshot)
+
+
+async def test_apply_config_writes_only_differences():
+    client = PaxClient(None)
+    client._client = AsyncMock()
+    current = PaxConfig(
+        FanSpeedTarget(2250, 1675, 950),
+        CONFIG.fan_sensitivity,
+        CONFIG.boost,
+    )
+
+    assert await client.async_apply_config(CONFIG, current) == ["fan_speed_targets"]
+    client._client.write_gatt_char.assert_called_once_with(
+        FAN_SPEED_TARGETS_UUID,
+        bytearray(b"\xca\x08\x8b\x06\xe8\x03"),
+        response=True,
+    )
+
+
+async def test_apply_config_keeps_running_boost():
+    client = PaxClient(None)
+    client._client = AsyncMock()
+    current = PaxConfig(
+        CONFIG.fan_speed_targets, CONFIG.fan_sensitivity, Boost(True, 2000, 600)
+    )
+    config = PaxConfig(
+        CONFIG.fan_speed_targets, CONFIG.fan_sensitivity, Boost(False, 2400, 0)
+    )
+
+    assert await client.async_apply_config(config, current) == ["boost"]
+    client._client.write_gatt_char.assert_called_once_with(
+        BOOST_UUID, bytearray(b"\x01\x60\x09\x58\x02"), response=True
+    )
+
+    # An unchanged boost fan speed is not written, whatever the boost state
+    client._client.write_gatt_char.reset_mock()
+    current = PaxConfig(
+        CONFIG.fan_speed_targets, CONFIG.fan_sensitivity, Boost(True, 2400, 500)
+    )
+    assert await client.async_apply_config(config, current) == []
+    client._client.write_gatt_char.assert_not_called()
+
+
+async def test_get_config():
+    client = PaxClient(None)
+    client._client = AsyncMock()
+    client._client.read_gatt_char.side_effect = lambda uuid: {
+        FAN_SPEED_TARGETS_UUID: b"\xca\x08\x8b\x06\xe8\x03",
+        FAN_SENSITIVITY_UUID: b"\x01\x02\x00\x03",
+        BOOST_UUID: b"\x00\x00\x00\x00\x00",
+    }[uuid]
+
+    assert await client.async_get_config() == CONFIG
+
+
+async def test_snapshot_services(hass: HomeAssistant, enable_bluetooth, mock_client):
+    ble_device = MagicMock()
+    ble_device.name = "Pax Levante"
+    with patch(
+        "homeassistant.components.bluetooth.async_ble_device_from_address",
+        return_value=ble_device,
+    ), patch(
+        "custom_components.pax_levante.pax_update_coordinator.PaxClient",
+        new=mock_client,
+    ):
+        entry = MockConfigEntry(
+            domain=DOMAIN, data={CONF_ADDRESS: "AA:BB:CC:DD:EE:FF", "pin": 1234}
+        )
+        entry.add_to_hass(hass)
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        device = dr.async_get(hass).async_get_device(
+            connections={(dr.CONNECTION_BLUETOOTH, "AA:BB:CC:DD:EE:FF")}
+        )
+
+        snapshot = await hass.services.async_call(
+            DOMAIN,
+            "snapshot",
+            {"device_id": device.id},
+            blocking=True,
+            return_response=True,
+        )
+        assert snapshot["fan_speed_targets"] == {"humidity": 1, "light": 23, "base": 23}
+
+        snapshot["fan_speed_targets"] = {"humidity": 2250, "light": 1675, "base": 1000}
+        result = await hass.services.async_call(
+            DOMAIN,
+            "apply_snapshot",
+            {"device_id": [device.id], "snapshot": snapshot},
+            blocking=True,
+            return_response=True,
+        )
+        assert result == {device.id: {"written": ["fan_speed_targets"]}}
+        assert hass.data[DOMAIN][entry.entry_id].fan_speed_targets.base == 1000
+
+        snapshot["fan_speed_targets"]["base"] = -1
+        with pytest.raises(HomeAssistantError):
+            await hass.services.async_call(
+                DOMAIN,
+                "apply_snapshot",
+                {"device_id": [device.id], "snapshot": snapshot},
+                blocking=True,
+                return_response=True,
+            )
@@ -0,0 +1,156 @@
+"""Tests for sampling and aggregation of sensor readings."""
+
+import asyncio
+import dataclasses
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from custom_components.pax_levante.const import (
+    CONF_POLL_INTERVAL,
+    CONF_SAMPLE_INTERVAL,
+    CONF_SAMPLE_STATISTICS,
+)
+from custom_components.pax_levante.pax_client import FAN_SPEED_TARGETS_UUID
+from custom_components.pax_levante.pax_fake import FakePaxFan
+from custom_components.pax_levante.pax_statistics import (
+    RateEstimator,
+    SampleWindow,
+    WindowStatistics,
+)
+from custom_components.pax_levante.pax_update_coordinator import PaxUpdateCoordinator
+
+
+def test_sample_window():
+    window = SampleWindow()
+    assert window.statistics() is None
+
+    for value in (50, 56, 53):
+        window.add(value)
+
+    assert window.statistics() == WindowStatistics(50, 53.0, 56, 3)
+
+    window.reset()
+    assert window.statistics() is None
+
+
+def test_rate_estimator():
+    estimator = RateEstimator(window_seconds=120)
+    estimator.add(0, 50)
+    assert estimator.rate is None
+
+    for t in range(60, 601, 60):
+        estimator.add(t, 50 + t / 30)
+
+    assert estimator.rate == pytest.approx(1 / 30)
+
+
+def test_rate_estimator_drops_expired_samples():
+    estimator = RateEstimator(window_seconds=120)
+    for t in range(0, 10_000, 60):
+        estimator.add(t, 80 if t < 5_000 else 50)
+
+    assert estimator.rate == pytest.approx(0)
+
+
+class TracingFan(FakePaxFan):
+    def __init__(self, address, latency=0.0):
+        super().__init__(address, latency=latency)
+        self.reads = []
+
+    async def read_gatt_char(self, uuid):
+        self.reads.append(uuid)
+        return await super().read_gatt_char(uuid)
+
+
+async def test_coordinator_publishes_window(hass, mock_client):
+    ble_device = MagicMock()
+    ble_device.name = "Pax Levante"
+    coordinator = PaxUpdateCoordinator(
+        hass,
+        "AA:BB:CC:DD:EE:FF",
+        0,
+        {
+            CONF_POLL_INTERVAL: 60,
+            CONF_SAMPLE_INTERVAL: 10,
+            CONF_SAMPLE_STATISTICS: True,
+        },
+    )
+    assert coordinator.sample_interval == timedelta(seconds=10)
+
+    with patch(
+        "homeassistant.components.bluetooth.async_ble_device_from_address",
+        return_value=ble_device,
+    ), patch(
+        "custom_components.pax_levante.pax_update_coordinator.PaxClient",
+        new=mock_client,
+    ):
+        for humidity in (40, 60):
+            mock_client.sensors = dataclasses.replace(
+                mock_client.sensors, humidity=humidity
+            )
+            await coordinator._async_sample()
+        mock_client.sensors = dataclasses.replace(mock_client.sensors, humidity=56)
+        await coordinator.async_refresh()
+
+    assert coordinator.sensors.humidity == 56
+    assert coordinator.data.humidity == 52.0
+    assert coordinator.statistics["humidity"] == WindowStatistics(40, 52.0, 60, 3)
+    await coordinator.async_shutdown()
+
+
+async def test_writes_publish_window(hass, mock_client):
+    ble_device = MagicMock()
+    ble_device.name = "Pax Levante"
+    coordinator = PaxUpdateCoordinator(
+        hass,
+        "AA:BB:CC:DD:EE:FF",
+        1234,
+        {CONF_POLL_INTERVAL: 60, CONF_SAMPLE_INTERVAL: 10},
+    )
+
+    with patch(
+        "homeassistant.components.bluetooth.async_ble_device_from_address",
+        return_value=ble_device,
+    ), patch(
+        "custom_components.pax_levante.pax_update_coordinator.PaxClient",
+        new=mock_client,
+    ):
+        await coordinator.async_refresh()
+        for humidity in (40, 60):
+            mock_client.sensors = dataclasses.replace(
+                mock_client.sensors, humidity=humidity
+            )
+            await coordinator._async_sample()
+        # The write reads the sensors once more
+        mock_client.sensors = dataclasses.replace(mock_client.sensors, humidity=56)
+        await coordinator.async_set_boost(True)
+
+    assert coordinator.sensors.humidity == 56
+    assert coordinator.data.humidity == 52.0
+    await coordinator.async_shutdown()
+
+
+async def test_preempted_poll_samples_once(hass):
+    coordinator = PaxUpdateCoordinator(
+        hass,
+        "AA:BB:CC:DD:EE:FF",
+        0,
+        {CONF_POLL_INTERVAL: 60, CONF_SAMPLE_INTERVAL: 10},
+    )
+    coordinator.backend = fan = TracingFan("AA:BB:CC:DD:EE:FF", latency=0.01)
+    await coordinator.async_refresh()
+    del fan.reads[:]
+
+    poll = hass.async_create_task(coordinator.async_refresh())
+    # Wait for the poll to read the sensors and move on to the targets
+    while FAN_SPEED_TARGETS_UUID not in fan.reads:
+        await asyncio.sleep(0.001)
+    # Reading the configuration preempts the poll, which then runs again
+    await coordinator.async_get_config()
+    assert not poll.done()
+    await poll
+
+    assert coordinator.statistics["humidity"].samples == 1
+    await coordinator.async_shutdown()
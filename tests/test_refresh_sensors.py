@@ -0,0 +1,222 @@
+"""Sensors-only refresh of the coordinator and the refresh_sensors service."""
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+from homeassistant.const import CONF_ADDRESS
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.util import dt as dt_util
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.pax_levante.const import (
+    CONF_RECOVERY_POLLS,
+    CONF_STALE_POLLS,
+    DOMAIN,
+)
+from custom_components.pax_levante.pax_client import (
+    FAN_SPEED_TARGETS_UUID,
+    SENSORS_UUID,
+)
+from custom_components.pax_levante.pax_fake import FakePaxFan
+from custom_components.pax_levante.pax_update_coordinator import PaxUpdateCoordinator
+
+
+@pytest.fixture(autouse=True)
+def expected_lingering_timers() -> bool:
+    return True
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    yield
+
+
+class CountingFan(FakePaxFan):
+    failing = False
+
+    def __init__(self, address, latency=0.0):
+        super().__init__(address, latency=latency)
+        self.reads = []
+
+    async def connect(self):
+        if self.failing:
+            raise TimeoutError("Out of range")
+        await super().connect()
+
+    async def read_gatt_char(self, uuid):
+        self.reads.append(uuid)
+        return await super().read_gatt_char(uuid)
+
+
+async def test_refresh_reads_only_sensors(hass, freezer):
+    coordinator = PaxUpdateCoordinator(hass, "AA:BB:CC:DD:EE:FF", 0)
+    coordinator.backend = fan = CountingFan("AA:BB:CC:DD:EE:FF")
+
+    first, second = await asyncio.gather(
+        coordinator.async_refresh_sensors(), coordinator.async_refresh_sensors()
+    )
+    assert first is second
+    assert fan.reads == [SENSORS_UUID]
+    assert coordinator.sensors is first
+    # Nothing is published before the first poll
+    assert coordinator.data is None
+
+    assert await coordinator.async_refresh_sensors() is first
+    assert fan.reads == [SENSORS_UUID]
+
+    await coordinator.async_refresh()
+    del fan.reads[:]
+    freezer.tick(5)
+    sensors = await coordinator.async_refresh_sensors()
+    assert fan.reads == [SENSORS_UUID]
+    assert coordinator.data is sensors
+
+    await coordinator.async_shutdown()
+
+
+async def test_refresh_while_recovering(hass, freezer):
+    coordinator = PaxUpdateCoordinator(
+        hass, "AA:BB:CC:DD:EE:FF", 0, {CONF_RECOVERY_POLLS: 2}
+    )
+    coordinator.backend = fan = CountingFan("AA:BB:CC:DD:EE:FF")
+    await coordinator.async_refresh()
+    good = coordinator.data
+    fan.failing = True
+    await coordinator.async_refresh()
+    assert not coordinator.last_update_success
+
+    # The first good read is returned, but not published until recovered
+    fan.failing = False
+    freezer.tick(5)
+    sensors = await coordinator.async_refresh_sensors()
+    assert not coordinator.last_update_success
+    assert coordinator.data is good
+
+    freezer.tick(5)
+    sensors = await coordinator.async_refresh_sensors()
+    assert coordinator.last_update_success
+    assert coordinator.data is sensors
+
+    await coordinator.async_shutdown()
+
+
+async def test_refreshes_do_not_postpone_polls(hass, freezer):
+    coordinator = PaxUpdateCoordinator(hass, "AA:BB:CC:DD:EE:FF", 0)
+    coordinator.backend = fan = CountingFan("AA:BB:CC:DD:EE:FF")
+    unsub = coordinator.async_add_listener(lambda: None)
+    await coordinator.async_refresh()
+    del fan.reads[:]
+
+    for _ in range(10):
+        freezer.tick(30)
+        async_fire_time_changed(hass, dt_util.utcnow())
+        await coordinator.async_refresh_sensors()
+        await hass.async_block_till_done()
+
+    # 300 s of refreshes every 30 s, and the 65 s polls still ran
+    assert fan.reads.count(FAN_SPEED_TARGETS_UUID) == 3
+    assert coordinator.device_info is not None
+
+    unsub()
+    await coordinator.async_shutdown()
+
+
+async def test_refresh_failure(hass, freezer):
+    coordinator = PaxUpdateCoordinator(
+        hass, "AA:BB:CC:DD:EE:FF", 0, {CONF_STALE_POLLS: 1}
+    )
+    coordinator.backend = fan = CountingFan("AA:BB:CC:DD:EE:FF")
+    await coordinator.async_refresh()
+    good = coordinator.data
+
+    # Within the grace period the last good data is kept
+    fan.failing = True
+    freezer.tick(5)
+    with pytest.raises(UpdateFailed):
+        await coordinator.async_refresh_sensors()
+    assert coordinator.last_update_success
+    assert coordinator.stale_since is not None
+    assert coordinator.data is good
+
+    # and a refresh uses up the grace period like a poll
+    with pytest.raises(UpdateFailed):
+        await coordinator.async_refresh_sensors()
+    assert not coordinator.last_update_success
+    assert coordinator.stale_since is None
+
+    await coordinator.async_shutdown()
+
+
+async def test_refresh_preempts_poll(hass):
+    coordinator = PaxUpdateCoordinator(hass, "AA:BB:CC:DD:EE:FF", 0)
+    coordinator.backend = fan = CountingFan("AA:BB:CC:DD:EE:FF", latency=0.01)
+    await coordinator.async_refresh()
+    del fan.reads[:]
+
+    poll = hass.async_create_task(coordinator.async_refresh())
+    while not fan.reads:
+        await asyncio.sleep(0.001)
+
+    # Read anew rather than sharing the reading of the poll
+    with patch(
+        "custom_components.pax_levante.pax_update_coordinator.REFRESH_SENSORS_WINDOW",
+        0,
+    ):
+        sensors = await coordinator.async_refresh_sensors()
+    assert not poll.done()
+    assert coordinator.data is sensors
+
+    # The preempted poll runs again and is not counted as failed
+    await poll
+    assert coordinator.last_update_success
+    assert coordinator.stale_since is None
+    assert fan.reads[-1] == FAN_SPEED_TARGETS_UUID
+
+    await coordinator.async_shutdown()
+
+
+async def test_refresh_sensors_service(
+    hass: HomeAssistant, enable_bluetooth, mock_client
+):
+    ble_device = MagicMock()
+    ble_device.name = "Pax Levante"
+    with patch(
+        "homeassistant.components.bluetooth.async_ble_device_from_address",
+        return_value=ble_device,
+    ), patch(
+        "custom_components.pax_levante.pax_update_coordinator.PaxClient",
+        new=mock_client,
+    ):
+        entry = MockConfigEntry(
+            domain=DOMAIN, data={CONF_ADDRESS: "AA:BB:CC:DD:EE:FF", "pin": 1234}
+        )
+        entry.add_to_hass(hass)
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        device = dr.async_get(hass).async_get_device(
+            connections={(dr.CONNECTION_BLUETOOTH, "AA:BB:CC:DD:EE:FF")}
+        )
+
+        result = await hass.services.async_call(
+            DOMAIN,
+            "refresh_sensors",
+            {"device_id": device.id},
+            blocking=True,
+            return_response=True,
+        )
+    assert result == {
+        device.id: {
+            "humidity": 0,
+            "temperature": 98,
+            "light": 560,
+            "fan_speed": 2390,
+            "current_trigger": "boost",
+            "boost": True,
+        }
+    }
@@ -1,6 +1,6 @@
 """Switch tests for the pax_levante integration."""
 
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import MagicMock, patch
 
 from homeassistant.const import CONF_ADDRESS
 from homeassistant.core import HomeAssistant
@@ -8,12 +8,7 @@ import pytest
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from custom_components.pax_levante.const import DOMAIN
-from custom_components.pax_levante.pax_client import (
-    CurrentTrigger,
-    FanSpeedTarget,
-    PaxDevice,
-    PaxSensors,
-)
+from custom_components.pax_levante.pax_client import CurrentTrigger, PaxSensors
 
 
 @pytest.fixture(autouse=True)
@@ -26,51 +21,7 @@ def auto_enable_custom_integrations(enable_custom_integrations):
     yield
 
 
-class MockClient:
-    def __init__(self, bleDevice, use_services_cache=True):
-        self.bleDevice = bleDevice
-
-    device = PaxDevice(
-        manufacturer="Pax",
-        model_number="Levante",
-        name="Pax Levante",
-        sw_version="1.0",
-        hw_version="1.0",
-    )
-
-    sensors = PaxSensors(
-        humidity=0,
-        temperature=98,
-        light=560,
-        fan_speed=2390,
-        current_trigger=CurrentTrigger.BOOST,
-        boost=True,
-        unknown=0,
-        raw="000062003002560917000000",
-    )
-
-    fan_speed_targets = FanSpeedTarget(humidity=1, light=23, base=23)
-
-    async def __aenter__(self):
-        return self
-
-    async def __aexit__(self, *args):
-        pass
-
-    async def async_log_services(self):
-        pass
-
-    async def async_get_device_info(self):
-        return self.device
-
-    async def async_get_sensors(self):
-        return self.sensors
-
-    async def async_get_fan_speed_targets(self):
-        return self.fan_speed_targets
-
-
-async def test_switch(hass: HomeAssistant, enable_bluetooth: None):
+async def test_switch(hass: HomeAssistant, enable_bluetooth: None, mock_client):
 
     # mock bluetooth.async_ble_device_from_address
     ble_device = MagicMock()
@@ -81,7 +32,7 @@ async def test_switch(hass: HomeAssistant, enable_bluetooth: None):
     ):
         with patch(
             "custom_components.pax_levante.pax_update_coordinator.PaxClient",
-            new=MockClient,
+            new=mock_client,
         ) as client:
 
             entry = MockConfigEntry(
@@ -106,7 +57,7 @@ async def test_switch(hass: HomeAssistant, enable_bluetooth: None):
                 current_trigger=CurrentTrigger.AUTOMATIC_VENTILATION,
                 boost=False,
                 unknown=0,
-                raw="000062003002560917000000",
+                raw=bytes.fromhex("000062003002560917000000"),
             )
 
             await hass.helpers.entity_component.async_update_entity(